@@ -47,6 +47,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'orders.audit.audit_actor_middleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -75,14 +76,78 @@ WSGI_APPLICATION = 'SPKenv.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite connection profiles. The selected profile's PRAGMAs run on every new
+# connection via init_command; pick one with SPK_SQLITE_PROFILE. Deployments set it
+# to production; the default leaves the checked-in db.sqlite3 in rollback-journal
+# mode, so manage.py runs don't switch it to WAL and leave -wal/-shm files behind.
+# Compare them with: python manage.py stress_sqlite_writers
+SQLITE_PROFILES = {
+    'default': {
+        'pragmas': {},
+        'conn_max_age': 0,
+        'timeout': 5,
+        'transaction_mode': None,
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,  # ms
+            'mmap_size': 134217728,  # 128 MiB
+            'cache_size': -20000,  # negative = KiB, ~20 MB
+            'temp_store': 'MEMORY',
+        },
+        'conn_max_age': 600,
+        'timeout': 5,
+        'transaction_mode': 'IMMEDIATE',  # take the write lock up front instead of failing on upgrade
+    },
+}
+
+SQLITE_PROFILE = os.environ.get('SPK_SQLITE_PROFILE', 'default')
+_sqlite_profile = SQLITE_PROFILES[SQLITE_PROFILE]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # SPK_DATABASE_PATH points tools such as the MTO simulator at a scratch database
+        'NAME': os.environ.get('SPK_DATABASE_PATH') or BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': _sqlite_profile['conn_max_age'],
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': _sqlite_profile['timeout'],
+            'transaction_mode': _sqlite_profile['transaction_mode'],
+            'init_command': ';'.join(
+                f'PRAGMA {name}={value}' for name, value in _sqlite_profile['pragmas'].items()
+            ),
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'spkenv',
     }
 }
 
 
+# Seconds an order idempotency key keeps returning the original order
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+
+# Files written by background jobs (orders/jobs.py), e.g. CSV exports
+JOB_OUTPUT_DIR = BASE_DIR / 'job_output'
+# The only place the import_products job reads files from
+PRODUCT_IMPORT_DIR = BASE_DIR / 'imports'
+
+# Append-only audit log segments and their indexes (orders/audit.py). Entries name
+# order ids, so tools on a scratch database (SPK_DATABASE_PATH) need their own log
+AUDIT_LOG_DIR = Path(os.environ.get('SPK_AUDIT_LOG_DIR') or BASE_DIR / 'audit_log')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -122,6 +187,21 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static')
 ]
+
+# Build with: python manage.py build_assets (WebP variants + collectstatic)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Content-hashed names with pre-compressed .gz/.br siblings, served with far-future
+# cache headers by orders.staticfiles.serve_static
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'orders.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
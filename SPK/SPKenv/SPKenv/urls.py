@@ -14,13 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.shortcuts import redirect
+from orders.staticfiles import serve_static
 from . import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("orders/", include("orders.urls")),
     path("", lambda request: redirect("orders/")),  # root goes to /orders/
+    # Collected static files; runserver intercepts these itself while DEBUG is on
+    re_path(rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.+)$", serve_static),
 ]
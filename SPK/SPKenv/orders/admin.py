@@ -1,4 +1,63 @@
 from django.contrib import admin
-from .models import Product
+from .audit import STATUS_CHANGED, audit_log
+from .models import Customer, Order, OrderItem, Product, WorkCenter
+from .paginator import EstimatedCountPaginator
+from .transitions import SALES_ORDER
 
-admin.site.register(Product)
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('sku', 'name', 'price', 'work_center', 'cycle_seconds')
+    list_select_related = ('work_center',)
+    list_filter = ('work_center',)
+    search_fields = ('sku', 'name')
+
+
+@admin.register(WorkCenter)
+class WorkCenterAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'lines', 'setup_minutes')
+    search_fields = ('code', 'name')
+
+
+@admin.register(Customer)
+class CustomerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'normalized_name', 'email')
+    readonly_fields = ('normalized_name',)
+    search_fields = ('name', 'email')
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    raw_id_fields = ('product',)
+
+    def get_queryset(self, request):
+        # Items render product names; fetch them with the items in one query
+        return super().get_queryset(request).select_related('product')
+
+
+# Large-table settings: no full COUNT(*), estimated pagination, no giant FK selects
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'customer_name', 'date_created')
+    date_hierarchy = 'date_created'
+    search_fields = ('customer_name',)
+    raw_id_fields = ('customer',)
+    inlines = [OrderItemInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Hand-edited statuses skip the transition log; keep both values in the audit log
+        if change and 'status' in form.changed_data:
+            audit_log.log(STATUS_CHANGED, SALES_ORDER, [obj.pk], f"{form.initial.get('status')} -> {obj.status}")
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(admin.ModelAdmin):
+    list_display = ('id', 'order', 'product', 'quantity')
+    list_select_related = ('order', 'product')
+    raw_id_fields = ('order', 'product')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
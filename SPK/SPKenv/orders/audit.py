@@ -0,0 +1,329 @@
+"""Append-only audit log of who changed which order, and when.
+
+``audit_log.log()`` only appends a tuple to an in-memory buffer once the change
+commits; a background thread flushes the buffer every FLUSH_INTERVAL seconds (or
+sooner when MAX_BATCH entries are waiting) to segment files under
+``settings.AUDIT_LOG_DIR``, so the click path never waits on the disk.
+
+Each process appends to its own segment and starts a new one past SEGMENT_BYTES.
+Records are struct-packed::
+
+    <length u16><at_ms i64><action u8><entity u8><object id u32><actor length u8><actor><detail>
+
+with UTF-8 actor and detail text. Next to every ``.log`` segment an ``.idx``
+sidecar holds one big-endian ``(entity, object id, offset)`` entry per record;
+when a segment is sealed its index is rewritten sorted (``.sidx``), so looking up
+one order's history is a binary search per sealed segment instead of a scan.
+"""
+import atexit
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.utils.decorators import sync_and_async_middleware
+
+from .transitions import PRODUCTION_ORDER, SALES_ORDER
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of the in-memory buffer
+FLUSH_INTERVAL = 1.0
+# Buffered entries that trigger a flush before the interval is up
+MAX_BATCH = 1000
+# Segment size that starts a new file; offsets in the index are u32
+SEGMENT_BYTES = 16 * 1024 * 1024
+MAX_ACTOR_BYTES = 255
+MAX_DETAIL_BYTES = 1000
+
+STATUS_CHANGED, ITEM_DELETED, ORDER_DELETED = 1, 2, 3
+ACTION_NAMES = {STATUS_CHANGED: "status changed", ITEM_DELETED: "item deleted", ORDER_DELETED: "order deleted"}
+ENTITY_NAMES = {SALES_ORDER: "SO", PRODUCTION_ORDER: "PO"}
+
+RECORD = struct.Struct('<HqBBIB')
+INDEX = struct.Struct('>BII')  # big-endian, so byte order sorts like (entity, object id, offset)
+KEY = struct.Struct('>BI')
+
+# Who is making changes in this context: a name, or a callable resolved when something is logged
+_actor = ContextVar('audit_actor', default='system')
+
+
+@contextmanager
+def acting_as(actor):
+    token = _actor.set(actor)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+def request_actor(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"web:{user.get_username()}"
+    return f"web:{request.META.get('REMOTE_ADDR') or 'unknown'}"
+
+
+@sync_and_async_middleware
+def audit_actor_middleware(get_response):
+    """Attribute changes made while handling a request to its user (or client address)."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            with acting_as(partial(request_actor, request)):
+                return await get_response(request)
+        markcoroutinefunction(middleware)
+    else:
+        def middleware(request):
+            with acting_as(partial(request_actor, request)):
+                return get_response(request)
+    return middleware
+
+
+def _truncate(text, limit):
+    data = text.encode('utf-8')
+    return data if len(data) <= limit else data[:limit].decode('utf-8', 'ignore').encode('utf-8')
+
+
+def encode(at_ms, action, entity, object_id, actor, detail):
+    actor = _truncate(actor, MAX_ACTOR_BYTES)
+    detail = _truncate(detail, MAX_DETAIL_BYTES)
+    length = RECORD.size + len(actor) + len(detail)
+    return RECORD.pack(length, at_ms, action, entity, object_id, len(actor)) + actor + detail
+
+
+def decode(data):
+    length, at_ms, action, entity, object_id, actor_length = RECORD.unpack_from(data)
+    actor_end = RECORD.size + actor_length
+    return AuditEntry(at_ms, action, entity, object_id, data[RECORD.size:actor_end].decode('utf-8'),
+                      data[actor_end:length].decode('utf-8'))
+
+
+@dataclass(frozen=True)
+class AuditEntry:
+    at_ms: int
+    action: int
+    entity: int
+    object_id: int
+    actor: str
+    detail: str
+
+    @property
+    def at(self):
+        return datetime.fromtimestamp(self.at_ms / 1000, timezone.utc)
+
+    @property
+    def action_name(self):
+        return ACTION_NAMES.get(self.action, str(self.action))
+
+    @property
+    def ref(self):
+        return f"{ENTITY_NAMES.get(self.entity, '?')}{self.object_id:04d}"
+
+
+def _sort_index(path):
+    """Seal a segment: write its index sorted by (entity, object id, offset) and drop the unsorted one."""
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    size = INDEX.size
+    entries = sorted(data[start:start + size] for start in range(0, len(data) - size + 1, size))
+    sorted_path = path[:-len('.idx')] + '.sidx'
+    with open(f'{sorted_path}.part', 'wb') as stream:
+        stream.write(b''.join(entries))
+    os.replace(f'{sorted_path}.part', sorted_path)
+    os.remove(path)
+
+
+def _sorted_offsets(data, key):
+    size = INDEX.size
+    low, high = 0, len(data) // size
+    while low < high:
+        middle = (low + high) // 2
+        if data[middle * size:middle * size + KEY.size] < key:
+            low = middle + 1
+        else:
+            high = middle
+    offsets = []
+    for start in range(low * size, len(data) - size + 1, size):
+        if data[start:start + KEY.size] != key:
+            break
+        offsets.append(INDEX.unpack_from(data, start)[2])
+    return offsets
+
+
+def _scanned_offsets(data, key):
+    size = INDEX.size
+    return [INDEX.unpack_from(data, start)[2] for start in range(0, len(data) - size + 1, size)
+            if data[start:start + KEY.size] == key]
+
+
+def _segment_offsets(base, key):
+    for suffix, find in (('.sidx', _sorted_offsets), ('.idx', _scanned_offsets)):
+        try:
+            stream = open(base + suffix, 'rb')
+        except FileNotFoundError:
+            continue
+        with stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return find(data, key)
+    return []
+
+
+class AuditLog:
+    """Buffered writer and reader of the audit segments; see the module docstring."""
+
+    def __init__(self, directory=None, flush_interval=FLUSH_INTERVAL, max_batch=MAX_BATCH,
+                 segment_bytes=SEGMENT_BYTES):
+        self._directory = directory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.segment_bytes = segment_bytes
+        self._pending = []
+        self._lock = threading.Lock()  # guards _pending; held only to append or swap
+        self._write_lock = threading.Lock()  # serializes flushes and segment rotation
+        self._wake = threading.Event()
+        self._thread = None
+        self._segment = None  # (base path, log file, index file, size)
+        self._sequence = 0
+
+    @property
+    def directory(self):
+        return str(self._directory or settings.AUDIT_LOG_DIR)
+
+    def log(self, action, entity, object_ids, detail=''):
+        """Record ``action`` on every id in ``object_ids`` once the current transaction commits."""
+        actor = _actor.get()
+        if callable(actor):
+            actor = actor()
+        at_ms = time.time_ns() // 1_000_000
+        entries = [(at_ms, action, entity, object_id, actor, detail) for object_id in object_ids]
+        if entries:
+            transaction.on_commit(partial(self._append, entries))
+
+    def _append(self, entries):
+        with self._lock:
+            self._pending.extend(entries)
+            backlog = len(self._pending)
+        self._ensure_started()
+        if backlog >= self.max_batch:
+            self._wake.set()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # e.g. the disk is full; the entries stay buffered and the next flush retries
+                logger.exception("Audit log flush failed")
+
+    def flush(self):
+        """Write the buffered entries to the current segment."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                self._write(pending)
+            except BaseException:
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+
+    def _write(self, pending):
+        if self._segment is None:
+            self._open_segment()
+        base, log_file, index_file, size = self._segment
+        records, index = [], []
+        for entry in pending:
+            record = encode(*entry)
+            records.append(record)
+            index.append(INDEX.pack(entry[2], entry[3], size))
+            size += len(record)
+        log_file.write(b''.join(records))
+        log_file.flush()
+        # Index entries only ever point at records already written out
+        index_file.write(b''.join(index))
+        index_file.flush()
+        self._segment = (base, log_file, index_file, size)
+        if size >= self.segment_bytes:
+            self._seal()
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence:04d}"
+        base = os.path.join(self.directory, name)
+        self._segment = (base, open(base + '.log', 'ab'), open(base + '.idx', 'ab'), 0)
+
+    def _seal(self):
+        base, log_file, index_file, _ = self._segment
+        self._segment = None
+        log_file.close()
+        index_file.close()
+        _sort_index(base + '.idx')
+
+    def close(self):
+        """Flush and seal the current segment (runs at interpreter exit)."""
+        self.flush()
+        with self._write_lock:
+            if self._segment is not None:
+                self._seal()
+
+    def history(self, entity, object_id):
+        """Every entry recorded for one sales or production order, oldest first."""
+        self.flush()
+        key = KEY.pack(entity, object_id)
+        entries = []
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith('.log'))
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            base = os.path.join(self.directory, name[:-len('.log')])
+            offsets = _segment_offsets(base, key)
+            if not offsets:
+                continue
+            with open(base + '.log', 'rb') as stream:
+                for offset in sorted(offsets):
+                    stream.seek(offset)
+                    header = stream.read(RECORD.size)
+                    entries.append(decode(header + stream.read(RECORD.unpack(header)[0] - RECORD.size)))
+        entries.sort(key=lambda entry: entry.at_ms)
+        return entries
+
+
+audit_log = AuditLog()
+
+
+def order_history(order_id):
+    """Audit entries of a sales order and of the production orders allocated to it."""
+    from .models import ProductionAllocation
+
+    entries = audit_log.history(SALES_ORDER, order_id)
+    for production_order_id in ProductionAllocation.objects.filter(sales_order_id=order_id).values_list(
+            'production_order_id', flat=True).distinct():
+        entries.extend(audit_log.history(PRODUCTION_ORDER, production_order_id))
+    entries.sort(key=lambda entry: entry.at_ms)
+    return entries
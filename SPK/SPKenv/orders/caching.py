@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .versions import ORDERS, data_version
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+
+def orders_version(request=None):
+    """Return the (version, last_modified) pair of the order data, read once per request.
+
+    The version lives in the database and triggers move it on every write (see
+    versions.py), so all processes agree on it and no writer has to remember a bump.
+    """
+    state = getattr(request, '_orders_version', None)
+    if state is None:
+        version, changed_ms = data_version(ORDERS)
+        state = (version, changed_ms / 1000)
+        if request is not None:
+            request._orders_version = state
+    return state
+
+
+def _etag(request, *args, **kwargs):
+    return f'orders-{orders_version(request)[0]}'
+
+
+def _last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(orders_version(request)[1], tz=timezone.utc)
+
+
+def cached_order_page(timeout=PAGE_CACHE_TIMEOUT):
+    """Cache a read-only order page under the current orders version, with ETag/Last-Modified.
+
+    Conditional GETs are answered with 304 before the view runs; other GETs are served
+    from the cache until the next write to the order tables moves the version.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = f'orders:page:{orders_version(request)[0]}:{request.get_full_path()}'
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response = response.render()
+                if response.status_code == 200:
+                    cache.set(key, response, timeout)
+            # Let browsers keep the body but revalidate each time, so repeats become 304s
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return condition(etag_func=_etag, last_modified_func=_last_modified)(wrapper)
+
+    return decorator
@@ -0,0 +1,56 @@
+import gzip
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.templatetags.static import static
+
+from .models import Product
+from .staticfiles import image_srcset
+from .versions import CATALOG, data_version
+
+# Cache keys for the shared product select choices and the encoded catalog API response.
+# Both carry the catalog's database version, so a product write in any process (admin,
+# import job, manage.py) retires them everywhere without an explicit invalidation
+CATALOG_CACHE_KEY = 'orders:product-choices:{version}'
+CATALOG_JSON_CACHE_KEY = 'orders:catalog-json:{version}'
+CATALOG_CACHE_TIMEOUT = 60 * 60
+
+
+def product_choices():
+    """Return the (pk, label) pairs for the product select, fetched once per catalog version."""
+    key = CATALOG_CACHE_KEY.format(version=data_version(CATALOG)[0])
+    choices = cache.get(key)
+    if choices is None:
+        choices = [(product.pk, str(product)) for product in Product.objects.order_by('sku')]
+        cache.set(key, choices, CATALOG_CACHE_TIMEOUT)
+    return choices
+
+
+def catalog_json():
+    """Return (etag, body, gzipped body) for the catalog API, encoded once per catalog change."""
+    key = CATALOG_JSON_CACHE_KEY.format(version=data_version(CATALOG)[0])
+    encoded = cache.get(key)
+    if encoded is None:
+        products = [
+            {
+                'id': product.pk,
+                'sku': product.sku,
+                'name': product.name,
+                'category': product.category,
+                'price': str(product.price),
+                'unit': product.unit,
+                'sustainability_score': product.sustainability_score,
+                'description': product.description,
+                'features': [tag.strip() for tag in product.features.split(',') if tag.strip()],
+                'image': static(f'img/{product.image}') if product.image else None,
+                'srcset': image_srcset(f'img/{product.image}') if product.image else '',
+                'badge': product.badge,
+            }
+            for product in Product.objects.order_by('sku')
+        ]
+        body = json.dumps({'products': products}, separators=(',', ':')).encode()
+        etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        encoded = (etag, body, gzip.compress(body, compresslevel=9))
+        cache.set(key, encoded, CATALOG_CACHE_TIMEOUT)
+    return encoded
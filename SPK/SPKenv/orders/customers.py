@@ -0,0 +1,79 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+from .models import Customer, Order, OrderItem, normalize_customer_name
+
+SEARCH_LIMIT = 10
+# Sorts after every character, so [prefix, prefix + MAX_CHAR) is the prefix's index range
+MAX_CHAR = '\U0010ffff'
+
+
+def resolve_customers(names):
+    """Return {name: customer pk} for the given names, creating customers that are new.
+
+    Names are matched on their normalized form, so "ACME Florist" and "acme florist."
+    resolve to the same customer. Names that normalize to nothing map to None.
+    ``names`` may repeat; pass them in order so new customers keep the first spelling.
+    """
+    keys = {name: normalize_customer_name(name) for name in names}
+    wanted = set(keys.values()) - {''}
+    pks = dict(Customer.objects.filter(normalized_name__in=wanted).values_list('normalized_name', 'pk'))
+    missing = {}
+    for name, key in keys.items():
+        if key in wanted and key not in pks:
+            missing.setdefault(key, name)  # a new customer keeps the first spelling it came with
+    if missing:
+        # ignore_conflicts: a concurrent writer may have created the same customer
+        Customer.objects.bulk_create(
+            [Customer(name=' '.join(name.split()), normalized_name=key) for key, name in missing.items()],
+            ignore_conflicts=True,
+        )
+        pks.update(Customer.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'pk'))
+    return {name: pks.get(key) for name, key in keys.items()}
+
+
+def resolve_customer(name):
+    key = normalize_customer_name(name)
+    if not key:
+        return None
+    customer = Customer.objects.filter(normalized_name=key).values_list('pk', flat=True).first()
+    if customer is None:
+        try:
+            with transaction.atomic():
+                customer = Customer.objects.create(name=' '.join(name.split())).pk
+        except IntegrityError:
+            customer = Customer.objects.get(normalized_name=key).pk
+    return customer
+
+
+def search_customers(query, limit=SEARCH_LIMIT):
+    """Customers whose normalized name starts with the normalized ``query``.
+
+    A range scan on the unique normalized_name index, never a LIKE over the table.
+    """
+    prefix = normalize_customer_name(query)
+    if not prefix:
+        return []
+    return list(
+        Customer.objects.filter(normalized_name__gte=prefix, normalized_name__lt=prefix + MAX_CHAR)
+        .order_by('normalized_name')
+        .values('id', 'name')[:limit]
+    )
+
+
+def customer_orders(customer_id):
+    """A customer's orders, newest first, read through the (customer, date_created) index."""
+    return Order.objects.filter(customer_id=customer_id).order_by('-date_created')
+
+
+def customer_totals(customer_ids=None):
+    """{customer pk: (orders, revenue)} from one grouped query over the linked orders."""
+    items = OrderItem.objects.filter(order__customer__isnull=False)
+    if customer_ids is not None:
+        items = items.filter(order__customer_id__in=customer_ids)
+    line_total = ExpressionWrapper(F('quantity') * F('product__price'),
+                                   output_field=DecimalField(max_digits=14, decimal_places=2))
+    rows = items.values('order__customer_id').annotate(
+        orders=Count('order_id', distinct=True), revenue=Sum(line_total),
+    )
+    return {row['order__customer_id']: (row['orders'], row['revenue']) for row in rows}
@@ -1,15 +1,34 @@
+import uuid
+
 from django import forms
-from django.forms import inlineformset_factory
+from django.forms import BaseInlineFormSet, inlineformset_factory
+from django.utils.functional import cached_property
+from django.urls import reverse_lazy
+from .catalog import product_choices
 from .models import Order, OrderItem, Product
 
 # Form for the Order itself
 class OrderForm(forms.ModelForm):
+    # Hidden per-render token so double submits resolve to the first order
+    idempotency_key = forms.CharField(widget=forms.HiddenInput, required=False, max_length=64)
+
     class Meta:
         model = Order
-        fields = ['customer_name']  # changed from 'customer' to 'customer_name'
+        fields = ['customer_name', 'notes']  # changed from 'customer' to 'customer_name'
         widgets = {
-            'customer_name': forms.TextInput(attrs={'placeholder': 'Enter customer name'}),
+            # Autocompleted from the customer directory by static/js/customers.js
+            'customer_name': forms.TextInput(attrs={
+                'placeholder': 'Enter customer name',
+                'data-customer-search': reverse_lazy('customer_search'),
+            }),
+            'notes': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Delivery instructions, special requests...'}),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.fields['idempotency_key'].initial = uuid.uuid4().hex
+
 class OrderItemForm(forms.ModelForm):
     class Meta:
         model = OrderItem
@@ -18,10 +37,29 @@ class OrderItemForm(forms.ModelForm):
             'product': forms.Select(),
             'quantity': forms.NumberInput(attrs={'min': 1}),
         }
+
+    def __init__(self, *args, choices=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Use the shared cached catalog instead of one Product query per formset row
+        product_field = self.fields['product']
+        product_field.choices = [('', product_field.empty_label)] + (product_choices() if choices is None else choices)
+
+
+class BaseOrderItemFormSet(BaseInlineFormSet):
+    @cached_property
+    def product_choices(self):
+        # Looked up once for the whole formset, so its catalog version check isn't repeated per row
+        return product_choices()
+
+    def get_form_kwargs(self, index):
+        return {**super().get_form_kwargs(index), 'choices': self.product_choices}
+
+
 # Form for each OrderItem
 OrderItemFormSet = inlineformset_factory(
     Order, OrderItem,
     form=OrderItemForm,
+    formset=BaseOrderItemFormSet,
     extra=1,  # start with 1 row
     can_delete=True  # allows removing items
 )
\ No newline at end of file
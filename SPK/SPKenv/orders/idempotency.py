@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+# Only let one request per interval pay for purging expired keys
+PURGE_FLAG_CACHE_KEY = 'orders:idempotency-purge'
+PURGE_INTERVAL = 60 * 60
+
+
+def clean_key(key):
+    """Return a usable idempotency key, or None if missing or malformed."""
+    if not key:
+        return None
+    key = key.strip()
+    if not key or len(key) > IdempotencyKey._meta.get_field('key').max_length:
+        return None
+    return key
+
+
+def cutoff():
+    return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def find_order_id(key):
+    """Return the order id recorded for an unexpired key, or None."""
+    if key is None:
+        return None
+    return (
+        IdempotencyKey.objects.filter(key=key, created_at__gte=cutoff())
+        .values_list('order_id', flat=True)
+        .first()
+    )
+
+
+def live_keys(keys):
+    """{key: order id} for the unexpired keys among ``keys``.
+
+    Expired records of these keys are deleted, so a reused key starts over as a
+    new key everywhere, whether or not the purge has run yet. Call it in the
+    transaction that records the keys.
+    """
+    if not keys:
+        return {}
+    IdempotencyKey.objects.filter(key__in=keys, created_at__lt=cutoff()).delete()
+    return dict(IdempotencyKey.objects.filter(key__in=keys).values_list('key', 'order_id'))
+
+
+def purge_expired():
+    return IdempotencyKey.objects.filter(created_at__lt=cutoff()).delete()[0]
+
+
+def maybe_purge_expired():
+    if cache.add(PURGE_FLAG_CACHE_KEY, True, PURGE_INTERVAL):
+        purge_expired()
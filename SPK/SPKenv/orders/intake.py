@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+
+from .catalog import product_choices
+from .customers import resolve_customers
+from .idempotency import live_keys, maybe_purge_expired
+from .audit import acting_as
+from .models import IdempotencyKey, Order, OrderItem
+from .transitions import SALES_ORDER, record
+
+logger = logging.getLogger(__name__)
+
+MAX_ITEMS_PER_ORDER = 100
+MAX_NOTES_LENGTH = 2000
+
+
+class OrderNotSaved(Exception):
+    """A valid order could not be written (e.g. the database was busy); the client may retry."""
+
+
+def validate_order_payload(payload):
+    """Validate a JSON order without the form machinery.
+
+    Expects ``{"customer_name": str, "items": [{"product": id, "quantity": int}, ...]}``
+    with an optional ``"notes": str`` and returns the cleaned dict. Products are checked against the cached catalog.
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError("Order payload must be a JSON object.")
+
+    customer_name = payload.get('customer_name')
+    if not isinstance(customer_name, str) or not customer_name.strip():
+        raise ValidationError({'customer_name': "This field is required."})
+    customer_name = customer_name.strip()
+    if len(customer_name) > Order._meta.get_field('customer_name').max_length:
+        raise ValidationError({'customer_name': "Customer name is too long."})
+
+    notes = payload.get('notes', '')
+    if not isinstance(notes, str):
+        raise ValidationError({'notes': "Notes must be a string."})
+    if len(notes) > MAX_NOTES_LENGTH:
+        raise ValidationError({'notes': f"Notes are limited to {MAX_NOTES_LENGTH} characters."})
+
+    items = payload.get('items')
+    if not isinstance(items, list) or not items:
+        raise ValidationError({'items': "At least one item is required."})
+    if len(items) > MAX_ITEMS_PER_ORDER:
+        raise ValidationError({'items': f"At most {MAX_ITEMS_PER_ORDER} items per order."})
+
+    known_products = {pk for pk, _ in product_choices()}
+    cleaned_items = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValidationError({'items': f"Item {index} must be an object."})
+        product = item.get('product')
+        quantity = item.get('quantity')
+        if type(product) is not int or product not in known_products:
+            raise ValidationError({'items': f"Item {index} has an unknown product."})
+        if type(quantity) is not int or quantity < 1:
+            raise ValidationError({'items': f"Item {index} needs a positive integer quantity."})
+        cleaned_items.append({'product': product, 'quantity': quantity})
+
+    return {'customer_name': customer_name, 'notes': notes.strip(), 'items': cleaned_items}
+
+
+def write_orders(batch):
+    """Insert a batch of cleaned orders in one transaction and return their ids.
+
+    Orders whose idempotency key was already used (earlier and unexpired, or within
+    the batch) are not inserted again; they resolve to the original order id.
+    """
+    with transaction.atomic():
+        existing = live_keys({cleaned['idempotency_key'] for cleaned in batch if cleaned.get('idempotency_key')})
+
+        new_orders = []
+        pending_keys = {}
+        for cleaned in batch:
+            key = cleaned.get('idempotency_key')
+            if key and (key in existing or key in pending_keys):
+                continue
+            new_orders.append(cleaned)
+            if key:
+                pending_keys[key] = cleaned
+
+        customers = resolve_customers([cleaned['customer_name'] for cleaned in new_orders])
+        orders = Order.objects.bulk_create([
+            Order(customer_name=cleaned['customer_name'], customer_id=customers[cleaned['customer_name']],
+                  notes=cleaned.get('notes', ''))
+            for cleaned in new_orders
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_id=item['product'], quantity=item['quantity'])
+            for order, cleaned in zip(orders, new_orders)
+            for item in cleaned['items']
+        ])
+        order_ids = {id(cleaned): order.pk for order, cleaned in zip(orders, new_orders)}
+        for key, cleaned in pending_keys.items():
+            existing[key] = order_ids[id(cleaned)]
+        IdempotencyKey.objects.bulk_create([
+            IdempotencyKey(key=key, order_id=existing[key]) for key in pending_keys
+        ])
+        record(SALES_ORDER, "Created", [order.pk for order in orders])
+
+    return [
+        existing[cleaned['idempotency_key']] if cleaned.get('idempotency_key') else order_ids[id(cleaned)]
+        for cleaned in batch
+    ]
+
+
+class OrderWriter:
+    """Background writer that coalesces concurrently submitted orders into one transaction.
+
+    While a batch is being written new submissions queue up, so under load each
+    transaction carries many orders; when idle each order is written on its own.
+    """
+
+    def __init__(self, max_batch=500):
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, cleaned):
+        """Queue a cleaned order; the returned future resolves to the new order id."""
+        future = Future()
+        self._queue.put((cleaned, future))
+        self._ensure_started()
+        return future
+
+    def _ensure_started(self):
+        # Also restarts a writer that died, so queued submissions never wait forever
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='order-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                close_old_connections()
+                with acting_as('api'):
+                    self._write(batch)
+            except Exception:
+                # e.g. "database is locked" outside _write's retries; fail the batch, keep the thread
+                logger.exception("Order intake batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(OrderNotSaved("Order could not be saved."))
+            try:
+                maybe_purge_expired()
+            except Exception:
+                logger.exception("Purging expired idempotency keys failed")
+
+    def _write(self, batch):
+        try:
+            order_ids = write_orders([cleaned for cleaned, _ in batch])
+        except Exception:
+            if len(batch) == 1:
+                logger.exception("Order intake write failed")
+                batch[0][1].set_exception(OrderNotSaved("Order could not be saved."))
+                return
+            # Retry one by one so a single bad order doesn't fail the whole batch
+            for entry in batch:
+                self._write([entry])
+            return
+        for (_, future), order_id in zip(batch, order_ids):
+            future.set_result(order_id)
+
+
+order_writer = OrderWriter()
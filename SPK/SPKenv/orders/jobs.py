@@ -0,0 +1,227 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Tuple
+
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per process; every process that enqueues jobs also works the queue
+WORKERS = 2
+# Seconds between queue polls when nothing woke the workers (jobs enqueued by another process)
+POLL_INTERVAL = 2.0
+# A running job whose heartbeat is older than this is presumed lost and runs again
+LEASE = 60.0
+HEARTBEAT_INTERVAL = LEASE / 3
+# Seconds between database writes of a job's progress (and reads of its cancel flag)
+PROGRESS_INTERVAL = 0.5
+
+TASKS = {}
+
+
+class JobCancelled(Exception):
+    """Raised inside a task once cancellation was requested; the job ends as cancelled."""
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    label: str
+    params: Tuple[str, ...]  # keyword parameters a user may fill in
+    max_attempts: int
+    backoff: float  # seconds before the first retry; doubles with each attempt
+
+
+def task(name, *, label=None, params=(), max_attempts=3, backoff=5.0):
+    """Register ``func(job, **params)`` as a background task called ``name``.
+
+    ``job`` is a ``JobContext`` for reporting progress and checking cancellation;
+    the return value (JSON-serializable) becomes the job's result.
+    """
+    def decorator(func):
+        TASKS[name] = Task(name, func, label or name.replace('_', ' ').capitalize(), tuple(params),
+                           max_attempts, backoff)
+        return func
+    return decorator
+
+
+def enqueue(task_name, **params):
+    """Queue a job for a registered task; workers pick it up once the transaction commits."""
+    registered = TASKS.get(task_name)
+    if registered is None:
+        raise LookupError(f"Unknown task {task_name!r}")
+    job = Job.objects.create(task=task_name, params=params, max_attempts=registered.max_attempts)
+    transaction.on_commit(job_runner.wake)
+    return job
+
+
+def cancel(job_id):
+    """Cancel a queued job at once, or ask a running one to stop; False if it already ended."""
+    now = timezone.now()
+    if Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.CANCELLED, cancel_requested=True, finished_at=now):
+        return True
+    return bool(Job.objects.filter(pk=job_id, status=Job.RUNNING).update(cancel_requested=True))
+
+
+class JobContext:
+    """What a running task sees of its job."""
+
+    def __init__(self, job, worker):
+        self.id = job.pk
+        self.attempt = job.attempts
+        self._worker = worker
+        self._reported_at = 0.0
+        self._cancelled = False
+
+    def progress(self, done, total=None, message=''):
+        """Record progress (``done`` of ``total``, or a percentage) and stop if cancelled.
+
+        Cheap to call per row: the database is touched at most every PROGRESS_INTERVAL.
+        """
+        now = time.monotonic()
+        if now - self._reported_at < PROGRESS_INTERVAL:
+            return
+        self._reported_at = now
+        percent = int(done * 100 / total) if total else int(done)
+        Job.objects.filter(pk=self.id, worker=self._worker).update(
+            progress=min(max(percent, 0), 99), message=message[:200], heartbeat_at=timezone.now(),
+        )
+        self._cancelled = Job.objects.filter(pk=self.id, cancel_requested=True).exists()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self._cancelled:
+            raise JobCancelled()
+
+
+class JobRunner:
+    """Pool of worker threads working the persistent job queue (no broker needed).
+
+    Workers claim a due job with a conditional UPDATE, so several processes can share
+    the queue. Failures are retried with exponential backoff up to the task's
+    ``max_attempts``; a job whose worker died is picked up again once its heartbeat
+    is older than LEASE.
+    """
+
+    def __init__(self, workers=WORKERS, poll_interval=POLL_INTERVAL, lease=LEASE):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._wake = threading.Event()
+        self._threads = []
+        self._active = {}  # job pk -> worker name, for heartbeats
+        self._lock = threading.Lock()
+
+    def wake(self):
+        self._ensure_started()
+        self._wake.set()
+
+    def _ensure_started(self):
+        if not self._threads:
+            with self._lock:
+                if not self._threads:
+                    prefix = f"{socket.gethostname()}:{os.getpid()}"
+                    for number in range(self.workers):
+                        thread = threading.Thread(target=self._work, args=(f"{prefix}:job-worker-{number}",),
+                                                  name=f'job-worker-{number}', daemon=True)
+                        self._threads.append(thread)
+                    self._threads.append(threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True))
+                    for thread in self._threads:
+                        thread.start()
+
+    def run_forever(self):
+        """Work the queue from the calling process until interrupted (manage.py run_jobs)."""
+        self.wake()
+        while True:
+            time.sleep(self.poll_interval)
+
+    def _work(self, worker):
+        while True:
+            close_old_connections()
+            try:
+                job = self._claim(worker)
+            except Exception:
+                logger.exception("Job claim failed")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._active[job.pk] = worker
+            try:
+                self._execute(job, worker)
+            finally:
+                self._active.pop(job.pk, None)
+
+    def _claim(self, worker):
+        now = timezone.now()
+        due = Job.objects.filter(
+            Q(status=Job.QUEUED, run_after__lte=now)
+            | Q(status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=self.lease))
+        ).order_by('run_after', 'pk').values_list('pk', 'status', 'attempts')[:5]
+        for pk, status, attempts in due:
+            # Only one worker's update matches; the others move on to the next candidate
+            if Job.objects.filter(pk=pk, status=status, attempts=attempts).update(
+                    status=Job.RUNNING, attempts=F('attempts') + 1, worker=worker,
+                    started_at=now, heartbeat_at=now):
+                return Job.objects.get(pk=pk)
+        return None
+
+    def _execute(self, job, worker):
+        registered = TASKS.get(job.task)
+        owned = Job.objects.filter(pk=job.pk, worker=worker, status=Job.RUNNING)
+        if registered is None or job.attempts > job.max_attempts:
+            error = f"Unknown task {job.task!r}" if registered is None else "Worker lost too many times"
+            owned.update(status=Job.FAILED, error=error, finished_at=timezone.now())
+            return
+        try:
+            result = registered.func(JobContext(job, worker), **job.params)
+        except JobCancelled:
+            owned.update(status=Job.CANCELLED, finished_at=timezone.now())
+        except Exception as exc:
+            error = ''.join(traceback.format_exception(exc))
+            if job.attempts < job.max_attempts:
+                delay = registered.backoff * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+                logger.warning("Job %s failed (attempt %s), retrying in %.0fs: %s", job.pk, job.attempts, delay, exc)
+                owned.update(status=Job.QUEUED, error=error, heartbeat_at=None,
+                             run_after=timezone.now() + timedelta(seconds=delay))
+            else:
+                logger.error("Job %s failed after %s attempts: %s", job.pk, job.attempts, exc)
+                owned.update(status=Job.FAILED, error=error, finished_at=timezone.now())
+        else:
+            owned.update(status=Job.SUCCEEDED, progress=100, message='', result=result, error='',
+                         finished_at=timezone.now())
+
+    def _heartbeat(self):
+        # Keeps long tasks that rarely report progress from looking lost
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            if not self._active:
+                continue
+            close_old_connections()
+            try:
+                self._beat()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    def _beat(self):
+        # Only the holder's heartbeat counts: a job reclaimed by another worker is left alone
+        now = timezone.now()
+        for pk, worker in dict(self._active).items():
+            Job.objects.filter(pk=pk, worker=worker, status=Job.RUNNING).update(heartbeat_at=now)
+
+
+job_runner = JobRunner()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from orders.audit import audit_log
+from orders.models import Order, Product
+
+
+class Command(BaseCommand):
+    help = "Local load test: JSON intake endpoint (ASGI) vs the form-based create_order view."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--items', type=int, default=3, help="Items per order.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with tempfile.TemporaryDirectory() as tmp, override_settings(AUDIT_LOG_DIR=Path(tmp) / 'audit_log'):
+            # File-backed scratch database so concurrent writers behave like production;
+            # the bench orders' audit entries go to a scratch log next to it
+            connection.settings_dict['TEST']['NAME'] = str(Path(tmp) / 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0)
+            try:
+                products = Product.objects.bulk_create([
+                    Product(sku=f'BENCH{i:03d}', name=f'Bench product {i}', price=10 + i)
+                    for i in range(options['items'])
+                ])
+                product_ids = [product.pk for product in products]
+
+                elapsed = self.run_forms(product_ids, options)
+                self.report('create_order (form)', options['requests'], elapsed)
+                elapsed = asyncio.run(self.run_intake(product_ids, options))
+                self.report('intake_order (ASGI)', options['requests'], elapsed)
+                self.stdout.write(f"{Order.objects.count()} orders written")
+            finally:
+                audit_log.close()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+    def report(self, label, count, elapsed):
+        self.stdout.write(f"{label:>22}: {count} requests in {elapsed:.2f}s ({count / elapsed:.0f} req/s)")
+
+    def run_forms(self, product_ids, options):
+        url = reverse('create_order')
+        data = {
+            'customer_name': 'Bench customer',
+            'items-TOTAL_FORMS': str(len(product_ids)),
+            'items-INITIAL_FORMS': '0',
+        }
+        for index, product_id in enumerate(product_ids):
+            data[f'items-{index}-product'] = str(product_id)
+            data[f'items-{index}-quantity'] = '2'
+
+        def post(_):
+            response = Client().post(url, data)
+            assert response.status_code == 302, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            list(pool.map(post, range(options['requests'])))
+        return time.perf_counter() - started
+
+    async def run_intake(self, product_ids, options):
+        url = reverse('intake_order')
+        body = json.dumps({
+            'customer_name': 'Bench customer',
+            'items': [{'product': product_id, 'quantity': 2} for product_id in product_ids],
+        })
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def post():
+            async with semaphore:
+                response = await client.post(url, body, content_type='application/json')
+                assert response.status_code == 201, response.status_code
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post() for _ in range(options['requests'])))
+        return time.perf_counter() - started
@@ -0,0 +1,22 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from orders.staticfiles import build_image_variants
+
+
+class Command(BaseCommand):
+    help = "Build WebP image variants, then collect hashed, pre-compressed static files into STATIC_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quality', type=int, default=80, help='WebP quality (0-100).')
+        parser.add_argument('--skip-images', action='store_true', help='Only collect static files.')
+
+    def handle(self, *args, **options):
+        if not options['skip_images']:
+            try:
+                written = build_image_variants(options['quality'])
+            except ImportError:
+                self.stderr.write("Pillow is not installed; skipping WebP image variants")
+            else:
+                self.stdout.write(f"Wrote {written} WebP image variants")
+        call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
@@ -0,0 +1,135 @@
+import csv
+import json
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders.models import Product
+
+FIELDS = ('sku', 'name', 'price')
+READ_SIZE = 1 << 16
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+def read_json_lines(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_json_array(stream):
+    """Yield the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(READ_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError("JSON input must be an array of product objects.")
+    buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            more = stream.read(READ_SIZE)
+            if not more:
+                raise CommandError("Truncated or invalid JSON input.")
+            buffer += more
+            continue
+        yield obj
+        buffer = buffer[end:]
+        if len(buffer) < READ_SIZE:
+            buffer += stream.read(READ_SIZE)
+
+
+READERS = {
+    '.csv': read_csv,
+    '.jsonl': read_json_lines,
+    '.ndjson': read_json_lines,
+    '.json': read_json_array,
+}
+
+
+def clean_row(number, row):
+    if not isinstance(row, dict):
+        raise CommandError(f"Row {number}: expected an object with sku, name and price, got {type(row).__name__}")
+    try:
+        sku = str(row['sku']).strip()
+        name = str(row['name']).strip()
+        price = Decimal(str(row['price']).strip()).quantize(Decimal('0.01'))
+    except KeyError as exc:
+        raise CommandError(f"Row {number}: missing {exc.args[0]!r}")
+    except InvalidOperation:
+        raise CommandError(f"Row {number}: invalid price {row['price']!r}")
+    if not sku or len(sku) > Product._meta.get_field('sku').max_length:
+        raise CommandError(f"Row {number}: invalid sku {sku!r}")
+    if not name or len(name) > Product._meta.get_field('name').max_length:
+        raise CommandError(f"Row {number}: invalid name for sku {sku!r}")
+    return Product(sku=sku, name=name, price=price)
+
+
+class Command(BaseCommand):
+    help = "Stream products from a CSV/JSON/JSON Lines file and upsert them by sku in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File with sku, name and price columns/keys.")
+        parser.add_argument('--format', choices=sorted(READERS), help="Override format detection by extension.")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        reader = READERS.get(options['format'] or path.suffix.lower())
+        if reader is None:
+            raise CommandError(f"Unsupported file type {path.suffix!r}; use one of {', '.join(sorted(READERS))}")
+
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        started = time.perf_counter()
+        with path.open(newline='', encoding='utf-8') as stream:
+            rows = (clean_row(number, row) for number, row in enumerate(reader(stream), start=1))
+            total = 0
+            while chunk := list(islice(rows, options['chunk_size'])):
+                total += len(chunk)
+                # One short transaction per chunk, so other writers get the SQLite lock in between;
+                # a bad row stops the import after the chunks before it (re-running is safe)
+                with transaction.atomic():
+                    self.upsert(chunk, counts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} rows in {time.perf_counter() - started:.2f}s: "
+            f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged"
+        ))
+
+    def upsert(self, chunk, counts):
+        # Last row wins when a sku repeats within a chunk
+        by_sku = {product.sku: product for product in chunk}
+        existing = {
+            sku: (name, price)
+            for sku, name, price in Product.objects.filter(sku__in=by_sku).values_list(*FIELDS)
+        }
+
+        changed = []
+        for sku, product in by_sku.items():
+            current = existing.get(sku)
+            if current is None:
+                counts['inserted'] += 1
+            elif current == (product.name, product.price):
+                counts['unchanged'] += 1
+                continue
+            else:
+                counts['updated'] += 1
+            changed.append(product)
+
+        if changed:
+            Product.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['sku'],
+                update_fields=['name', 'price'],
+            )
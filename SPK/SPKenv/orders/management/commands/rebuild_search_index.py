@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from orders.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text order search index from the order tables."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Indexed {rebuild_index()} orders")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from orders.summaries import rebuild_summaries, refresh_summaries
+
+
+class Command(BaseCommand):
+    help = "Fold new orders and status changes into the daily/monthly report summaries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Rebuild from scratch, e.g. after editing old orders or product prices.")
+
+    def handle(self, *args, **options):
+        folded = rebuild_summaries() if options['full'] else refresh_summaries()
+        self.stdout.write(", ".join(f"{count} {source}" for source, count in folded.items()) + " folded")
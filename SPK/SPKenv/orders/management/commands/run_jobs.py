@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from orders.jobs import WORKERS, JobRunner
+
+
+class Command(BaseCommand):
+    help = "Work the background job queue in this process until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=WORKERS)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Working the job queue with {options['workers']} workers (Ctrl+C to stop)")
+        try:
+            JobRunner(workers=options['workers']).run_forever()
+        except KeyboardInterrupt:
+            pass
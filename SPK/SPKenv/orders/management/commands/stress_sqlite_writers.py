@@ -0,0 +1,107 @@
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SCHEMA = """
+CREATE TABLE orders_order (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    customer_name VARCHAR(255) NOT NULL,
+    date_created DATETIME NOT NULL
+);
+CREATE TABLE orders_orderitem (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id BIGINT NOT NULL REFERENCES orders_order (id),
+    product_id BIGINT NOT NULL,
+    quantity INTEGER UNSIGNED NOT NULL
+);
+"""
+
+
+def connect(path, profile):
+    # Mirror what Django does for DATABASES OPTIONS: timeout, init_command, transaction_mode
+    conn = sqlite3.connect(path, timeout=profile['timeout'], isolation_level=None, check_same_thread=False)
+    for name, value in profile['pragmas'].items():
+        conn.execute(f'PRAGMA {name}={value}')
+    return conn
+
+
+class Command(BaseCommand):
+    help = "Concurrent order-writer stress test comparing SQLite connection profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--orders', type=int, default=200, help="Orders written by each writer.")
+        parser.add_argument('--items', type=int, default=3, help="Items per order.")
+        parser.add_argument(
+            '--profile', action='append', dest='profiles',
+            help="Profile name from settings.SQLITE_PROFILES (repeatable). Defaults to all.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.SQLITE_PROFILES)
+        unknown = set(profiles) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown SQLite profile(s): {', '.join(sorted(unknown))}")
+
+        for name in profiles:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = self.run_profile(Path(tmp) / 'stress.sqlite3', settings.SQLITE_PROFILES[name], options)
+            self.stdout.write(
+                f"{name:>12}: {result['orders']} orders in {result['elapsed']:.2f}s "
+                f"({result['orders'] / result['elapsed']:.0f} orders/s), "
+                f"{result['locked']} 'database is locked' errors"
+            )
+
+    def run_profile(self, path, profile, options):
+        setup = connect(path, profile)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        begin = f"BEGIN {profile['transaction_mode']}" if profile['transaction_mode'] else 'BEGIN'
+        counts = {'orders': 0, 'locked': 0}
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(options['writers'])
+
+        def writer(writer_id):
+            conn = connect(path, profile)
+            written = locked = 0
+            start_barrier.wait()
+            for n in range(options['orders']):
+                try:
+                    conn.execute(begin)
+                    # Read-then-write, like a form save, so deferred transactions hit lock upgrades
+                    conn.execute('SELECT COUNT(*) FROM orders_order WHERE customer_name = ?', (f'w{writer_id}',))
+                    cursor = conn.execute(
+                        "INSERT INTO orders_order (customer_name, date_created) VALUES (?, datetime('now'))",
+                        (f'w{writer_id}',),
+                    )
+                    conn.executemany(
+                        'INSERT INTO orders_orderitem (order_id, product_id, quantity) VALUES (?, ?, ?)',
+                        [(cursor.lastrowid, item + 1, n + 1) for item in range(options['items'])],
+                    )
+                    conn.execute('COMMIT')
+                    written += 1
+                except sqlite3.OperationalError as exc:
+                    if 'locked' not in str(exc):
+                        raise
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    locked += 1
+            conn.close()
+            with lock:
+                counts['orders'] += written
+                counts['locked'] += locked
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counts['elapsed'] = time.perf_counter() - started
+        return counts
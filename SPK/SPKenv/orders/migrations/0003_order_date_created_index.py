@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='date_created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
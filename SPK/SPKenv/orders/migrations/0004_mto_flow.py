@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_date_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='status',
+            field=models.CharField(db_index=True, default='Created', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='category',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='sustainability_score',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ProductionOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('start_date', models.DateTimeField()),
+                ('status', models.CharField(db_index=True, default='Planned', max_length=30)),
+                ('completion_percentage', models.PositiveSmallIntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='orders.product')),
+                ('sales_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_orders', to='orders.order')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Delivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delivery_date', models.DateTimeField()),
+                ('status', models.CharField(default='Shipped', max_length=30)),
+                ('tracking_number', models.CharField(max_length=20, unique=True)),
+                ('production_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='orders.productionorder')),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.db import migrations
+
+# The sample catalog the Streamlit MTO app used to build in memory
+MTO_PRODUCTS = [
+    ("PKG001", "Eco-Friendly Bouquet Wrapper", "Flower Shop", Decimal("15.99"), 95),
+    ("PKG002", "Biodegradable Gift Box", "Gift Store", Decimal("8.50"), 90),
+    ("PKG003", "Compostable Food Container", "Food & Beverage", Decimal("12.75"), 88),
+    ("PKG004", "Recycled Paper Bag", "General", Decimal("3.25"), 85),
+    ("PKG005", "Plant-Based Drink Cup", "Food & Beverage", Decimal("6.99"), 92),
+    ("PKG006", "Sustainable Gift Wrap", "Gift Store", Decimal("4.50"), 87),
+]
+
+
+def add_mto_products(apps, schema_editor):
+    Product = apps.get_model('orders', 'Product')
+    for sku, name, category, price, score in MTO_PRODUCTS:
+        Product.objects.update_or_create(sku=sku, defaults={
+            'name': name,
+            'category': category,
+            'price': price,
+            'sustainability_score': score,
+        })
+
+
+def remove_mto_products(apps, schema_editor):
+    Product = apps.get_model('orders', 'Product')
+    Product.objects.filter(sku__in=[sku for sku, *_ in MTO_PRODUCTS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_mto_flow'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_mto_products, remove_mto_products),
+    ]
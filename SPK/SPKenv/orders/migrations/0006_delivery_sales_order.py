@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_deliveries_to_sales_orders(apps, schema_editor):
+    Delivery = apps.get_model('orders', 'Delivery')
+    for delivery in Delivery.objects.select_related('production_order'):
+        delivery.sales_order_id = delivery.production_order.sales_order_id
+        delivery.save(update_fields=['sales_order'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_mto_sample_products'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='sales_order',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='orders.order'),
+        ),
+        migrations.RunPython(link_deliveries_to_sales_orders, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='delivery',
+            name='production_order',
+        ),
+        migrations.AlterField(
+            model_name='delivery',
+            name='sales_order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='orders.order'),
+        ),
+    ]
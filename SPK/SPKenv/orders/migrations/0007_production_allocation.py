@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def allocate_existing_production_orders(apps, schema_editor):
+    ProductionOrder = apps.get_model('orders', 'ProductionOrder')
+    ProductionAllocation = apps.get_model('orders', 'ProductionAllocation')
+    ProductionAllocation.objects.bulk_create([
+        ProductionAllocation(production_order_id=pk, sales_order_id=sales_order_id, quantity=quantity)
+        for pk, sales_order_id, quantity in ProductionOrder.objects.values_list('pk', 'sales_order_id', 'quantity')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_delivery_sales_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionAllocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('production_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='allocations', to='orders.productionorder')),
+                ('sales_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_allocations', to='orders.order')),
+            ],
+        ),
+        migrations.RunPython(allocate_existing_production_orders, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='productionorder',
+            name='sales_order',
+        ),
+        migrations.AddField(
+            model_name='productionorder',
+            name='sales_orders',
+            field=models.ManyToManyField(related_name='production_orders', through='orders.ProductionAllocation', to='orders.order'),
+        ),
+    ]
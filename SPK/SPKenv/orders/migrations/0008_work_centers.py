@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Work centers for the sample MTO catalog: (code, name, lines, setup minutes)
+WORK_CENTERS = [
+    ("WRAP", "Wrapping & Folding", 2, 30),
+    ("FORM", "Thermoforming", 1, 60),
+    ("BOX", "Box & Bag Line", 2, 20),
+]
+
+# sku -> (work center code, cycle seconds per unit)
+ROUTINGS = {
+    "PKG001": ("WRAP", 20),
+    "PKG002": ("BOX", 45),
+    "PKG003": ("FORM", 30),
+    "PKG004": ("BOX", 8),
+    "PKG005": ("FORM", 15),
+    "PKG006": ("WRAP", 10),
+}
+
+
+def add_work_centers(apps, schema_editor):
+    WorkCenter = apps.get_model('orders', 'WorkCenter')
+    Product = apps.get_model('orders', 'Product')
+    work_centers = {}
+    for code, name, lines, setup_minutes in WORK_CENTERS:
+        work_centers[code], _ = WorkCenter.objects.update_or_create(code=code, defaults={
+            'name': name,
+            'lines': lines,
+            'setup_minutes': setup_minutes,
+        })
+    for sku, (code, cycle_seconds) in ROUTINGS.items():
+        Product.objects.filter(sku=sku).update(work_center=work_centers[code], cycle_seconds=cycle_seconds)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_production_allocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkCenter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('lines', models.PositiveSmallIntegerField(default=1)),
+                ('setup_minutes', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='cycle_seconds',
+            field=models.PositiveIntegerField(default=60),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='work_center',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='orders.workcenter'),
+        ),
+        migrations.RunPython(add_work_centers, migrations.RunPython.noop),
+    ]
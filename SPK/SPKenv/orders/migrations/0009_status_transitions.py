@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:22
+
+from django.db import migrations, models
+
+# Codes from orders.transitions at the time of this migration
+SALES_ORDER, PRODUCTION_ORDER = 1, 2
+CREATED, DELIVERED = 1, 4
+PLANNED = 1
+
+
+def backfill_known_transitions(apps, schema_editor):
+    """Record the transitions existing rows carry timestamps for; the rest are unknown."""
+    Order = apps.get_model('orders', 'Order')
+    ProductionOrder = apps.get_model('orders', 'ProductionOrder')
+    Delivery = apps.get_model('orders', 'Delivery')
+    StatusTransition = apps.get_model('orders', 'StatusTransition')
+
+    def rows(kind, status, pairs):
+        return [
+            StatusTransition(kind=kind, record_id=pk, status=status, at_ms=int(moment.timestamp() * 1000))
+            for pk, moment in pairs
+        ]
+
+    StatusTransition.objects.bulk_create(
+        rows(SALES_ORDER, CREATED, Order.objects.values_list('pk', 'date_created').iterator())
+        + rows(SALES_ORDER, DELIVERED, Delivery.objects.values_list('sales_order_id', 'delivery_date').iterator())
+        + rows(PRODUCTION_ORDER, PLANNED, ProductionOrder.objects.values_list('pk', 'start_date').iterator()),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_work_centers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField()),
+                ('record_id', models.PositiveIntegerField()),
+                ('status', models.PositiveSmallIntegerField()),
+                ('at_ms', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'record_id'], name='orders_stat_kind_c262fc_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_known_transitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:24
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# The nine cards dashboard.html used to hardcode:
+# (sku, name, category, price, unit, badge, image, features, description)
+DASHBOARD_PRODUCTS = [
+    ("PKG007", "Eco Shipping Boxes", "Shipping & Mailing", Decimal("0.85"), "unit", "Most Popular",
+     "sustainable-cardboard-box-packaging.jpg", "100% Recyclable, Custom Sizes, Branded Options",
+     "Durable corrugated boxes made from 100% recycled materials, perfect for e-commerce shipping and product protection."),
+    ("PKG008", "Kraft Paper Bags", "Specialty & Gifts", Decimal("0.45"), "unit", "Best Value",
+     "kraft-paper-shopping-bag.jpg", "FSC Certified, Strong Handles, Custom Print",
+     "Premium kraft paper shopping bags with reinforced handles, ideal for retail stores and boutique businesses."),
+    ("PKG009", "Compostable Cups", "Food Service", Decimal("0.12"), "unit", "Trending",
+     "compostable-paper-coffee-cup.jpg", "Compostable, Heat Resistant, Custom Logo",
+     "Plant-based coffee cups that break down completely in commercial composting facilities within 90 days."),
+    ("PKG010", "Mailing Tubes", "Shipping & Mailing", Decimal("1.20"), "unit", "",
+     "cardboard-mailing-tube.jpg", "Crush Resistant, Various Sizes",
+     "Sturdy cardboard tubes perfect for shipping posters, documents, and artwork safely."),
+    ("PKG011", "Biodegradable Mailers", "Shipping & Mailing", Decimal("0.65"), "unit", "",
+     "biodegradable-shipping-mailer.jpg", "Biodegradable, Water Resistant",
+     "Lightweight shipping envelopes that decompose naturally while protecting your products."),
+    ("PKG012", "Paper Straws", "Food Service", Decimal("0.03"), "unit", "",
+     "paper-drinking-straws.jpg", "Biodegradable, Food Safe, Colorful",
+     "Durable paper straws that maintain integrity in beverages while being fully biodegradable."),
+    ("PKG013", "Cup Holders", "Food Service", Decimal("0.18"), "unit", "",
+     "cardboard-cup-carrier-holder.jpg", "Sturdy Design, Multiple Sizes",
+     "Convenient cardboard carriers for multiple beverages, perfect for coffee shops and takeout."),
+    ("PKG014", "Small Gift Bags", "Specialty & Gifts", Decimal("0.35"), "unit", "",
+     "small-kraft-paper-gift-bag.jpg", "Premium Feel, Multiple Colors, Ribbon Handles",
+     "Elegant small bags perfect for jewelry, cosmetics, and small gift items with premium feel."),
+    ("PKG015", "Bouquet Wrapping", "Specialty & Gifts", Decimal("0.25"), "sheet", "",
+     "floral-wrapping-paper-bouquet.jpg", "Water Resistant, Elegant Designs, Eco-Friendly",
+     "Beautiful floral wrapping papers made from sustainable materials for elegant flower arrangements."),
+]
+
+
+def add_dashboard_products(apps, schema_editor):
+    Product = apps.get_model('orders', 'Product')
+    for sku, name, category, price, unit, badge, image, features, description in DASHBOARD_PRODUCTS:
+        Product.objects.update_or_create(sku=sku, defaults={
+            'name': name,
+            'category': category,
+            'price': price,
+            'unit': unit,
+            'badge': badge,
+            'image': image,
+            'features': features,
+            'description': description,
+        })
+
+
+def remove_dashboard_products(apps, schema_editor):
+    Product = apps.get_model('orders', 'Product')
+    Product.objects.filter(sku__in=[sku for sku, *_ in DASHBOARD_PRODUCTS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_status_transitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='badge',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='features',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='image',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='unit',
+            field=models.CharField(default='unit', max_length=20),
+        ),
+        migrations.RunPython(add_dashboard_products, remove_dashboard_products),
+    ]
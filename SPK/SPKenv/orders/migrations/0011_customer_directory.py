@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:40
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize_customer_name(name):
+    # Copy of orders.models.normalize_customer_name at the time of this migration
+    name = unicodedata.normalize('NFKC', name).casefold()
+    return ' '.join(re.sub(r'[^\w]+', ' ', name).split())
+
+
+def build_directory(apps, schema_editor):
+    """Normalize existing customers (merging duplicates), then link every order by name."""
+    Customer = apps.get_model('orders', 'Customer')
+    Order = apps.get_model('orders', 'Order')
+
+    customers = {}
+    for customer in Customer.objects.order_by('pk'):
+        key = normalize_customer_name(customer.name)
+        kept = customers.get(key)
+        if kept is None:
+            customer.normalized_name = key
+            customer.save(update_fields=['normalized_name'])
+            customers[key] = customer
+        else:
+            if not kept.email and customer.email:
+                kept.email = customer.email
+                kept.save(update_fields=['email'])
+            customer.delete()
+
+    names_by_key = {}
+    for name in Order.objects.values_list('customer_name', flat=True).distinct().iterator():
+        key = normalize_customer_name(name)
+        if key:
+            names_by_key.setdefault(key, []).append(name)
+
+    Customer.objects.bulk_create(
+        [Customer(name=names[0], normalized_name=key) for key, names in names_by_key.items() if key not in customers],
+        batch_size=2000,
+    )
+    pks = dict(Customer.objects.values_list('normalized_name', 'pk'))
+    for key, names in names_by_key.items():
+        Order.objects.filter(customer_name__in=names).update(customer_id=pks[key])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_dashboard_catalog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customer',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='orders.customer'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', '-date_created'], name='orders_orde_custome_c04fff_idx'),
+        ),
+        migrations.RunPython(build_directory, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customer',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_customer_directory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='notes',
+            field=models.TextField(blank=True),
+        ),
+        # Sync triggers and the initial fill are installed after migrate by
+        # orders.search.install_triggers, which also restores them if a later
+        # migration rebuilds one of the indexed tables
+        migrations.RunSQL(
+            """
+            CREATE VIRTUAL TABLE orders_search USING fts5(
+                ref, customer, products, tracking, notes,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+            """,
+            "DROP TABLE orders_search",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0014_job_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('name', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField()),
+                ('changed_ms', models.BigIntegerField()),
+            ],
+        ),
+    ]
@@ -1,18 +1,53 @@
+import re
+import unicodedata
+
 from django.db import models
+from django.utils import timezone
+
 
-# Customer model (optional if you want to store email info)
+def normalize_customer_name(name):
+    """'  ACME Florist, Inc. ' -> 'acme florist inc': the key repeat customers are matched on."""
+    name = unicodedata.normalize('NFKC', name).casefold()
+    return ' '.join(re.sub(r'[^\w]+', ' ', name).split())
+
+# Customer directory; orders link here by id, matched on the normalized name
 class Customer(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=255)  # as first entered
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)  # prefix search index
     email = models.EmailField(blank=True, null=True)
 
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_customer_name(self.name)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
+# Production resource with identical parallel lines (capacity planning)
+class WorkCenter(models.Model):
+    code = models.CharField(max_length=20, unique=True)
+    name = models.CharField(max_length=100)
+    lines = models.PositiveSmallIntegerField(default=1)
+    setup_minutes = models.PositiveIntegerField(default=0)  # changeover between products
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
 # Product model
 class Product(models.Model):
     sku = models.CharField(max_length=20, unique=True)
     name = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=10, decimal_places=2)  # PHP
+    category = models.CharField(max_length=50, blank=True)
+    sustainability_score = models.PositiveSmallIntegerField(default=0)  # percent
+    work_center = models.ForeignKey(WorkCenter, related_name="products", null=True, blank=True, on_delete=models.SET_NULL)
+    cycle_seconds = models.PositiveIntegerField(default=60)  # per unit
+    # Storefront card (dashboard)
+    description = models.TextField(blank=True)
+    features = models.CharField(max_length=200, blank=True)  # comma-separated tags
+    image = models.CharField(max_length=200, blank=True)  # file name under static/img/
+    badge = models.CharField(max_length=30, blank=True)  # shown in "Most Popular Choices" when set
+    unit = models.CharField(max_length=20, default="unit")  # price is per unit/sheet/...
 
     def __str__(self):
         return f"{self.sku} - {self.name} (₱{self.price})"
@@ -20,7 +55,18 @@ class Product(models.Model):
 # Order model
 class Order(models.Model):
     customer_name = models.CharField(max_length=255)  # free text input
-    date_created = models.DateTimeField(auto_now_add=True)
+    # Linked from customer_name on save (see signals); indexed with date_created below
+    customer = models.ForeignKey(Customer, related_name="orders", on_delete=models.SET_NULL,
+                                 null=True, blank=True, db_index=False)
+    date_created = models.DateTimeField(auto_now_add=True, db_index=True)
+    status = models.CharField(max_length=30, default="Created", db_index=True)  # MTO flow status
+    notes = models.TextField(blank=True)  # free text, full-text searchable (see search.py)
+
+    class Meta:
+        indexes = [
+            # Per-customer history, newest first, without scanning all orders
+            models.Index(fields=['customer', '-date_created']),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.customer_name}"
@@ -36,3 +82,163 @@ class OrderItem(models.Model):
 
     def __str__(self):
         return f"{self.product.name} (x{self.quantity})"
+
+# Production run for one product, possibly batched across several sales orders (MTO flow)
+class ProductionOrder(models.Model):
+    sales_orders = models.ManyToManyField(Order, through="ProductionAllocation", related_name="production_orders")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
+    start_date = models.DateTimeField()
+    status = models.CharField(max_length=30, default="Planned", db_index=True)
+    completion_percentage = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f"Production Order #{self.id} - {self.product.name} (x{self.quantity})"
+
+# Quantity of a production run allocated to one sales order
+class ProductionAllocation(models.Model):
+    production_order = models.ForeignKey(ProductionOrder, related_name="allocations", on_delete=models.CASCADE)
+    sales_order = models.ForeignKey(Order, related_name="production_allocations", on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"Order #{self.sales_order_id}: {self.quantity} from Production Order #{self.production_order_id}"
+
+# Delivery of a sales order once all its production orders are completed
+class Delivery(models.Model):
+    sales_order = models.ForeignKey(Order, related_name="deliveries", on_delete=models.CASCADE)
+    delivery_date = models.DateTimeField()
+    status = models.CharField(max_length=30, default="Shipped")
+    tracking_number = models.CharField(max_length=20, unique=True)
+
+    def __str__(self):
+        return f"Delivery #{self.id} ({self.tracking_number})"
+
+# One status change of a sales or production order, stored as small-int codes (see transitions.py)
+class StatusTransition(models.Model):
+    kind = models.PositiveSmallIntegerField()  # sales order / production order
+    record_id = models.PositiveIntegerField()
+    status = models.PositiveSmallIntegerField()
+    at_ms = models.BigIntegerField()  # Unix epoch milliseconds
+
+    class Meta:
+        indexes = [models.Index(fields=["kind", "record_id"])]
+
+    def __str__(self):
+        return f"{self.kind}:{self.record_id} -> {self.status} @ {self.at_ms}"
+
+# Idempotency key for order submissions (form token or Idempotency-Key header)
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    order = models.ForeignKey(Order, related_name="+", on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.key} -> Order #{self.order_id}"
+
+# Materialized report tables, folded in incrementally from the order and transition
+# tables by summaries.py; one row per period (day or month) and product / stage
+PERIODS = [("day", "Day"), ("month", "Month")]
+
+
+class OrderSummary(models.Model):
+    period = models.CharField(max_length=5, choices=PERIODS)
+    start = models.DateField()  # first day of the period
+    orders = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sustainable_units = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # units x score
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["period", "start"], name="unique_order_summary")]
+
+    def __str__(self):
+        return f"{self.period} {self.start}: {self.orders} orders"
+
+
+class ProductSummary(models.Model):
+    period = models.CharField(max_length=5, choices=PERIODS)
+    start = models.DateField()
+    product = models.ForeignKey(Product, related_name="+", on_delete=models.CASCADE)
+    orders = models.PositiveIntegerField(default=0)  # orders containing the product
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sustainable_units = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["period", "start", "product"], name="unique_product_summary")]
+
+    def __str__(self):
+        return f"{self.period} {self.start}: {self.units} x product #{self.product_id}"
+
+
+# Status changes per period, e.g. orders delivered in a month and their order value
+class StageSummary(models.Model):
+    period = models.CharField(max_length=5, choices=PERIODS)
+    start = models.DateField()
+    kind = models.PositiveSmallIntegerField()  # transitions.SALES_ORDER / PRODUCTION_ORDER
+    status = models.PositiveSmallIntegerField()  # transitions.STATUS_CODES
+    count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # sales orders only
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["period", "start", "kind", "status"], name="unique_stage_summary"),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.start}: {self.count} x {self.kind}:{self.status}"
+
+
+# Last source row id folded into the summaries, per source table
+class SummaryWatermark(models.Model):
+    source = models.CharField(max_length=30, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.last_id}"
+
+# Change counter of a group of tables, bumped by SQLite triggers on every write from any
+# process (see versions.py); cached pages and the catalog are keyed on it
+class DataVersion(models.Model):
+    name = models.CharField(max_length=30, primary_key=True)
+    version = models.BigIntegerField()
+    changed_ms = models.BigIntegerField()  # epoch milliseconds of the latest bump
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+# Background job in the persistent queue worked by jobs.JobRunner (see jobs.py)
+class Job(models.Model):
+    QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+    STATUSES = [(QUEUED, "Queued"), (RUNNING, "Running"), (SUCCEEDED, "Succeeded"), (FAILED, "Failed"),
+                (CANCELLED, "Cancelled")]
+    ACTIVE = (QUEUED, RUNNING)
+
+    task = models.CharField(max_length=100)  # name registered with @jobs.task
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)  # retries wait out their backoff
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    message = models.CharField(max_length=200, blank=True)  # latest progress note
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    worker = models.CharField(max_length=100, blank=True)  # host:pid:thread holding the job
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # a stale heartbeat frees the job
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    @property
+    def error_summary(self):
+        return self.error.strip().splitlines()[-1] if self.error else ""
+
+    def __str__(self):
+        return f"Job #{self.id} {self.task} ({self.status})"
@@ -0,0 +1,32 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+def estimated_count(queryset):
+    """Cheap row-count estimate for an unfiltered table."""
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    # Max of an auto-increment pk is an index lookup; it over-counts only by deleted rows
+    return queryset.aggregate(estimate=Max('pk'))['estimate'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that skips COUNT(*) over the whole table on unfiltered changelists."""
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where or query.distinct:
+            return super().count
+        return estimated_count(self.object_list.model._default_manager.using(self.object_list.db))
@@ -0,0 +1,140 @@
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# FTS5 table (migration 0012) with one document per sales order, kept in sync by the
+# SQLite triggers below, so every writer (ORM, bulk_create, raw SQL) updates it
+SEARCH_TABLE = 'orders_search'
+COLUMNS = ('ref', 'customer', 'products', 'tracking', 'notes')
+# bm25 weights per column: a hit on an id, customer or tracking number beats one in notes
+WEIGHTS = (8.0, 4.0, 2.0, 8.0, 1.0)
+SEARCH_LIMIT = 20
+# Notes can be long: show a window of this many tokens around the match instead
+NOTES_SNIPPET_TOKENS = 16
+# Highlight markers that can't occur in stored text; escaped output swaps them for <mark>
+_OPEN, _CLOSE = '\x02', '\x03'
+_TERM = re.compile(r'\w+')
+
+# The indexed document of the orders matching {where} (a condition on o.id):
+# display ids of the order and its runs/deliveries, customer, products, tracking numbers, notes
+DOCUMENT_SQL = """
+    SELECT o.id,
+           printf('SO%%04d', o.id)
+             || coalesce(' ' || (SELECT group_concat(DISTINCT printf('PO%%04d', a.production_order_id))
+                                 FROM orders_productionallocation a WHERE a.sales_order_id = o.id), '')
+             || coalesce(' ' || (SELECT group_concat(printf('DEL%%04d', d.id))
+                                 FROM orders_delivery d WHERE d.sales_order_id = o.id), ''),
+           o.customer_name,
+           coalesce((SELECT group_concat(DISTINCT p.name || ' ' || p.sku)
+                     FROM orders_orderitem i JOIN orders_product p ON p.id = i.product_id
+                     WHERE i.order_id = o.id), ''),
+           coalesce((SELECT group_concat(d.tracking_number)
+                     FROM orders_delivery d WHERE d.sales_order_id = o.id), ''),
+           o.notes
+    FROM orders_order o
+    WHERE {where}
+"""
+REFRESH_SQL = f"INSERT OR REPLACE INTO {SEARCH_TABLE}(rowid, {', '.join(COLUMNS)}) {DOCUMENT_SQL}"
+
+# (trigger name, event, orders whose document to refresh)
+TRIGGERS = [
+    ('orders_search_order_insert', 'AFTER INSERT ON orders_order', 'o.id = NEW.id'),
+    ('orders_search_order_update', 'AFTER UPDATE OF customer_name, notes ON orders_order', 'o.id = NEW.id'),
+    ('orders_search_item_insert', 'AFTER INSERT ON orders_orderitem', 'o.id = NEW.order_id'),
+    ('orders_search_item_update', 'AFTER UPDATE ON orders_orderitem', 'o.id IN (OLD.order_id, NEW.order_id)'),
+    ('orders_search_item_delete', 'AFTER DELETE ON orders_orderitem', 'o.id = OLD.order_id'),
+    ('orders_search_allocation_insert', 'AFTER INSERT ON orders_productionallocation', 'o.id = NEW.sales_order_id'),
+    ('orders_search_allocation_delete', 'AFTER DELETE ON orders_productionallocation', 'o.id = OLD.sales_order_id'),
+    ('orders_search_delivery_insert', 'AFTER INSERT ON orders_delivery', 'o.id = NEW.sales_order_id'),
+    ('orders_search_delivery_update', 'AFTER UPDATE OF tracking_number, sales_order_id ON orders_delivery',
+     'o.id IN (OLD.sales_order_id, NEW.sales_order_id)'),
+    ('orders_search_delivery_delete', 'AFTER DELETE ON orders_delivery', 'o.id = OLD.sales_order_id'),
+    ('orders_search_product_update', 'AFTER UPDATE OF name, sku ON orders_product',
+     'o.id IN (SELECT order_id FROM orders_orderitem WHERE product_id = NEW.id)'),
+]
+DELETE_TRIGGER = (
+    'orders_search_order_delete',
+    f"CREATE TRIGGER orders_search_order_delete AFTER DELETE ON orders_order BEGIN "
+    f"DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id; END",
+)
+
+
+def install_triggers(using='default', **kwargs):
+    """Create missing sync triggers; rebuild the index if any were missing.
+
+    Runs after every migrate (post_migrate): on SQLite, a migration that rebuilds
+    one of the indexed tables drops its triggers, and this puts them back.
+    """
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+        if cursor.fetchone() is None:
+            return  # migrations not applied yet
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'orders_search_%%'")
+        existing = {name for (name,) in cursor.fetchall()}
+        statements = [
+            (name, f"CREATE TRIGGER {name} {event} BEGIN {REFRESH_SQL.format(where=where)}; END")
+            for name, event, where in TRIGGERS
+        ] + [DELETE_TRIGGER]
+        missing = [(name, sql) for name, sql in statements if name not in existing]
+        for _, sql in missing:
+            cursor.execute(sql, [])
+    if missing:
+        rebuild_index(conn)
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match, each as a prefix.
+
+    'acme flor trk913' -> '"acme"* "flor"* "trk913"*'. Quoting every term keeps FTS5
+    operators and punctuation in user input from being parsed as query syntax.
+    """
+    return ' '.join(f'"{term}"*' for term in _TERM.findall(text))
+
+
+def _highlighted(value):
+    return mark_safe(escape(value).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>'))
+
+
+def search_orders(text, limit=SEARCH_LIMIT):
+    """Best-ranked orders matching ``text``, with matches wrapped in <mark> (HTML-safe).
+
+    Returns dicts with the order ``id``, its ``rank`` (lower is better) and one
+    highlighted string per indexed column (a snippet for ``notes``).
+    """
+    query = fts_query(text)
+    if not query:
+        return []
+    highlights = ', '.join(
+        f"snippet({SEARCH_TABLE}, {index}, '{_OPEN}', '{_CLOSE}', '…', {NOTES_SNIPPET_TOKENS})" if name == 'notes'
+        else f"highlight({SEARCH_TABLE}, {index}, '{_OPEN}', '{_CLOSE}')"
+        for index, name in enumerate(COLUMNS)
+    )
+    weights = ', '.join(str(weight) for weight in WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS score, {highlights} "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s ORDER BY score LIMIT %s",
+            [query, limit],
+        )
+        rows = cursor.fetchall()
+    return [
+        {'id': row[0], 'rank': row[1], **{name: _highlighted(value or '') for name, value in zip(COLUMNS, row[2:])}}
+        for row in rows
+    ]
+
+
+def rebuild_index(conn=connection):
+    """Recreate every document from the order tables; returns the number indexed."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(REFRESH_SQL.format(where='1'), [])
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
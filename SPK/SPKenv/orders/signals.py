@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_migrate, pre_save
+from django.dispatch import receiver
+
+from .audit import ITEM_DELETED, ORDER_DELETED, audit_log
+from .customers import resolve_customer
+from .models import Order, OrderItem
+from .search import install_triggers
+from .transitions import SALES_ORDER
+from .versions import install_triggers as install_version_triggers
+
+
+# Deletes (formset/inline "Delete" boxes, the admin) leave a trace in the audit log;
+# the detail uses ids only so logging never costs a query
+@receiver(post_delete, sender=OrderItem)
+def item_deleted(sender, instance, **kwargs):
+    audit_log.log(ITEM_DELETED, SALES_ORDER, [instance.order_id],
+                  f"item #{instance.pk}: product #{instance.product_id} x{instance.quantity}")
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    audit_log.log(ORDER_DELETED, SALES_ORDER, [instance.pk], f"{instance.customer_name} ({instance.status})")
+
+
+# Link orders saved one at a time to the customer directory (bulk writers resolve their own)
+@receiver(pre_save, sender=Order)
+def link_customer(sender, instance, raw=False, **kwargs):
+    if instance.customer_id is None and not raw:
+        instance.customer_id = resolve_customer(instance.customer_name)
+
+
+# Keep the full-text search triggers in place after every migrate (see search.py)
+post_migrate.connect(install_triggers, dispatch_uid='orders.search.install_triggers')
+# ...and the data-version triggers that retire cached pages and catalogs (see versions.py)
+post_migrate.connect(install_version_triggers, dispatch_uid='orders.versions.install_triggers')
@@ -0,0 +1,150 @@
+import gzip
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.templatetags.static import static
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz siblings are written
+    brotli = None
+
+# Text assets worth pre-compressing; images and fonts are already compressed
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg', '.txt', '.html', '.map')
+# Widths of the WebP variants generated for every product image (see build_assets)
+IMAGE_WIDTHS = (320, 640, 960)
+# Hashed names never change content, so browsers and proxies may keep them for a year
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Unhashed names (direct links, pre-collectstatic fallbacks) revalidate soon
+MUTABLE_MAX_AGE = 60 * 5
+
+
+def _encoders():
+    encoders = [('.gz', 'gzip', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.insert(0, ('.br', 'br', lambda data: brotli.compress(data, quality=11)))
+    return encoders
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Content-hashed static files, each text asset with pre-compressed .br/.gz siblings."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        encoders = _encoders()
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE):
+                self._compress(name, encoders)
+
+    def _compress(self, name, encoders):
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            data = source.read()
+        for suffix, _, encode in encoders:
+            encoded = encode(data)
+            if len(encoded) < len(data):
+                with open(path + suffix, 'wb') as target:
+                    target.write(encoded)
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            # Not collected yet (DEBUG off before collectstatic, e.g. under the test runner)
+            return StaticFilesStorage.url(self, name)
+
+
+def variant_name(name, width):
+    """'img/box.jpg' -> 'img/box-640w.webp'."""
+    stem, _ = os.path.splitext(name)
+    return f'{stem}-{width}w.webp'
+
+
+def image_srcset(name):
+    """Return the srcset for the WebP variants of a static image, or '' when none were built."""
+    return ', '.join(
+        f'{static(variant_name(name, width))} {width}w'
+        for width in IMAGE_WIDTHS
+        if finders.find(variant_name(name, width))
+    )
+
+
+@lru_cache(maxsize=None)
+def _immutable_names():
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def _accepts(request, coding):
+    return re.search(rf'\b{coding}\b', request.headers.get('Accept-Encoding', '')) is not None
+
+
+@require_safe
+def serve_static(request, path):
+    """Serve a collected static file, pre-compressed when the client accepts it.
+
+    runserver serves static files itself while DEBUG is on; this view covers
+    WSGI/ASGI deployments that have no separate static file server.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404(path)
+    if not os.path.isfile(full_path):
+        raise Http404(path)
+
+    served, encoding = full_path, None
+    for suffix, coding, _ in _encoders() if path.endswith(COMPRESSIBLE) else ():
+        if _accepts(request, coding) and os.path.isfile(full_path + suffix):
+            served, encoding = full_path + suffix, coding
+            break
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    response = FileResponse(open(served, 'rb'), content_type=content_type or 'application/octet-stream')
+    del response['Content-Disposition']
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if path.endswith(COMPRESSIBLE):
+        patch_vary_headers(response, ['Accept-Encoding'])
+    if path in _immutable_names():
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
+
+
+def build_image_variants(quality=80):
+    """Write missing or stale WebP variants next to each JPEG/PNG under the static img/ dirs.
+
+    Returns the number of files written. Needs Pillow; raises ImportError without it.
+    """
+    from PIL import Image
+
+    written = 0
+    for directory in settings.STATICFILES_DIRS:
+        for source in sorted(Path(directory, 'img').glob('*')):
+            if source.suffix.lower() not in ('.jpg', '.jpeg', '.png'):
+                continue
+            with Image.open(source) as image:
+                # Never upscale: widths above the original are skipped
+                for width in (width for width in IMAGE_WIDTHS if width <= image.width):
+                    target = source.with_name(variant_name(source.name, width))
+                    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+                        continue
+                    converted = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+                    height = round(image.height * width / image.width)
+                    converted.resize((width, height), Image.LANCZOS).save(target, 'WEBP', quality=quality, method=6)
+                    written += 1
+    return written
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import close_old_connections, transaction
+from django.db.models import Count, DateField, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import (
+    Order, OrderItem, OrderSummary, ProductSummary, StageSummary, StatusTransition, SummaryWatermark,
+)
+from .transitions import SALES_ORDER
+
+logger = logging.getLogger(__name__)
+
+# Source rows folded per transaction, so a long backlog never holds the write lock for long
+CHUNK_SIZE = 2000
+# Seconds to let a burst of writes settle before refreshing, so it costs one refresh
+REFRESH_DELAY = 0.5
+# Seconds between refreshes without a request, to pick up writes from other processes
+REFRESH_INTERVAL = 60.0
+
+ORDERS, TRANSITIONS = 'orders', 'transitions'
+PERIOD_START = {
+    'day': TruncDate('order__date_created'),
+    'month': TruncMonth('order__date_created', output_field=DateField()),
+}
+LINE_TOTAL = ExpressionWrapper(F('quantity') * F('product__price'),
+                               output_field=DecimalField(max_digits=14, decimal_places=2))
+CENTS = Decimal('0.01')
+
+
+def _sustainable_units(score_units):
+    # quantity x sustainability score (percent) -> units at 100% sustainability
+    return (Decimal(score_units or 0) / 100).quantize(CENTS)
+
+
+def _fold(model, keys, rows):
+    """Add the counters in ``rows`` to the summary rows with the same ``keys``, creating missing ones."""
+    if not rows:
+        return
+    counters = [name for name in rows[0] if name not in keys]
+    existing = {
+        tuple(getattr(summary, key) for key in keys): summary
+        for summary in model.objects.filter(period__in={row['period'] for row in rows},
+                                            start__in={row['start'] for row in rows})
+    }
+    new, changed = [], []
+    for row in rows:
+        summary = existing.get(tuple(row[key] for key in keys))
+        if summary is None:
+            new.append(model(**row))
+        else:
+            for name in counters:
+                setattr(summary, name, getattr(summary, name) + row[name])
+            changed.append(summary)
+    model.objects.bulk_create(new)
+    model.objects.bulk_update(changed, counters)
+
+
+def _fold_orders(after, chunk_size):
+    """Fold the items of the next ``chunk_size`` orders after pk ``after``; returns (last pk, orders)."""
+    pks = list(Order.objects.filter(pk__gt=after).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+    if not pks:
+        return after, 0
+    items = OrderItem.objects.filter(order_id__gt=after, order_id__lte=pks[-1])
+    totals = dict(
+        orders=Count('order_id', distinct=True), units=Sum('quantity'), revenue=Sum(LINE_TOTAL),
+        score_units=Sum(F('quantity') * F('product__sustainability_score')),
+    )
+    for period, start in PERIOD_START.items():
+        for model, keys, group in (
+            (OrderSummary, ('period', 'start'), ()),
+            (ProductSummary, ('period', 'start', 'product_id'), ('product_id',)),
+        ):
+            _fold(model, keys, [
+                {
+                    'period': period, 'start': row['start'],
+                    **{key: row[key] for key in group},
+                    'orders': row['orders'], 'units': row['units'], 'revenue': row['revenue'],
+                    'sustainable_units': _sustainable_units(row['score_units']),
+                }
+                for row in items.values(start=start, *group).annotate(**totals).order_by()
+            ])
+    return pks[-1], len(pks)
+
+
+def _fold_transitions(after, chunk_size):
+    """Count the next ``chunk_size`` status transitions after pk ``after`` per period and stage."""
+    rows = list(
+        StatusTransition.objects.filter(pk__gt=after).order_by('pk')
+        .values_list('pk', 'kind', 'record_id', 'status', 'at_ms')[:chunk_size]
+    )
+    if not rows:
+        return after, 0
+    order_pks = {record_id for _, kind, record_id, _, _ in rows if kind == SALES_ORDER}
+    order_totals = dict(
+        OrderItem.objects.filter(order_id__in=order_pks).values('order_id')
+        .annotate(total=Sum(LINE_TOTAL)).values_list('order_id', 'total')
+    ) if order_pks else {}
+
+    tz = timezone.get_current_timezone()
+    stages = defaultdict(lambda: [0, Decimal(0)])
+    for _, kind, record_id, status, at_ms in rows:
+        day = datetime.fromtimestamp(at_ms / 1000, tz).date()
+        for period, start in (('day', day), ('month', day.replace(day=1))):
+            stage = stages[period, start, kind, status]
+            stage[0] += 1
+            if kind == SALES_ORDER:
+                stage[1] += order_totals.get(record_id) or 0
+    _fold(StageSummary, ('period', 'start', 'kind', 'status'), [
+        {'period': period, 'start': start, 'kind': kind, 'status': status, 'count': count, 'revenue': revenue}
+        for (period, start, kind, status), (count, revenue) in stages.items()
+    ])
+    return rows[-1][0], len(rows)
+
+
+SOURCES = {ORDERS: _fold_orders, TRANSITIONS: _fold_transitions}
+
+
+def refresh_summaries(chunk_size=CHUNK_SIZE):
+    """Fold orders and transitions past the watermarks into the summaries.
+
+    Work is proportional to the new rows only. Each chunk moves its watermark in the
+    same transaction as the counters, so an interrupted refresh never counts a row
+    twice. Returns ``{source: rows folded}``.
+    """
+    folded = dict.fromkeys(SOURCES, 0)
+    for source, fold in SOURCES.items():
+        while True:
+            with transaction.atomic():
+                watermark, _ = SummaryWatermark.objects.get_or_create(source=source)
+                watermark.last_id, count = fold(watermark.last_id, chunk_size)
+                if count:
+                    watermark.save()
+            if not count:
+                break
+            folded[source] += count
+    return folded
+
+
+def rebuild_summaries(chunk_size=CHUNK_SIZE):
+    """Drop the summaries and fold every order and transition again.
+
+    Needed only after edits the watermarks can't see: changes to old orders' items,
+    deleted orders or new product prices.
+    """
+    with transaction.atomic():
+        for model in (OrderSummary, ProductSummary, StageSummary, SummaryWatermark):
+            model.objects.all().delete()
+    return refresh_summaries(chunk_size)
+
+
+def pending_rows():
+    """Orders and transitions written since the last refresh, per source (by id range)."""
+    marks = dict(SummaryWatermark.objects.values_list('source', 'last_id'))
+    return {
+        ORDERS: Order.objects.filter(pk__gt=marks.get(ORDERS, 0)).count(),
+        TRANSITIONS: StatusTransition.objects.filter(pk__gt=marks.get(TRANSITIONS, 0)).count(),
+    }
+
+
+class SummaryRefresher:
+    """Background thread that keeps the summary tables caught up with the order tables.
+
+    Writers call ``request()`` once their transaction commits (see transitions.record);
+    the thread lets the burst settle for ``delay`` seconds, then refreshes. Without
+    requests it still refreshes every ``interval`` seconds.
+    """
+
+    def __init__(self, delay=REFRESH_DELAY, interval=REFRESH_INTERVAL):
+        self.delay = delay
+        self.interval = interval
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def request(self):
+        self._wake.set()
+        self._ensure_started()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='summary-refresher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            if self._wake.wait(self.interval):
+                time.sleep(self.delay)
+            self._wake.clear()
+            close_old_connections()
+            try:
+                refresh_summaries()
+            except Exception:
+                # e.g. the database is busy; the next request or interval retries from the watermark
+                logger.exception("Summary refresh failed")
+
+
+summary_refresher = SummaryRefresher()
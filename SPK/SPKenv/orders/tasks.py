@@ -0,0 +1,89 @@
+import csv
+import io
+import os
+
+from django.conf import settings
+from django.core.management import call_command
+
+from .idempotency import purge_expired
+from .jobs import task
+from .models import Order, OrderItem
+from .search import rebuild_index
+from .summaries import rebuild_summaries
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = ['order', 'date', 'customer', 'status', 'sku', 'product', 'quantity', 'unit_price', 'line_total',
+                  'notes']
+
+
+def output_path(name):
+    directory = settings.JOB_OUTPUT_DIR
+    os.makedirs(directory, exist_ok=True)
+    return directory / name
+
+
+def import_path(name):
+    """Resolve a file name inside PRODUCT_IMPORT_DIR; anything that escapes it is rejected."""
+    directory = settings.PRODUCT_IMPORT_DIR.resolve()
+    path = (directory / name).resolve()
+    if not path.is_relative_to(directory) or path == directory:
+        raise ValueError(f"Import files must be inside {directory}.")
+    return path
+
+
+@task('export_orders_csv', label="Export orders to CSV")
+def export_orders_csv(job):
+    """One CSV row per order line, written in chunks of orders with progress and cancellation."""
+    name = f'orders-{job.id}.csv'
+    path = output_path(name)
+    total = Order.objects.count()
+    done = rows = last = 0
+    try:
+        with open(f'{path}.part', 'w', newline='', encoding='utf-8') as stream:
+            writer = csv.writer(stream)
+            writer.writerow(EXPORT_COLUMNS)
+            while True:
+                orders = list(Order.objects.filter(pk__gt=last).order_by('pk')
+                              .values_list('pk', 'date_created', 'customer_name', 'status', 'notes')[:EXPORT_CHUNK_SIZE])
+                if not orders:
+                    break
+                last = orders[-1][0]
+                lines = {}
+                for order_id, sku, product, quantity, price in OrderItem.objects.filter(
+                        order_id__gte=orders[0][0], order_id__lte=last).order_by('pk').values_list(
+                        'order_id', 'product__sku', 'product__name', 'quantity', 'product__price'):
+                    lines.setdefault(order_id, []).append((sku, product, quantity, price, quantity * price))
+                for pk, date_created, customer_name, status, notes in orders:
+                    for line in lines.get(pk, []):
+                        writer.writerow([f'SO{pk:04d}', date_created.isoformat(), customer_name, status, *line, notes])
+                        rows += 1
+                done += len(orders)
+                job.progress(done, total, f"{done} of {total} orders")
+    except BaseException:
+        os.remove(f'{path}.part')  # cancelled or failed: don't leave half a file behind
+        raise
+    os.replace(f'{path}.part', path)
+    return {'file': name, 'rows': rows}
+
+
+@task('import_products', label="Import products", params=('path',), max_attempts=1)
+def import_products(job, path):
+    """Run the import_products command on a CSV/JSON/JSON Lines file in PRODUCT_IMPORT_DIR."""
+    out = io.StringIO()
+    call_command('import_products', str(import_path(path)), stdout=out)
+    return {'output': out.getvalue().strip()}
+
+
+@task('rebuild_summaries', label="Rebuild report summaries")
+def rebuild_report_summaries(job):
+    return rebuild_summaries()
+
+
+@task('rebuild_search_index', label="Rebuild order search index")
+def rebuild_search_index(job):
+    return {'orders': rebuild_index()}
+
+
+@task('purge_idempotency_keys', label="Purge expired idempotency keys")
+def purge_idempotency_keys(job):
+    return {'purged': purge_expired()}
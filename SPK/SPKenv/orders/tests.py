@@ -1,3 +1,797 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.exceptions import ValidationError
+from django.db import OperationalError
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from .customers import resolve_customers, search_customers
+from .forms import OrderItemFormSet
+from .management.commands import import_products
+from .intake import (
+    MAX_ITEMS_PER_ORDER, OrderNotSaved, OrderWriter, order_writer, validate_order_payload, write_orders,
+)
+from .audit import (
+    INDEX, ITEM_DELETED, MAX_ACTOR_BYTES, MAX_DETAIL_BYTES, STATUS_CHANGED, AuditLog, acting_as, decode, encode,
+)
+from .jobs import TASKS, JobCancelled, JobContext, JobRunner, cancel, enqueue, task
+from .models import (
+    Customer, DataVersion, Delivery, IdempotencyKey, Job, Order, OrderItem, OrderSummary, Product, ProductSummary, StageSummary,
+)
+from .search import fts_query, rebuild_index, search_orders
+from .summaries import pending_rows, rebuild_summaries, refresh_summaries
+from .transitions import PRODUCTION_ORDER, SALES_ORDER, record
+from .versions import ORDERS
+
+
+def make_product(sku='T-001', name="Test kit", price='10.00', **fields):
+    return Product.objects.create(sku=sku, name=name, price=price, **fields)
+
+
+def form_data(product, key, customer="Acme Florists", quantity=2):
+    return {
+        'customer_name': customer, 'notes': '', 'idempotency_key': key,
+        'items-TOTAL_FORMS': '1', 'items-INITIAL_FORMS': '0',
+        'items-MIN_NUM_FORMS': '0', 'items-MAX_NUM_FORMS': '1000',
+        'items-0-product': str(product.pk), 'items-0-quantity': str(quantity),
+    }
+
+
+# Writes in flight from written_on_test_thread (the event loop only keeps weak references)
+_pending_writes = set()
+
+
+def written_on_test_thread(cleaned):
+    # Stands in for the background writer: the same write, but on the test's connection
+    # (sync_to_async runs it on the thread that holds the test transaction)
+    future = Future()
+
+    async def write():
+        try:
+            future.set_result((await sync_to_async(write_orders)([cleaned]))[0])
+        except Exception as exc:
+            future.set_exception(exc)
+
+    task = asyncio.get_running_loop().create_task(write())
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return future
+
+
+class IdempotentOrderFormTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def test_resubmitted_form_returns_the_original_order(self):
+        first = self.client.post(reverse('create_order'), form_data(self.product, 'form-key'))
+        second = self.client.post(reverse('create_order'), form_data(self.product, 'form-key'))
+
+        order = Order.objects.get(customer_name="Acme Florists")
+        self.assertEqual(first['Location'], second['Location'])
+        self.assertIn(f'order={order.pk}', first['Location'])
+        self.assertEqual(OrderItem.objects.filter(order=order).count(), 1)
+
+    def test_expired_key_starts_a_new_order(self):
+        self.client.post(reverse('create_order'), form_data(self.product, 'old-key'))
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=30))
+
+        response = self.client.post(reverse('create_order'), form_data(self.product, 'old-key'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Order.objects.filter(customer_name="Acme Florists").count(), 2)
+        newest = Order.objects.latest('pk')
+        self.assertEqual(IdempotencyKey.objects.get(key='old-key').order_id, newest.pk)
+
+    def test_success_page_links_only_order_numbers(self):
+        response = self.client.get(reverse('order_success'), {'order': '42'})
+        self.assertContains(response, f'href="{reverse("order_detail", args=[42])}"')
+        for value in ('abc', '-1', '4 2', ''):
+            response = self.client.get(reverse('order_success'), {'order': value})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, "View order")
+
+
+class OrderItemFormSetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.products = [make_product(sku=f'T-{number:03d}', name=f"Kit {number}") for number in range(5)]
+
+    def test_rows_share_one_catalog_lookup(self):
+        order = Order.objects.create(customer_name="Acme Florists")
+        OrderItem.objects.bulk_create(OrderItem(order=order, product=self.products[number % 5], quantity=1)
+                                      for number in range(20))
+        # The order's items, the catalog version and the product list, however many rows
+        with self.assertNumQueries(3):
+            html = OrderItemFormSet(instance=order).as_p()
+        self.assertEqual(html.count('" selected>'), 20 + 1)  # and the blank extra row
+        with self.assertNumQueries(2):
+            OrderItemFormSet(instance=order).as_p()
+
+    def test_new_product_appears_in_the_next_formset(self):
+        OrderItemFormSet().as_p()
+        newcomer = make_product(sku='T-999', name="Newcomer")
+        self.assertIn(f'<option value="{newcomer.pk}">', OrderItemFormSet().as_p())
+
+
+class CachedOrderPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = make_product()
+        self.order = Order.objects.create(customer_name="Acme Florists")
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=2)
+        self.url = reverse('order_detail', args=[self.order.pk])
+
+    def test_page_carries_validators(self):
+        response = self.client.get(self.url)
+        version, changed_ms = DataVersion.objects.filter(name=ORDERS).values_list('version', 'changed_ms').get()
+        self.assertEqual(response['ETag'], f'"orders-{version}"')
+        self.assertEqual(response['Last-Modified'], http_date(changed_ms // 1000))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_conditional_get_is_answered_from_the_version_alone(self):
+        response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_repeat_get_is_served_from_the_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_writes_roll_the_version_over(self):
+        first = self.client.get(self.url)
+        # A queryset update bypasses signals; the triggers still see it
+        Order.objects.filter(pk=self.order.pk).update(customer_name="Bloom & Co")
+        second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertContains(second, "Bloom &amp; Co")
+
+        # So do writes to the other tables the page shows
+        Product.objects.filter(pk=self.product.pk).update(name="Renamed kit")
+        third = self.client.get(self.url, HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertContains(third, "Renamed kit")
+
+    def test_only_successful_pages_are_cached(self):
+        version = DataVersion.objects.get(name=ORDERS).version
+        missing = reverse('order_detail', args=[self.order.pk + 1])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+        self.client.get(self.url)
+        self.assertIsNone(cache.get(f'orders:page:{version}:{missing}'))
+        self.assertIsNotNone(cache.get(f'orders:page:{version}:{self.url}'))
+
+
+class IdempotentIntakeTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+        self.payload = {'customer_name': "Gift Barn", 'items': [{'product': self.product.pk, 'quantity': 3}]}
+
+    def post(self, payload, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post(reverse('intake_order'), json.dumps(payload), content_type='application/json',
+                                **headers)
+
+    def test_retried_request_returns_the_original_order(self):
+        with mock.patch.object(order_writer, 'submit', side_effect=written_on_test_thread):
+            first = self.post(self.payload, key='api-key')
+            second = self.post(self.payload, key='api-key')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(first.json()['id'], second.json()['id'])
+        self.assertEqual(Order.objects.filter(customer_name="Gift Barn").count(), 1)
+
+    def test_batch_with_repeated_key_writes_one_order(self):
+        cleaned = validate_order_payload(self.payload)
+        ids = write_orders([dict(cleaned, idempotency_key='k'), dict(cleaned, idempotency_key='k'),
+                            dict(cleaned, idempotency_key=None)])
+
+        self.assertEqual(ids[0], ids[1])
+        self.assertNotEqual(ids[0], ids[2])
+        self.assertEqual(Order.objects.filter(customer_name="Gift Barn").count(), 2)
+
+    def test_expired_key_is_replaced(self):
+        cleaned = dict(validate_order_payload(self.payload), idempotency_key='k')
+        first = write_orders([cleaned])[0]
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=30))
+
+        second = write_orders([cleaned])[0]
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(IdempotencyKey.objects.get(key='k').order_id, second)
+
+
+class IntakeValidationTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def assertInvalid(self, payload, field):
+        with self.assertRaises(ValidationError) as caught:
+            validate_order_payload(payload)
+        self.assertIn(field, caught.exception.message_dict)
+
+    def test_rejects_malformed_orders(self):
+        item = {'product': self.product.pk, 'quantity': 1}
+        self.assertInvalid({'items': [item]}, 'customer_name')
+        self.assertInvalid({'customer_name': "  ", 'items': [item]}, 'customer_name')
+        self.assertInvalid({'customer_name': "x" * 300, 'items': [item]}, 'customer_name')
+        self.assertInvalid({'customer_name': "A", 'items': []}, 'items')
+        self.assertInvalid({'customer_name': "A", 'items': [item] * (MAX_ITEMS_PER_ORDER + 1)}, 'items')
+        self.assertInvalid({'customer_name': "A", 'items': ["not an object"]}, 'items')
+        self.assertInvalid({'customer_name': "A", 'items': [{'product': 999999, 'quantity': 1}]}, 'items')
+        self.assertInvalid({'customer_name': "A", 'items': [{'product': str(self.product.pk), 'quantity': 1}]},
+                           'items')
+        self.assertInvalid({'customer_name': "A", 'items': [{'product': self.product.pk, 'quantity': 0}]}, 'items')
+        self.assertInvalid({'customer_name': "A", 'items': [{'product': self.product.pk, 'quantity': True}]},
+                           'items')
+        self.assertInvalid({'customer_name': "A", 'notes': 5, 'items': [item]}, 'notes')
+
+    def test_cleans_a_valid_order(self):
+        cleaned = validate_order_payload({
+            'customer_name': "  Acme  ", 'notes': " ribbon ", 'items': [{'product': self.product.pk, 'quantity': 2}],
+        })
+        self.assertEqual(cleaned, {'customer_name': "Acme", 'notes': "ribbon",
+                                   'items': [{'product': self.product.pk, 'quantity': 2}]})
+
+    def test_new_product_is_accepted_without_invalidating_anything(self):
+        validate_order_payload({'customer_name': "A", 'items': [{'product': self.product.pk, 'quantity': 1}]})
+        newcomer = make_product(sku='T-002', name="Newcomer")
+        validate_order_payload({'customer_name': "A", 'items': [{'product': newcomer.pk, 'quantity': 1}]})
+
+    def test_view_reports_errors_as_json(self):
+        response = self.client.post(reverse('intake_order'), b'{not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'errors': {'__all__': ["Invalid JSON."]}})
+
+        response = self.client.post(reverse('intake_order'), json.dumps({'customer_name': "A", 'items': []}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('items', response.json()['errors'])
+
+    def test_write_failures_are_not_validation_errors(self):
+        writer = OrderWriter()
+        cleaned = validate_order_payload({'customer_name': "A", 'items': [{'product': self.product.pk, 'quantity': 1}]})
+        futures = [Future(), Future()]
+        with mock.patch('orders.intake.write_orders', side_effect=OperationalError("database is locked")), \
+                self.assertLogs('orders.intake', 'ERROR'):
+            writer._write([(cleaned, future) for future in futures])
+        for future in futures:
+            self.assertIsInstance(future.exception(), OrderNotSaved)
+
+    def test_view_asks_clients_to_retry_failed_writes(self):
+        failed = Future()
+        failed.set_exception(OrderNotSaved("Order could not be saved."))
+        with mock.patch.object(order_writer, 'submit', return_value=failed):
+            response = self.client.post(
+                reverse('intake_order'),
+                json.dumps({'customer_name': "A", 'items': [{'product': self.product.pk, 'quantity': 1}]}),
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(response.json(), {'errors': {'__all__': ["Order could not be saved."]}})
+
+
+class SearchIndexTests(TestCase):
+    """The FTS table is kept in sync by SQLite triggers, whichever way rows are written."""
+
+    def setUp(self):
+        self.product = make_product(sku='FLW-9', name="Kraft bouquet wrap")
+        self.order = Order.objects.create(customer_name="Rosewood Florist", notes="Deliver before the wedding")
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=5)
+
+    def found(self, text):
+        return [result['id'] for result in search_orders(text)]
+
+    def test_indexes_customer_products_and_notes(self):
+        self.assertEqual(self.found("rosewood"), [self.order.pk])
+        self.assertEqual(self.found("kraft bouq"), [self.order.pk])  # prefix match on every term
+        self.assertEqual(self.found("flw-9"), [self.order.pk])
+        self.assertEqual(self.found("wedding"), [self.order.pk])
+        self.assertEqual(self.found(f"SO{self.order.pk:04d}"), [self.order.pk])
+        self.assertEqual(self.found("rosewood tulips"), [])
+
+    def test_follows_updates_made_outside_the_orm_save(self):
+        Order.objects.filter(pk=self.order.pk).update(customer_name="Oakleaf Events")
+        Product.objects.filter(pk=self.product.pk).update(name="Linen gift box")
+        Delivery.objects.create(sales_order=self.order, delivery_date=timezone.now(), tracking_number="TRK55AA01")
+
+        self.assertEqual(self.found("rosewood"), [])
+        self.assertEqual(self.found("oakleaf"), [self.order.pk])
+        self.assertEqual(self.found("kraft"), [])
+        self.assertEqual(self.found("linen"), [self.order.pk])
+        self.assertEqual(self.found("trk55aa01"), [self.order.pk])
+
+        self.order.delete()
+        self.assertEqual(self.found("oakleaf"), [])
+
+    def test_highlights_are_escaped(self):
+        Order.objects.filter(pk=self.order.pk).update(customer_name="<b>Rosewood</b>")
+        customer = search_orders("rosewood")[0]['customer']
+        self.assertEqual(customer, "&lt;b&gt;<mark>Rosewood</mark>&lt;/b&gt;")
+
+    def test_rebuild_matches_the_triggers(self):
+        before = self.found("rosewood")
+        self.assertEqual(rebuild_index(), Order.objects.count())
+        self.assertEqual(self.found("rosewood"), before)
+
+
+class FtsQueryTests(TestCase):
+    def test_quotes_every_term_as_a_prefix(self):
+        self.assertEqual(fts_query("acme flor trk913"), '"acme"* "flor"* "trk913"*')
+
+    def test_neutralizes_query_syntax(self):
+        self.assertEqual(fts_query('rose" OR customer:* NEAR(a b) -x ^y'),
+                         '"rose"* "OR"* "customer"* "NEAR"* "a"* "b"* "x"* "y"*')
+        self.assertEqual(fts_query('"" *** ()'), '')
+
+    def test_hostile_input_searches_instead_of_failing(self):
+        Order.objects.create(customer_name="OR Supplies")
+        self.assertEqual(len(search_orders('supplies" OR "')), 1)
+        self.assertEqual(search_orders('"*'), [])
+
+
+class SummaryRefreshTests(TestCase):
+    """Folding new rows past the watermarks must give what a full recompute gives."""
+
+    def setUp(self):
+        self.kit = make_product(sku='S-1', price='12.50', sustainability_score=80)
+        self.wrap = make_product(sku='S-2', price='3.00', sustainability_score=45)
+        self.day = datetime(2026, 3, 30, 15, tzinfo=dt_timezone.utc)
+
+    def add_orders(self, count, day_offset):
+        created = self.day + timedelta(days=day_offset)
+        pks = []
+        for number in range(count):
+            order = Order.objects.create(customer_name=f"Customer {day_offset}-{number}")
+            Order.objects.filter(pk=order.pk).update(date_created=created)
+            OrderItem.objects.create(order=order, product=self.kit, quantity=number + 1)
+            if number % 2:
+                OrderItem.objects.create(order=order, product=self.wrap, quantity=10)
+            pks.append(order.pk)
+        record(SALES_ORDER, "Created", pks, at=created)
+        record(SALES_ORDER, "In Production", pks[::2], at=created + timedelta(hours=2))
+        record(PRODUCTION_ORDER, "Completed", [1, 2], at=created + timedelta(days=1))
+        return pks
+
+    def tables(self):
+        return {
+            model.__name__: sorted(
+                tuple(row) for row in model.objects.values_list(*[
+                    field.attname for field in model._meta.concrete_fields if field.name != 'id'
+                ])
+            )
+            for model in (OrderSummary, ProductSummary, StageSummary)
+        }
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        # Chunks smaller than each burst, and bursts across a month boundary
+        self.add_orders(5, day_offset=0)
+        self.assertEqual(refresh_summaries(chunk_size=2), {'orders': 5, 'transitions': 5 + 3 + 2})
+        self.add_orders(3, day_offset=2)
+        self.add_orders(4, day_offset=0)
+        self.assertEqual(pending_rows(), {'orders': 7, 'transitions': (3 + 2 + 2) + (4 + 2 + 2)})
+        refresh_summaries(chunk_size=3)
+        self.assertEqual(pending_rows(), {'orders': 0, 'transitions': 0})
+        incremental = self.tables()
+
+        rebuild_summaries()
+
+        self.assertEqual(self.tables(), incremental)
+
+    def test_totals(self):
+        self.add_orders(2, day_offset=0)
+        refresh_summaries()
+
+        day = OrderSummary.objects.get(period='day', start=self.day.date())
+        month = OrderSummary.objects.get(period='month', start=self.day.date().replace(day=1))
+        # 1 kit; 2 kits + 10 wraps
+        self.assertEqual((day.orders, day.units, day.revenue), (2, 13, Decimal('67.50')))
+        self.assertEqual(day.sustainable_units, Decimal('6.90'))  # 3 x 80% + 10 x 45%
+        self.assertEqual((month.orders, month.revenue), (2, Decimal('67.50')))
+        wraps = ProductSummary.objects.get(period='day', start=self.day.date(), product=self.wrap)
+        self.assertEqual((wraps.orders, wraps.units, wraps.revenue), (1, 10, Decimal('30.00')))
+        created = StageSummary.objects.get(period='day', start=self.day.date(), kind=SALES_ORDER, status=1)
+        self.assertEqual((created.count, created.revenue), (2, Decimal('67.50')))
+
+    def test_refresh_without_new_rows_changes_nothing(self):
+        self.add_orders(3, day_offset=1)
+        refresh_summaries()
+        before = self.tables()
+        self.assertEqual(refresh_summaries(), {'orders': 0, 'transitions': 0})
+        self.assertEqual(self.tables(), before)
+
+
+@mock.patch.dict(TASKS)
+class JobRunnerTests(TestCase):
+    """Claims, retries, cancellation and heartbeats, driven without the worker threads."""
+
+    def setUp(self):
+        self.runner = JobRunner(lease=60)
+        self.calls = []
+
+        @task('test_count', params=('upto',), max_attempts=2, backoff=10)
+        def count(job, upto):
+            self.calls.append(job.attempt)
+            for done in range(upto):
+                job.progress(done, upto, f"row {done}")
+            if upto < 0:
+                raise RuntimeError("negative")
+            return {'counted': upto}
+
+    def claim(self, worker='host:1:job-worker-0'):
+        return self.runner._claim(worker)
+
+    def test_due_job_is_claimed_once(self):
+        job = enqueue('test_count', upto=1)
+        claimed = self.claim()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.worker), (Job.RUNNING, 1, 'host:1:job-worker-0'))
+        self.assertIsNone(self.claim('host:2:job-worker-0'))
+
+    def test_backoff_delays_the_claim(self):
+        enqueue('test_count', upto=1)
+        Job.objects.update(run_after=timezone.now() + timedelta(seconds=30))
+        self.assertIsNone(self.claim())
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(LookupError):
+            enqueue('no_such_task')
+
+    def test_success_stores_result(self):
+        job = enqueue('test_count', upto=3)
+        self.runner._execute(self.claim(), 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.result), (Job.SUCCEEDED, 100, {'counted': 3}))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_retries_then_fails(self):
+        job = enqueue('test_count', upto=-1)
+        with self.assertLogs('orders.jobs', 'WARNING'):
+            self.runner._execute(self.claim(), 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn("RuntimeError: negative", job.error)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=7))
+
+        Job.objects.update(run_after=timezone.now())
+        with self.assertLogs('orders.jobs', 'ERROR'):
+            self.runner._execute(self.claim(), 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_stale_lease_is_reclaimed(self):
+        job = enqueue('test_count', upto=1)
+        self.claim()
+        self.assertIsNone(self.claim('host:2:job-worker-0'))
+
+        Job.objects.update(heartbeat_at=timezone.now() - timedelta(seconds=61))
+        reclaimed = self.claim('host:2:job-worker-0')
+        self.assertEqual((reclaimed.pk, reclaimed.attempts, reclaimed.worker), (job.pk, 2, 'host:2:job-worker-0'))
+
+        # The lost worker finishing late must not overwrite the new holder's job
+        self.runner._execute(job, 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (Job.RUNNING, 'host:2:job-worker-0'))
+
+    def test_job_lost_too_often_fails(self):
+        job = enqueue('test_count', upto=1)
+        Job.objects.update(status=Job.RUNNING, attempts=2, heartbeat_at=timezone.now() - timedelta(seconds=61))
+        self.runner._execute(self.claim(), 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.FAILED, "Worker lost too many times"))
+        self.assertEqual(self.calls, [])
+
+    def test_cancel_queued_job(self):
+        job = enqueue('test_count', upto=1)
+        self.assertTrue(cancel(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.CANCELLED)
+        self.assertIsNone(self.claim())
+        self.assertFalse(cancel(job.pk))
+
+    def test_cancel_running_job_stops_at_next_progress(self):
+        job = enqueue('test_count', upto=5)
+        claimed = self.claim()
+        self.assertTrue(cancel(job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.cancel_requested), (Job.RUNNING, True))
+
+        self.runner._execute(claimed, 'host:1:job-worker-0')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.message), (Job.CANCELLED, 0, "row 0"))
+        self.assertIsNone(job.result)
+
+    def test_progress_is_throttled(self):
+        enqueue('test_count', upto=1)
+        claimed = self.claim()
+        context = JobContext(claimed, 'host:1:job-worker-0')
+        context.progress(40, 80, "half")
+        context.progress(80, 80, "done")  # within PROGRESS_INTERVAL: not written
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.progress, claimed.message), (50, "half"))
+
+        Job.objects.update(cancel_requested=True)
+        context._reported_at = 0.0
+        with self.assertRaises(JobCancelled):
+            context.progress(90, 100)
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.progress, 90)
+
+    def test_heartbeat_renews_only_held_jobs(self):
+        held = enqueue('test_count', upto=1)
+        self.claim()
+        lost = enqueue('test_count', upto=1)
+        self.claim()
+        stale = timezone.now() - timedelta(seconds=50)
+        Job.objects.update(heartbeat_at=stale)
+        Job.objects.filter(pk=lost.pk).update(worker='host:2:job-worker-0')
+        self.runner._active = {held.pk: 'host:1:job-worker-0', lost.pk: 'host:1:job-worker-0'}
+
+        self.runner._beat()
+
+        held.refresh_from_db()
+        lost.refresh_from_db()
+        self.assertGreater(held.heartbeat_at, stale)
+        self.assertEqual(lost.heartbeat_at, stale)
+
+
+class AuditRecordTests(TestCase):
+
+    def test_round_trip(self):
+        entry = decode(encode(1_774_886_400_123, STATUS_CHANGED, SALES_ORDER, 4_000_000_000, "web:ana", "Sent ✓"))
+        self.assertEqual((entry.at_ms, entry.action, entry.entity, entry.object_id, entry.actor, entry.detail),
+                         (1_774_886_400_123, STATUS_CHANGED, SALES_ORDER, 4_000_000_000, "web:ana", "Sent ✓"))
+        self.assertEqual((entry.ref, entry.action_name), ("SO4000000000", "status changed"))
+        self.assertEqual(entry.at, datetime(2026, 3, 30, 16, 0, 0, 123000, tzinfo=dt_timezone.utc))
+
+    def test_long_text_is_truncated_on_character_boundaries(self):
+        record = encode(0, ITEM_DELETED, PRODUCTION_ORDER, 7, "é" * 200, "€" * 400)
+        entry = decode(record)
+        self.assertEqual(entry.actor, "é" * (MAX_ACTOR_BYTES // 2))
+        self.assertEqual(entry.detail, "€" * (MAX_DETAIL_BYTES // 3))
+        self.assertEqual(len(record), int.from_bytes(record[:2], 'little'))
+
+
+class AuditLogTests(TestCase):
+    """Writes into a temporary directory, never settings.AUDIT_LOG_DIR."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # Tiny segments, so a handful of records spans several sealed files
+        self.log = AuditLog(self.directory, segment_bytes=200)
+        self.log._ensure_started = lambda: None  # flushed explicitly, no writer thread
+
+    def files(self, suffix):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(suffix))
+
+    def test_entries_wait_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with acting_as("web:ana"):
+                self.log.log(STATUS_CHANGED, SALES_ORDER, [1, 2], "Completed")
+            self.assertEqual(self.log.history(SALES_ORDER, 1), [])
+        for callback in callbacks:
+            callback()
+        entries = self.log.history(SALES_ORDER, 1)
+        self.assertEqual([(entry.actor, entry.detail) for entry in entries], [("web:ana", "Completed")])
+
+    def test_actor_may_be_resolved_lazily(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with acting_as(lambda: "web:10.0.0.1"):
+                self.log.log(STATUS_CHANGED, SALES_ORDER, [3], "Created")
+        self.assertEqual(self.log.history(SALES_ORDER, 3)[0].actor, "web:10.0.0.1")
+
+    def test_history_across_rotated_segments(self):
+        expected = {}
+        for step in range(12):
+            entries = [(1_000 + step * 10 + object_id, STATUS_CHANGED, SALES_ORDER, object_id, "system", f"step {step}")
+                       for object_id in (5, 6, 7)]
+            entries.append((1_000 + step * 10, STATUS_CHANGED, PRODUCTION_ORDER, 5, "system", f"po {step}"))
+            for entry in entries:
+                expected.setdefault(entry[2:4], []).append(entry[5])
+            self.log._append(entries)
+            self.log.flush()
+
+        sealed = self.files('.sidx')
+        self.assertGreater(len(sealed), 2)
+        self.assertEqual(len(self.files('.log')), len(sealed) + len(self.files('.idx')))
+        # Sealed indexes are sorted by (entity, object id, offset)
+        with open(os.path.join(self.directory, sealed[0]), 'rb') as stream:
+            data = stream.read()
+        rows = [data[start:start + INDEX.size] for start in range(0, len(data), INDEX.size)]
+        self.assertEqual(rows, sorted(rows))
+
+        def details(entity, object_id):
+            return [entry.detail for entry in self.log.history(entity, object_id)]
+
+        for (entity, object_id), detail in expected.items():
+            self.assertEqual(details(entity, object_id), detail)
+        self.assertEqual(details(SALES_ORDER, 8), [])
+        self.assertEqual(details(PRODUCTION_ORDER, 6), [])
+
+        self.log.close()
+        self.assertEqual(self.files('.idx'), [])
+        self.assertEqual(details(SALES_ORDER, 6), expected[SALES_ORDER, 6])
+
+    def test_failed_write_keeps_entries_buffered(self):
+        self.log._append([(1, STATUS_CHANGED, SALES_ORDER, 9, "system", "Created")])
+        with mock.patch.object(self.log, '_write', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.log.flush()
+        self.assertEqual([entry.detail for entry in self.log.history(SALES_ORDER, 9)], ["Created"])
+
+
+class AuditViewTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        audit_log = AuditLog(directory.name)
+        audit_log._ensure_started = lambda: None  # history() flushes; no writer thread
+        patcher = mock.patch('orders.audit.audit_log', audit_log)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.order = Order.objects.create(customer_name="Acme Florists")
+        self.url = reverse('order_audit', args=[self.order.pk])
+
+    def test_anonymous_users_are_sent_to_log_in(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin:login'), response['Location'])
+
+    def test_non_staff_users_are_sent_to_log_in(self):
+        self.client.force_login(User.objects.create_user('clerk'))
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_staff_see_the_trail(self):
+        self.client.force_login(User.objects.create_user('manager', is_staff=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            with acting_as("web:manager"):
+                record(SALES_ORDER, "In Production", [self.order.pk])
+        response = self.client.get(self.url)
+        self.assertContains(response, "web:manager")
+        self.assertContains(response, "In Production")
+
+
+class ImportProductsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_import(self, name, content, **options):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            stream.write(content)
+        out = io.StringIO()
+        call_command('import_products', path, stdout=out, **options)
+        return out.getvalue()
+
+    def prices(self, prefix):
+        # Migrations seed PKG products; only look at the imported ones
+        return dict(Product.objects.filter(sku__startswith=prefix).values_list('sku', 'price'))
+
+    def test_upsert_counts(self):
+        make_product(sku='A-1', name="Kept", price='5.00')
+        make_product(sku='A-2', name="Old name", price='5.00')
+        out = self.run_import('products.csv', "sku,name,price\n"
+                              "A-1,Kept,5\n"
+                              "A-2,New name,5.00\n"
+                              "A-3,Added,7.5\n"
+                              "A-3,Added twice,8\n")
+        self.assertIn("4 rows", out)
+        self.assertIn("1 inserted, 1 updated, 1 unchanged", out)
+        self.assertEqual(self.prices('A-'), {'A-1': Decimal('5.00'), 'A-2': Decimal('5.00'), 'A-3': Decimal('8.00')})
+        self.assertEqual(Product.objects.get(sku='A-3').name, "Added twice")  # last row wins
+
+        out = self.run_import('products.csv', "sku,name,price\nA-3,Added twice,8\n")
+        self.assertIn("0 inserted, 0 updated, 1 unchanged", out)
+
+    def test_bad_row_keeps_earlier_chunks(self):
+        rows = [json.dumps({'sku': f'B-{number}', 'name': f"Bulk {number}", 'price': '1.00'}) for number in range(7)]
+        rows.insert(5, json.dumps({'sku': 'B-bad', 'name': "Bad", 'price': 'free'}))
+        with self.assertRaisesMessage(CommandError, "Row 6: invalid price 'free'"):
+            self.run_import('products.jsonl', "\n".join(rows), chunk_size=2)
+        # Chunks 1 and 2 were committed; chunk 3 held the bad row
+        self.assertEqual(sorted(self.prices('B-')), ['B-0', 'B-1', 'B-2', 'B-3'])
+
+    def test_json_array_is_streamed(self):
+        products = [{'sku': f'J-{number:03d}', 'name': f"Jar {number} " + "x" * number, 'price': number + 0.5}
+                    for number in range(40)]
+        # Reads far smaller than one object, so objects straddle every read
+        with mock.patch.object(import_products, 'READ_SIZE', 7):
+            out = self.run_import('products.json', json.dumps(products, indent=2))
+        self.assertIn("40 inserted", out)
+        self.assertEqual(self.prices('J-')['J-039'], Decimal('39.50'))
+
+        stream = io.StringIO('[{"sku": "J-1"}, {"sku": "J-2"}')
+        with self.assertRaisesMessage(CommandError, "Truncated or invalid JSON input."):
+            list(import_products.read_json_array(stream))
+        with self.assertRaisesMessage(CommandError, "JSON input must be an array"):
+            list(import_products.read_json_array(io.StringIO('{"sku": "J-1"}')))
+
+    def test_rejects_non_object_rows(self):
+        with self.assertRaisesMessage(CommandError, "Row 2: expected an object"):
+            self.run_import('products.json', '[{"sku": "C-1", "name": "Cup", "price": 1}, ["C-2"]]')
+
+
+class CustomerDirectoryTests(TestCase):
+    def setUp(self):
+        self.acme = Customer.objects.create(name="Acme Florists")
+        for name in ("ACME Tools", "Acorn Gifts", "Bloom & Co"):
+            Customer.objects.create(name=name)
+
+    def names(self, query, **kwargs):
+        return [customer['name'] for customer in search_customers(query, **kwargs)]
+
+    def test_prefix_search_on_normalized_names(self):
+        self.assertEqual(self.names("acme"), ["Acme Florists", "ACME Tools"])
+        self.assertEqual(self.names("  ACME,  fl"), ["Acme Florists"])
+        self.assertEqual(self.names("ac"), ["Acme Florists", "ACME Tools", "Acorn Gifts"])
+        self.assertEqual(self.names("ac", limit=1), ["Acme Florists"])
+        self.assertEqual(self.names("bloom co"), ["Bloom & Co"])
+        self.assertEqual(self.names("acmex"), [])
+        self.assertEqual(self.names(" .,"), [])
+
+    def test_search_view(self):
+        response = self.client.get(reverse('customer_search'), {'q': "acme f"})
+        self.assertEqual(response.json(), {'customers': [{'id': self.acme.pk, 'name': "Acme Florists"}]})
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_resolve_existing_and_new_customers(self):
+        with self.assertNumQueries(3):  # look up, insert the new ones, read back their ids
+            resolved = resolve_customers(["acme florists.", "New  Shop", "new shop", "!!!"])
+        self.assertEqual(resolved["acme florists."], self.acme.pk)
+        self.assertEqual(resolved["New  Shop"], resolved["new shop"])
+        self.assertIsNone(resolved["!!!"])
+        self.assertEqual(Customer.objects.get(pk=resolved["new shop"]).normalized_name, "new shop")
+        self.assertEqual(Customer.objects.filter(normalized_name="new shop").count(), 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_customers(["NEW SHOP"]), {"NEW SHOP": resolved["new shop"]})
+
+    def test_orders_saved_one_at_a_time_are_linked(self):
+        order = Order.objects.create(customer_name="ACME florists")
+        self.assertEqual(order.customer_id, self.acme.pk)
+
+    def test_intake_links_orders_to_customers(self):
+        product = make_product()
+        items = [{'product': product.pk, 'quantity': 1}]
+        ids = write_orders([
+            validate_order_payload({'customer_name': "Acme Florists, ", 'items': items}),
+            validate_order_payload({'customer_name': "Fresh Start", 'items': items}),
+            validate_order_payload({'customer_name': "fresh  start", 'items': items}),
+        ])
+        customers = dict(Order.objects.filter(pk__in=ids).values_list('pk', 'customer_id'))
+        self.assertEqual(customers[ids[0]], self.acme.pk)
+        self.assertEqual(customers[ids[1]], customers[ids[2]])
+        self.assertEqual(Customer.objects.get(pk=customers[ids[1]]).name, "Fresh Start")
 
-# Create your tests here.
+        with mock.patch.object(order_writer, 'submit', side_effect=written_on_test_thread):
+            response = self.client.post(reverse('intake_order'),
+                                        json.dumps({'customer_name': "Bloom & co", 'items': items}),
+                                        content_type='application/json')
+        self.assertEqual(Order.objects.get(pk=response.json()['id']).customer.name, "Bloom & Co")
@@ -0,0 +1,39 @@
+"""Compact status history for sales and production orders.
+
+Every status change appends one ``StatusTransition`` row of small-int codes and an
+epoch-millisecond timestamp, so the history stays small and loads straight into
+integer columns for the lead-time analytics.
+"""
+import time
+
+from django.db import transaction
+
+from .models import StatusTransition
+
+SALES_ORDER = 1
+PRODUCTION_ORDER = 2
+
+STATUS_CODES = {
+    SALES_ORDER: {"Created": 1, "In Production": 2, "Ready for Delivery": 3, "Delivered": 4},
+    PRODUCTION_ORDER: {"Planned": 1, "In Progress": 2, "Completed": 3},
+}
+STATUS_NAMES = {kind: {code: name for name, code in codes.items()} for kind, codes in STATUS_CODES.items()}
+
+
+def to_ms(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def record(kind, status, pks, at=None):
+    """Append a transition to ``status`` for every record in ``pks`` (at ``at`` or now)."""
+    code = STATUS_CODES[kind][status]
+    at_ms = time.time_ns() // 1_000_000 if at is None else to_ms(at)
+    StatusTransition.objects.bulk_create([
+        StatusTransition(kind=kind, record_id=pk, status=code, at_ms=at_ms) for pk in pks
+    ])
+    # Fold the change into the report summaries once it is committed and note who made it
+    # (both modules import this one)
+    from .audit import STATUS_CHANGED, audit_log
+    from .summaries import summary_refresher
+    transaction.on_commit(summary_refresher.request)
+    audit_log.log(STATUS_CHANGED, kind, pks, status)
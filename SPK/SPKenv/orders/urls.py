@@ -5,4 +5,16 @@ urlpatterns = [
     path("", views.home, name="home"),  # homepage
     path("create/", views.create_order, name="create_order"),
     path("success/", views.order_success, name="order_success"),
+    path("list/", views.order_list, name="order_list"),
+    path("search/", views.order_search, name="order_search"),
+    path("<int:pk>/", views.order_detail, name="order_detail"),
+    path("<int:pk>/audit/", views.order_audit, name="order_audit"),
+    path("api/orders/", views.intake_order, name="intake_order"),
+    path("api/catalog/", views.catalog_api, name="catalog_api"),
+    path("api/customers/", views.customer_search, name="customer_search"),
+    path("dashboard/", views.dashboard, name="dashboard"),
+    path("jobs/", views.job_list, name="job_list"),
+    path("jobs/<int:pk>/cancel/", views.job_cancel, name="job_cancel"),
+    path("jobs/<int:pk>/download/", views.job_download, name="job_download"),
+    path("api/jobs/<int:pk>/", views.job_status, name="job_status"),
 ]
@@ -0,0 +1,61 @@
+import time
+
+from .models import DataVersion
+
+# Change counters (DataVersion rows) kept current by SQLite triggers, so every writer in
+# every process moves them: ORM saves, .update() from the Streamlit store, bulk_create,
+# imports and raw SQL alike. Each maps to the tables whose rows it covers.
+ORDERS, CATALOG = 'orders', 'catalog'
+GROUPS = {
+    # What the cached order pages show: orders, their items, product names/prices, customers
+    ORDERS: ('orders_order', 'orders_orderitem', 'orders_product', 'orders_customer'),
+    # Product choices and the catalog API (catalog.py)
+    CATALOG: ('orders_product',),
+}
+EVENTS = ('INSERT', 'UPDATE', 'DELETE')
+NOW_MS = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+
+def _trigger(name, table, event):
+    return (
+        f"orders_version_{name}_{table}_{event.lower()}",
+        f"CREATE TRIGGER orders_version_{name}_{table}_{event.lower()} AFTER {event} ON {table} BEGIN "
+        f"UPDATE orders_dataversion SET version = version + 1, changed_ms = {NOW_MS} WHERE name = '{name}'; END",
+    )
+
+
+def install_triggers(using='default', **kwargs):
+    """Create the version rows and any missing triggers (post_migrate, like search.install_triggers)."""
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'orders_dataversion'")
+        if cursor.fetchone() is None:
+            return  # migrations not applied yet
+        # Versions start at the current time, so a recreated database never repeats an old ETag
+        now_ms = time.time_ns() // 1_000_000
+        for name in GROUPS:
+            cursor.execute("INSERT OR IGNORE INTO orders_dataversion (name, version, changed_ms) VALUES (%s, %s, %s)",
+                           [name, now_ms, now_ms])
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'orders_version_%%'")
+        existing = {name for (name,) in cursor.fetchall()}
+        for name, tables in GROUPS.items():
+            for table in tables:
+                for event in EVENTS:
+                    trigger, sql = _trigger(name, table, event)
+                    if trigger not in existing:
+                        cursor.execute(sql, [])
+
+
+def data_version(name):
+    """Return (version, changed_ms) of a group: one primary-key lookup."""
+    row = DataVersion.objects.filter(pk=name).values_list('version', 'changed_ms').first()
+    if row is None:
+        # Rows are created after migrate; until then count from now
+        now_ms = time.time_ns() // 1_000_000
+        version, _ = DataVersion.objects.get_or_create(name=name, defaults={'version': now_ms, 'changed_ms': now_ms})
+        row = (version.version, version.changed_ms)
+    return row
@@ -1,24 +1,86 @@
-from django.shortcuts import render, redirect
+import asyncio
+import json
+import os
+import re
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.core.paginator import Paginator
+from django.shortcuts import get_object_or_404, render, redirect
+from django.urls import reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_GET, require_http_methods, require_POST
+from .audit import order_history
+from .caching import cached_order_page
+from .catalog import catalog_json
+from .customers import customer_orders, customer_totals, search_customers
 from .forms import OrderForm, OrderItemForm, OrderItemFormSet
-from .models import Order
+from .idempotency import clean_key, find_order_id, live_keys, maybe_purge_expired
+from .intake import OrderNotSaved, order_writer, validate_order_payload
+from .jobs import TASKS, cancel, enqueue
+from .models import Customer, IdempotencyKey, Job, Order
+from .search import search_orders
+from .tasks import import_path
+from .transitions import SALES_ORDER, record
+
+ORDERS_PER_PAGE = 50
+# The catalog changes rarely; shared caches may serve it briefly, then revalidate by ETag
+CATALOG_MAX_AGE = 60
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+# Seconds a client should wait before retrying an order the database could not take
+INTAKE_RETRY_AFTER = 1
+# New customers appear in suggestions shortly after their first order
+CUSTOMER_SEARCH_MAX_AGE = 30
+RECENT_JOBS = 50
 
+@cached_order_page()
 def home(request):
     return render(request, "orders/home.html")
 
 def create_order(request):
     if request.method == 'POST':
+        # A retried submit returns the original order without validating or saving again
+        key = clean_key(request.POST.get('idempotency_key'))
+        order_id = find_order_id(key)
+        if order_id is not None:
+            return redirect_to_success(order_id)
+
         order_form = OrderForm(request.POST)
         formset = OrderItemFormSet(request.POST)
         if order_form.is_valid() and formset.is_valid():
-            order = order_form.save()
-            items = formset.save(commit=False)
-            for item in items:
-                item.order = order
-                item.save()
-            return redirect('orders:list')
+            try:
+                with transaction.atomic():
+                    order = order_form.save()
+                    items = formset.save(commit=False)
+                    for item in items:
+                        item.order = order
+                        item.save()
+                    # commit=False leaves rows ticked "Delete" to us; deleting them is audited (signals)
+                    for item in formset.deleted_objects:
+                        item.delete()
+                    if key is not None:
+                        live_keys([key])  # an expired record of the key makes way for this order
+                        IdempotencyKey.objects.create(key=key, order=order)
+                    record(SALES_ORDER, order.status, [order.pk], at=order.date_created)
+            except IntegrityError:
+                # A concurrent duplicate won the race for this key
+                order_id = find_order_id(key)
+                if order_id is None:
+                    raise
+                return redirect_to_success(order_id)
+            maybe_purge_expired()
+            return redirect_to_success(order.pk)
     else:
         order_form = OrderForm()
-        formset = OrderItemFormSet()
+        # "Start Customizing" on the dashboard links here with ?product=<pk>
+        product = request.GET.get('product', '')
+        formset = OrderItemFormSet(initial=[{'product': int(product)}] if product.isdigit() else None)
 
     return render(request, 'orders/order_form.html', {
         'order_form': order_form,
@@ -26,5 +88,173 @@ def create_order(request):
     })
 
 
+def redirect_to_success(order_id):
+    return redirect(f"{reverse('order_success')}?order={order_id}")
+
+
+@cached_order_page()
 def order_success(request):
-    return render(request, "orders/order_success.html")
\ No newline at end of file
+    # Only a real order number gets a link; anything else just shows the confirmation
+    order_id = request.GET.get('order', '')
+    return render(request, "orders/order_success.html", {
+        'order_id': order_id if order_id.isdigit() else '',
+    })
+
+
+@cached_order_page()
+def order_list(request):
+    # ?customer=<pk> lists one customer's history through the (customer, date) index
+    customer = None
+    customer_id = request.GET.get('customer', '')
+    if customer_id.isdigit():
+        customer = get_object_or_404(Customer, pk=customer_id)
+        orders = customer_orders(customer.pk)
+        customer.order_count, customer.revenue = customer_totals([customer.pk]).get(customer.pk, (0, 0))
+    else:
+        orders = Order.objects.order_by('-date_created')
+    page = Paginator(orders.prefetch_related('items__product'), ORDERS_PER_PAGE).get_page(request.GET.get('page'))
+    return render(request, "orders/order_list.html", {'page': page, 'customer': customer})
+
+
+@cached_order_page()
+def order_detail(request, pk):
+    order = get_object_or_404(Order.objects.prefetch_related('items__product'), pk=pk)
+    return render(request, "orders/order_detail.html", {'order': order})
+
+
+# Audit trail of an order (orders/audit.py); still readable after the order was deleted.
+# Staff only: the actors are user names and client addresses
+@staff_member_required
+@require_GET
+def order_audit(request, pk):
+    order = Order.objects.filter(pk=pk).first()
+    entries = order_history(pk)
+    if order is None and not entries:
+        raise Http404("No such order.")
+    return render(request, "orders/order_audit.html", {'pk': pk, 'order': order, 'entries': entries})
+
+
+# Full-text search over orders (orders/search.py); the FTS index is kept current by
+# triggers, including delivery and production writes that don't bump the page cache
+@require_GET
+def order_search(request):
+    query = request.GET.get('q', '').strip()
+    return render(request, "orders/order_search.html", {
+        'query': query,
+        'results': search_orders(query) if query else [],
+    })
+
+
+# JSON order intake for API clients; inserts are batched by the background order writer
+@csrf_exempt
+@require_POST
+async def intake_order(request):
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'errors': {'__all__': ["Invalid JSON."]}}, status=400)
+    key = clean_key(request.headers.get('Idempotency-Key'))
+    order_id = await sync_to_async(find_order_id)(key)
+    if order_id is not None:
+        return JsonResponse({'id': order_id}, status=201)
+    try:
+        cleaned = await sync_to_async(validate_order_payload)(payload)
+        cleaned['idempotency_key'] = key
+        order_id = await asyncio.wrap_future(order_writer.submit(cleaned))
+    except ValidationError as exc:
+        errors = exc.message_dict if hasattr(exc, 'error_dict') else {'__all__': exc.messages}
+        return JsonResponse({'errors': errors}, status=400)
+    except OrderNotSaved as exc:
+        # The request was fine; a retry (with the same Idempotency-Key) can succeed
+        response = JsonResponse({'errors': {'__all__': [str(exc)]}}, status=503)
+        response['Retry-After'] = str(INTAKE_RETRY_AFTER)
+        return response
+    return JsonResponse({'id': order_id}, status=201)
+
+
+# Autocomplete for customer name inputs: prefix search on the normalized-name index
+@require_GET
+@cache_control(private=True, max_age=CUSTOMER_SEARCH_MAX_AGE)
+def customer_search(request):
+    return JsonResponse({'customers': search_customers(request.GET.get('q', ''))})
+
+
+# Static shell: no catalog data in the HTML, so it can be cached at the edge
+@require_GET
+@cache_control(public=True, max_age=60 * 60)
+def dashboard(request):
+    return render(request, 'orders/dashboard.html')
+
+
+@require_GET
+@condition(etag_func=lambda request: f'W/"{catalog_json()[0]}"')
+def catalog_api(request):
+    _, body, compressed = catalog_json()
+    if ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+        response = HttpResponse(compressed, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+    return response
+
+# Background jobs (jobs.py): start any registered task, watch progress, cancel, download output.
+# Staff only: tasks rewrite tables and exports carry customer names and notes
+@staff_member_required
+@require_http_methods(["GET", "POST"])
+def job_list(request):
+    if request.method == 'POST':
+        registered = TASKS.get(request.POST.get('task', ''))
+        if registered is None:
+            return HttpResponseBadRequest("Unknown task.")
+        params = {name: request.POST.get(name, '').strip() for name in registered.params}
+        if not all(params.values()):
+            return HttpResponseBadRequest(f"{registered.label} needs: {', '.join(registered.params)}.")
+        if 'path' in params:
+            try:
+                import_path(params['path'])
+            except ValueError as exc:
+                return HttpResponseBadRequest(str(exc))
+        enqueue(registered.name, **params)
+        return redirect('job_list')
+    jobs = list(Job.objects.order_by('-pk')[:RECENT_JOBS])
+    for job in jobs:
+        job.label = TASKS[job.task].label if job.task in TASKS else job.task
+    return render(request, "orders/job_list.html", {
+        'jobs': jobs,
+        'tasks': TASKS.values(),
+        # The page reloads itself while anything is queued or running
+        'polling': any(job.status in Job.ACTIVE for job in jobs),
+    })
+
+
+@staff_member_required
+@require_POST
+def job_cancel(request, pk):
+    cancel(pk)
+    return redirect('job_list')
+
+
+@staff_member_required
+@require_GET
+def job_status(request, pk):
+    job = get_object_or_404(Job, pk=pk)
+    result = job.result if isinstance(job.result, dict) else {}
+    return JsonResponse({
+        'id': job.pk, 'task': job.task, 'status': job.status, 'progress': job.progress, 'message': job.message,
+        'attempts': job.attempts, 'max_attempts': job.max_attempts, 'result': job.result,
+        'error': job.error_summary,
+        'download': reverse('job_download', args=[job.pk]) if result.get('file') else None,
+    })
+
+
+@staff_member_required
+@require_GET
+def job_download(request, pk):
+    job = get_object_or_404(Job, pk=pk, status=Job.SUCCEEDED)
+    name = (job.result or {}).get('file') if isinstance(job.result, dict) else None
+    path = settings.JOB_OUTPUT_DIR / os.path.basename(name) if name else None
+    if path is None or not path.is_file():
+        raise Http404("This job has no output file.")
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
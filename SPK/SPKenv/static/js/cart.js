@@ -0,0 +1,224 @@
+// Dashboard cart: collects products from the catalog cards and places the whole
+// order with one JSON POST to the intake endpoint (one request, one transaction).
+//
+// The cart lives in localStorage so it survives reloads. Each checkout attempt
+// carries an Idempotency-Key that is kept until the order succeeds or the cart
+// changes, so a retried submit returns the original order instead of a duplicate.
+(function () {
+    'use strict';
+
+    var script = document.currentScript;
+    var intakeUrl = script.dataset.intakeUrl;
+    // Order detail URL reversed with pk 0; the trailing "0/" is replaced by the new id
+    var detailUrl = script.dataset.detailUrl;
+    var STORAGE_KEY = 'ecopack-cart';
+    var MAX_QUANTITY = 100000;
+
+    var panel = document.getElementById('cart');
+    var linesNode = document.getElementById('cart-lines');
+    var totalNode = document.getElementById('cart-total');
+    var form = document.getElementById('cart-form');
+    var customerInput = document.getElementById('cart-customer');
+    var submitButton = document.getElementById('cart-submit');
+    var messageNode = document.getElementById('cart-message');
+
+    // {lines: {productId: {id, name, price, unit, quantity}}, order: [productId...], key, customer}
+    var cart = load();
+
+    function load() {
+        try {
+            var stored = JSON.parse(localStorage.getItem(STORAGE_KEY));
+            if (stored && stored.lines && stored.order) {
+                return stored;
+            }
+        } catch (error) {
+            // Unavailable or corrupt storage: start with an empty cart
+        }
+        return { lines: {}, order: [], key: null, customer: '' };
+    }
+
+    function save() {
+        try {
+            localStorage.setItem(STORAGE_KEY, JSON.stringify(cart));
+        } catch (error) {
+            // Private mode or quota: the cart still works for this page view
+        }
+    }
+
+    function newKey() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID().replace(/-/g, '');
+        }
+        return Date.now().toString(16) + Math.random().toString(16).slice(2);
+    }
+
+    function changed() {
+        cart.key = null;  // a different order needs a different idempotency key
+        save();
+        render();
+    }
+
+    function add(product) {
+        var line = cart.lines[product.id];
+        if (line) {
+            line.quantity = Math.min(line.quantity + 1, MAX_QUANTITY);
+        } else {
+            cart.lines[product.id] = {
+                id: product.id, name: product.name, price: product.price, unit: product.unit, quantity: 1
+            };
+            cart.order.push(product.id);
+        }
+        showMessage('');
+        changed();
+    }
+
+    function setQuantity(id, quantity) {
+        if (!(quantity >= 1)) {
+            remove(id);
+            return;
+        }
+        cart.lines[id].quantity = Math.min(Math.floor(quantity), MAX_QUANTITY);
+        changed();
+    }
+
+    function remove(id) {
+        delete cart.lines[id];
+        cart.order = cart.order.filter(function (other) { return other !== id; });
+        changed();
+    }
+
+    function clear() {
+        cart = { lines: {}, order: [], key: null, customer: cart.customer };
+        save();
+        render();
+    }
+
+    function peso(amount) {
+        return '₱' + amount.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 2 });
+    }
+
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function lineNode(line) {
+        var node = element('li', 'cart-line');
+        node.appendChild(element('span', 'cart-line-name', line.name));
+
+        var quantity = element('input', 'cart-quantity');
+        quantity.type = 'number';
+        quantity.min = '1';
+        quantity.max = String(MAX_QUANTITY);
+        quantity.value = String(line.quantity);
+        quantity.setAttribute('aria-label', 'Quantity of ' + line.name);
+        quantity.addEventListener('change', function () { setQuantity(line.id, Number(quantity.value)); });
+        node.appendChild(quantity);
+
+        node.appendChild(element('span', 'cart-line-amount', peso(Number(line.price) * line.quantity)));
+
+        var removeButton = element('button', 'cart-remove', '✕');
+        removeButton.type = 'button';
+        removeButton.setAttribute('aria-label', 'Remove ' + line.name);
+        removeButton.addEventListener('click', function () { remove(line.id); });
+        node.appendChild(removeButton);
+        return node;
+    }
+
+    function render() {
+        var lines = cart.order.map(function (id) { return cart.lines[id]; });
+        linesNode.replaceChildren.apply(linesNode, lines.map(lineNode));
+        var total = lines.reduce(function (sum, line) { return sum + Number(line.price) * line.quantity; }, 0);
+        var units = lines.reduce(function (sum, line) { return sum + line.quantity; }, 0);
+        totalNode.textContent = units + (units === 1 ? ' item' : ' items') + ' · ' + peso(total);
+        form.hidden = !lines.length;
+        totalNode.hidden = !lines.length;
+        panel.hidden = !lines.length && !messageNode.textContent;
+    }
+
+    function showMessage(text, link) {
+        messageNode.replaceChildren();
+        if (text) {
+            messageNode.appendChild(document.createTextNode(text));
+        }
+        if (link) {
+            messageNode.appendChild(document.createTextNode(' '));
+            var anchor = element('a', null, link.text);
+            anchor.href = link.href;
+            messageNode.appendChild(anchor);
+        }
+    }
+
+    function errorText(errors) {
+        return Object.keys(errors).map(function (field) {
+            return [].concat(errors[field]).join(' ');
+        }).join(' ');
+    }
+
+    function submit(event) {
+        event.preventDefault();
+        if (!cart.order.length) {
+            return;
+        }
+        cart.customer = customerInput.value.trim();
+        if (!cart.key) {
+            cart.key = newKey();
+        }
+        save();
+
+        var payload = {
+            customer_name: cart.customer,
+            items: cart.order.map(function (id) {
+                return { product: cart.lines[id].id, quantity: cart.lines[id].quantity };
+            })
+        };
+        submitButton.disabled = true;
+        showMessage('Placing your order…');
+        fetch(intakeUrl, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': cart.key },
+            body: JSON.stringify(payload)
+        })
+            .then(function (response) {
+                return response.json().then(function (body) { return { ok: response.ok, body: body }; });
+            })
+            .then(function (result) {
+                if (!result.ok) {
+                    showMessage(errorText(result.body.errors || {}) || 'The order could not be placed.');
+                    return;
+                }
+                clear();
+                showMessage('Order #' + result.body.id + ' placed. Thank you!', {
+                    text: 'View order', href: detailUrl.replace(/0\/$/, result.body.id + '/')
+                });
+                render();
+            })
+            .catch(function () {
+                // Network failure: the key is kept, so trying again cannot create a duplicate
+                showMessage('Could not reach the server. Your cart is saved; please try again.');
+            })
+            .then(function () { submitButton.disabled = false; });
+    }
+
+    // Product cards are rendered later by dashboard.js; listen on the document
+    document.addEventListener('click', function (event) {
+        var button = event.target.closest('[data-add-to-cart]');
+        if (button) {
+            add({
+                id: Number(button.dataset.productId),
+                name: button.dataset.productName,
+                price: button.dataset.productPrice,
+                unit: button.dataset.productUnit
+            });
+        }
+    });
+    form.addEventListener('submit', submit);
+    customerInput.value = cart.customer;
+    render();
+})();
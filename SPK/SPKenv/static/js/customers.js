@@ -0,0 +1,63 @@
+// Customer name autocomplete for inputs marked with data-customer-search="<api url>".
+//
+// Suggestions come from the customer directory's prefix search and fill a <datalist>,
+// so picking one reuses the exact directory spelling. Typing a new name still works:
+// the server links the order to an existing customer whenever the normalized names match.
+(function () {
+    'use strict';
+
+    var DEBOUNCE_MS = 150;
+
+    function attach(input, index) {
+        var url = input.dataset.customerSearch;
+        var list = document.createElement('datalist');
+        list.id = 'customer-suggestions-' + index;
+        input.after(list);
+        input.setAttribute('list', list.id);
+        input.setAttribute('autocomplete', 'off');
+
+        var timer = null;
+        var lastQuery = null;
+        var cache = new Map();
+
+        function fill(customers) {
+            list.replaceChildren.apply(list, customers.map(function (customer) {
+                var option = document.createElement('option');
+                option.value = customer.name;
+                return option;
+            }));
+        }
+
+        function search() {
+            var query = input.value.trim();
+            if (query === lastQuery) {
+                return;
+            }
+            lastQuery = query;
+            if (!query) {
+                fill([]);
+                return;
+            }
+            if (cache.has(query)) {
+                fill(cache.get(query));
+                return;
+            }
+            fetch(url + '?q=' + encodeURIComponent(query), { headers: { Accept: 'application/json' } })
+                .then(function (response) { return response.ok ? response.json() : { customers: [] }; })
+                .then(function (body) {
+                    cache.set(query, body.customers);
+                    if (input.value.trim() === query) {
+                        fill(body.customers);
+                    }
+                })
+                .catch(function () { /* suggestions are optional */ });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(search, DEBOUNCE_MS);
+        });
+    }
+
+    document.querySelectorAll('input[data-customer-search]').forEach(attach);
+})();
@@ -0,0 +1,154 @@
+// Renders the dashboard product cards from the catalog API.
+//
+// The HTML shell carries no catalog data. Cards are built from /orders/api/catalog/,
+// which is revalidated by ETag when the tab regains focus and once a minute, so
+// catalog edits show up without touching the HTML or reloading the page.
+(function () {
+    'use strict';
+
+    var script = document.currentScript;
+    var catalogUrl = script.dataset.catalogUrl;
+    var REFRESH_MS = 60 * 1000;
+    // Cards are one grid column (min 280px) wide, full width on phones
+    var IMAGE_SIZES = '(max-width: 768px) 100vw, 400px';
+
+    var CATEGORY_ICONS = {
+        'Shipping & Mailing': '📦',
+        'Food Service': '☕',
+        'Specialty & Gifts': '🎁',
+        'Flower Shop': '🌸',
+        'Gift Store': '🎁',
+        'Food & Beverage': '🍽️',
+        'General': '♻️'
+    };
+
+    var lastEtag = null;
+
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function card(product) {
+        var node = element('div', 'product-card');
+        node.style.position = 'relative';
+        if (product.badge) {
+            node.appendChild(element('div', 'popular-badge', product.badge));
+        }
+        if (product.image) {
+            var image = element('img', 'product-image');
+            // Resized WebP variants when build_assets made them; the original is the fallback
+            if (product.srcset) {
+                image.srcset = product.srcset;
+                image.sizes = IMAGE_SIZES;
+            }
+            image.src = product.image;
+            image.alt = product.name;
+            image.loading = 'lazy';
+            image.decoding = 'async';
+            image.onerror = function () { image.remove(); };
+            node.appendChild(image);
+        }
+
+        var content = element('div', 'product-content');
+        content.appendChild(element('h3', 'product-title', product.name));
+        if (product.description) {
+            content.appendChild(element('p', 'product-description', product.description));
+        }
+        if (product.features.length) {
+            var features = element('div', 'product-features');
+            product.features.forEach(function (feature) {
+                features.appendChild(element('span', 'feature-tag', feature));
+            });
+            content.appendChild(features);
+        }
+        content.appendChild(element('div', 'product-price', 'Starting at ₱' + product.price + '/' + product.unit));
+
+        // Handled by cart.js; the whole order is placed in one request from the cart
+        var button = element('button', 'order-btn', 'Add to Order');
+        button.type = 'button';
+        button.dataset.addToCart = '';
+        button.dataset.productId = product.id;
+        button.dataset.productName = product.name;
+        button.dataset.productPrice = product.price;
+        button.dataset.productUnit = product.unit;
+        content.appendChild(button);
+        node.appendChild(content);
+        return node;
+    }
+
+    function render(products) {
+        var popular = products.filter(function (product) { return product.badge; });
+        var popularSection = document.getElementById('popular-section');
+        var popularGrid = document.getElementById('popular-grid');
+        popularGrid.replaceChildren.apply(popularGrid, popular.map(card));
+        popularSection.hidden = !popular.length;
+
+        // Category sections in first-seen order; popular products are only shown once
+        var categories = new Map();
+        products.forEach(function (product) {
+            if (product.badge) {
+                return;
+            }
+            var name = product.category || 'More Packaging';
+            if (!categories.has(name)) {
+                categories.set(name, []);
+            }
+            categories.get(name).push(product);
+        });
+
+        var sections = [];
+        categories.forEach(function (items, name) {
+            var section = element('section', 'category-section');
+            section.appendChild(element('h3', 'category-title', (CATEGORY_ICONS[name] || '📦') + ' ' + name));
+            var grid = element('div', 'category-grid');
+            items.forEach(function (product) { grid.appendChild(card(product)); });
+            section.appendChild(grid);
+            sections.push(section);
+        });
+        var container = document.getElementById('category-sections');
+        container.replaceChildren.apply(container, sections);
+    }
+
+    function showStatus(message) {
+        var container = document.getElementById('category-sections');
+        if (!container.children.length) {
+            container.appendChild(element('p', 'catalog-status', message));
+        }
+    }
+
+    function refresh() {
+        // no-cache: always revalidate; an unchanged catalog is a 304 with no body
+        return fetch(catalogUrl, { cache: 'no-cache', headers: { Accept: 'application/json' } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error('Catalog request failed: ' + response.status);
+                }
+                var etag = response.headers.get('ETag');
+                if (etag && etag === lastEtag) {
+                    return;
+                }
+                lastEtag = etag;
+                return response.json().then(function (catalog) { render(catalog.products); });
+            })
+            .catch(function () { showStatus('The catalog is unavailable right now. Please try again shortly.'); });
+    }
+
+    refresh();
+    setInterval(function () {
+        if (!document.hidden) {
+            refresh();
+        }
+    }, REFRESH_MS);
+    document.addEventListener('visibilitychange', function () {
+        if (!document.hidden) {
+            refresh();
+        }
+    });
+})();
@@ -0,0 +1 @@
+"""Make-to-Order manufacturing flow app (Streamlit) on top of the Django orders models."""
@@ -0,0 +1,80 @@
+"""Lead-time percentiles per stage, product and product category.
+
+Works on the columnar ``StatusHistory`` from the store: the first timestamp of each
+status per order is one groupby/unstack, stage durations are column differences,
+and the percentile tables are groupby quantiles, so no order objects are built.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+PERCENTILES = [0.5, 0.95, 0.99]
+
+# (stage, from status, to status) per record kind
+STAGES = {
+    "SO": [
+        ("Awaiting production", "Created", "In Production"),
+        ("In production", "In Production", "Ready for Delivery"),
+        ("Awaiting shipment", "Ready for Delivery", "Delivered"),
+        ("Order to delivery", "Created", "Delivered"),
+    ],
+    "PO": [
+        ("Run queue", "Planned", "In Progress"),
+        ("Run", "In Progress", "Completed"),
+    ],
+}
+STAGE_ORDER = [stage for stages in STAGES.values() for stage, _, _ in stages]
+
+
+@dataclass
+class LeadTimes:
+    by_stage: pd.DataFrame
+    by_product: pd.DataFrame
+    by_category: pd.DataFrame  # category of the products on the order
+
+
+def stage_durations(transitions, kind):
+    """Hours per (record, stage) for every stage a record of ``kind`` has completed."""
+    history = transitions[transitions["kind"] == kind]
+    first = history.groupby(["record_id", "status"], observed=True)["at"].min().unstack()
+    frames = [
+        pd.DataFrame({
+            "record_id": first.index,
+            "stage": stage,
+            "hours": ((first[end] - first[start]).dt.total_seconds() / 3600).to_numpy(),
+        })
+        for stage, start, end in STAGES[kind]
+        if start in first.columns and end in first.columns
+    ]
+    if not frames:
+        return pd.DataFrame({"record_id": pd.Series(dtype="int64"), "stage": pd.Series(dtype="object"),
+                             "hours": pd.Series(dtype="float64")})
+    return pd.concat(frames, ignore_index=True).dropna(subset=["hours"])
+
+
+def percentiles(durations, by):
+    grouped = durations.groupby(by, observed=True)["hours"]
+    table = grouped.quantile(PERCENTILES).unstack()
+    table.columns = [f"p{round(q * 100)} (h)" for q in PERCENTILES]
+    table.insert(0, "count", grouped.size())
+    return table.round(2)
+
+
+def lead_times(history) -> LeadTimes:
+    sales = stage_durations(history.transitions, "SO")
+    runs = stage_durations(history.transitions, "PO")
+    # An order counts once per product (and category) it contains; a run has one product
+    tagged = pd.concat([
+        sales.merge(history.order_products, on="record_id"),
+        runs.merge(history.run_products, on="record_id"),
+    ], ignore_index=True)
+
+    stage_type = pd.CategoricalDtype(STAGE_ORDER, ordered=True)
+    every = pd.concat([sales, runs], ignore_index=True).astype({"stage": stage_type})
+    tagged = tagged.astype({"stage": stage_type})
+    tagged["category"] = tagged["category"].replace("", "Uncategorized")
+    return LeadTimes(
+        by_stage=percentiles(every, ["stage"]),
+        by_product=percentiles(tagged, ["product", "stage"]),
+        by_category=percentiles(tagged, ["category", "stage"]),
+    )
@@ -0,0 +1,66 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from . import store
+from .config import Features
+from .pages import (
+    show_delivery_billing,
+    show_order_documentation,
+    show_overview,
+    show_production_confirmation,
+    show_production_order_management,
+    show_sales_order_creation,
+)
+from .styles import load_css
+
+# Main application
+def main(features=None):
+    if features is None:
+        features = Features.from_env()
+    
+    # Page configuration
+    st.set_page_config(
+        page_title="Make-to-Order Manufacturing Flow",
+        page_icon="📦",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    load_css()
+    # Changes made from this browser session show up under its id in the audit log
+    ctx = get_script_run_ctx()
+    store.set_actor(f"streamlit:{ctx.session_id[:8]}" if ctx else "streamlit")
+    # One bulk read of the shared order tables per rerun
+    data = store.load_snapshot()
+    
+    # Header
+    st.markdown("""
+    <div class="main-header">
+        <h1>📦 Make-to-Order Manufacturing Flow</h1>
+        <p>Sustainable Packaging Kits - An Eco-Friendly Solution for Reducing Environmental Waste</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Sidebar navigation
+    st.sidebar.title("🌱 Navigation")
+    page = st.sidebar.selectbox("Select Process Step", [
+        "🏠 Overview",
+        "📋 Sales Order Creation (VA01)",
+        "🏭 Production Order Management",
+        "✅ Production Confirmation",
+        "🚚 Delivery & Billing Cycle",
+        "📊 Order Documentation"
+    ])
+    
+    if page == "🏠 Overview":
+        show_overview(data)
+    elif page == "📋 Sales Order Creation (VA01)":
+        show_sales_order_creation(data, features)
+    elif page == "🏭 Production Order Management":
+        show_production_order_management(data)
+    elif page == "✅ Production Confirmation":
+        show_production_confirmation(data)
+    elif page == "🚚 Delivery & Billing Cycle":
+        show_delivery_billing(data)
+    elif page == "📊 Order Documentation":
+        show_order_documentation(data)
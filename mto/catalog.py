@@ -0,0 +1,107 @@
+"""Process-wide, immutable product catalog for the Streamlit pages.
+
+The catalog is built once per process (from the ``Product`` table, or from a JSON
+file named by ``MTO_CATALOG_FILE``) and shared by every session. It carries the
+id -> product map, the select-box labels and the per-category index prebuilt, so
+a form rerun only looks things up: no query, no new ``Product`` objects and no
+label strings. ``refresh()`` swaps in a freshly built catalog atomically; readers
+holding the old one keep a consistent view.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple
+
+from . import store
+from .store import Product
+
+CATALOG_FILE_ENV = "MTO_CATALOG_FILE"
+
+
+def product_label(product: Product) -> str:
+    return f"{product.name} - ${product.price}"
+
+
+@dataclass(frozen=True)
+class Catalog:
+    products: Tuple[Product, ...]  # sorted by id (SKU)
+    labels: Tuple[str, ...]  # select-box label per product, same order
+    by_id: Mapping[str, Product]
+    by_label: Mapping[str, Product]
+    by_category: Mapping[str, Tuple[Product, ...]]
+    source: str  # "database" or the file it was read from
+
+    @classmethod
+    def build(cls, products: Iterable[Product], source: str) -> "Catalog":
+        products = tuple(sorted(products, key=lambda product: product.id))
+        labels = tuple(product_label(product) for product in products)
+        by_category = {}
+        for product in products:
+            by_category.setdefault(product.category, []).append(product)
+        return cls(
+            products=products,
+            labels=labels,
+            by_id=MappingProxyType({product.id: product for product in products}),
+            by_label=MappingProxyType(dict(zip(labels, products))),
+            by_category=MappingProxyType({category: tuple(items) for category, items in by_category.items()}),
+            source=source,
+        )
+
+    def get(self, product_id) -> Optional[Product]:
+        return self.by_id.get(product_id)
+
+
+def read_file(path) -> Tuple[Product, ...]:
+    """Read products from a JSON array of objects with the ``Product`` field names.
+
+    The ids must be SKUs of existing ``Product`` rows, since orders are written by SKU.
+    """
+    with open(path, encoding="utf-8") as stream:
+        rows = json.load(stream)
+    return tuple(
+        Product(
+            id=row["id"],
+            name=row["name"],
+            category=row.get("category", ""),
+            price=float(row["price"]),
+            sustainability_score=int(row.get("sustainability_score", 0)),
+            work_center_id=row.get("work_center_id"),
+            cycle_seconds=int(row.get("cycle_seconds", 60)),
+        )
+        for row in rows
+    )
+
+
+def load(path=None) -> Catalog:
+    """Build a catalog from ``path`` if given, else from the database."""
+    if path:
+        return Catalog.build(read_file(path), str(Path(path)))
+    return Catalog.build(store.list_products(), "database")
+
+
+_catalog: Optional[Catalog] = None
+_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Return the process-wide catalog, loading it on first use."""
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = load(os.environ.get(CATALOG_FILE_ENV))
+            catalog = _catalog
+    return catalog
+
+
+def refresh(path=None) -> Catalog:
+    """Rebuild the catalog from ``path``, ``MTO_CATALOG_FILE`` or the database and swap it in."""
+    global _catalog
+    catalog = load(path or os.environ.get(CATALOG_FILE_ENV))
+    with _lock:
+        _catalog = catalog
+    return catalog
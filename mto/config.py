@@ -0,0 +1,19 @@
+import os
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class Features:
+    """Feature flags for the variants that used to be separate copies of app.py."""
+
+    # Start the product select on a "-- Select --" entry instead of the first product
+    product_select_placeholder: bool = False
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Read flags from ``MTO_FEATURES``, a comma-separated list of flag names."""
+        enabled = {name.strip() for name in environ.get("MTO_FEATURES", "").split(",") if name.strip()}
+        unknown = enabled - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown MTO_FEATURES flag(s): {', '.join(sorted(unknown))}")
+        return cls(**{name: True for name in enabled})
@@ -0,0 +1,50 @@
+"""Process-wide customer directory for the sales order form's autocomplete.
+
+Names are kept sorted by their normalized form (the same key the Django
+``Customer.normalized_name`` unique index uses), so the select box offers one
+entry per customer however it was typed before. The directory is rebuilt only
+when the customer table's (count, max id) changes; a rerun otherwise costs one
+cheap aggregate query and reuses the prebuilt tuples.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from . import store
+
+
+@dataclass(frozen=True)
+class CustomerDirectory:
+    version: Tuple[int, int]
+    names: Tuple[str, ...]  # display names, ordered by normalized name
+    ids_by_name: Mapping[str, int]
+
+    @classmethod
+    def build(cls, customers, version) -> "CustomerDirectory":
+        customers = tuple(customers)
+        return cls(
+            version=version,
+            names=tuple(customer.name for customer in customers),
+            ids_by_name=MappingProxyType({customer.name: customer.id for customer in customers}),
+        )
+
+    def get_id(self, name) -> Optional[int]:
+        return self.ids_by_name.get(name)
+
+
+_directory: Optional[CustomerDirectory] = None
+_lock = threading.Lock()
+
+
+def get_directory() -> CustomerDirectory:
+    """Return the shared directory, rebuilding it if customers were added or removed."""
+    global _directory
+    version = store.customer_directory_version()
+    directory = _directory
+    if directory is None or directory.version != version:
+        with _lock:
+            if _directory is None or _directory.version != version:
+                _directory = CustomerDirectory.build(store.list_customers(), version)
+            directory = _directory
+    return directory
@@ -0,0 +1,747 @@
+import datetime
+import html
+
+import pandas as pd
+import streamlit as st
+
+from . import catalog as product_catalog
+from . import customers as customer_directory
+from . import reports, store
+from .analytics import lead_times
+from .batching import BatchPolicy, plan_batches
+
+def show_overview(data):
+    st.header("🌍 Sustainable Packaging Solutions")
+    
+    companies = [
+        ("🌸 Flower Shops", "Bouquet wrappers & packaging"),
+        ("🎁 Gift Stores", "Gift wrappers & packaging"),
+        ("🍽️ Food & Beverage", "Food and drink packaging")
+    ]
+    
+    for company, description in companies:
+        st.markdown(f"""
+        <div class="company-example">
+            <h4>{company}</h4>
+            <p>{description}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Current status overview, from the materialized summaries rather than every order
+    st.header("📊 Current System Status")
+    summary = store.load_report_summary()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Sales Orders", summary.total_orders)
+    with col2:
+        # Runs released minus runs completed
+        st.metric("Active Production Orders", summary.stage("PO", "Planned")[0] - summary.stage("PO", "Completed")[0])
+    with col3:
+        st.metric("Completed Deliveries", summary.stage("SO", "Delivered")[0])
+    with col4:
+        # Unit-weighted average sustainability score of everything ordered
+        st.metric("Avg Sustainability Score", f"{summary.sustainability_score:.1f}%")
+    show_summary_freshness(summary)
+
+def show_summary_freshness(summary):
+    if summary.pending:
+        st.caption(f"⏳ {summary.pending} recent change{'s' if summary.pending != 1 else ''} "
+                   "not yet included; figures refresh in the background.")
+
+def show_sales_order_creation(data, features):
+    st.header("📋 Sales Order Creation (VA01)")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>Sprint 1 Objective:</strong> Configure and test sales order creation as the customer trigger for the MTO process.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Shared, prebuilt catalog: no query or label building per rerun
+    catalog = product_catalog.get_catalog()
+    directory = customer_directory.get_directory()
+    
+    with st.form("sales_order_form"):
+        st.subheader("Create New Sales Order")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Autocompletes repeat customers; a new name is accepted and added to the directory
+            customer_name = st.selectbox(
+                "Customer Name", directory.names, index=None, accept_new_options=True,
+                placeholder="Search or enter customer company name",
+            )
+            notes = st.text_area("Notes", placeholder="Delivery instructions, special requests...", height=80)
+            
+            # One row per order line; kits are several lines on one order
+            first_product = None if features.product_select_placeholder else catalog.labels[0]
+            lines = st.data_editor(
+                pd.DataFrame({"Product": [first_product], "Quantity": [1]}),
+                num_rows="dynamic",
+                column_config={
+                    "Product": st.column_config.SelectboxColumn("Product", options=catalog.labels, required=True),
+                    "Quantity": st.column_config.NumberColumn("Quantity", min_value=1, max_value=1000, step=1, default=1, required=True),
+                },
+                use_container_width=True,
+                key="sales_order_lines",
+            )
+        
+        with col2:
+            # Vectorized line totals for the whole order
+            lines = lines.dropna(subset=["Product", "Quantity"])
+            line_products = lines["Product"].map(catalog.by_label.get)
+            # Labels picked before a catalog refresh may no longer exist
+            lines, line_products = lines[line_products.notna()], line_products.dropna()
+            summary = pd.DataFrame({
+                "Product": line_products.map(lambda p: p.name),
+                "Category": line_products.map(lambda p: p.category),
+                "Sustainability": line_products.map(lambda p: f"{p.sustainability_score}%"),
+                "Line Total": lines["Quantity"] * line_products.map(lambda p: p.price),
+            })
+            total_amount = float(summary["Line Total"].sum())
+            
+            st.markdown("**Order Lines**")
+            st.dataframe(summary.style.format({"Line Total": "${:.2f}"}), use_container_width=True, hide_index=True)
+            st.success(f"**Total Order Amount: ${total_amount:.2f}**")
+        
+        submitted = st.form_submit_button("Create Sales Order")
+        
+        if submitted and customer_name and not lines.empty:
+            order_id = store.create_sales_order(customer_name, [
+                (product.id, int(quantity))
+                for product, quantity in zip(line_products, lines["Quantity"])
+            ], notes)
+            data = store.load_snapshot()
+            
+            st.success(f"✅ Sales Order {order_id} created successfully!")
+            st.balloons()
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"Product catalog: {len(catalog.products)} products, "
+                   f"{len(catalog.by_category)} categories (from {catalog.source})")
+    with col2:
+        # The catalog is loaded once per process; pick up product edits made elsewhere
+        if st.button("🔄 Reload catalog", key="reload_catalog"):
+            product_catalog.refresh()
+            st.rerun()
+    
+    show_customer_history(directory)
+    
+    # Display existing sales orders
+    if data.sales_orders:
+        st.subheader("📋 Current Sales Orders")
+        
+        orders_data = []
+        for order in data.sales_orders:
+            orders_data.append({
+                "Order ID": order.id,
+                "Customer": order.customer_name,
+                "Products": order.product_names,
+                "Quantity": order.quantity,
+                "Total Amount": f"${order.total_amount:.2f}",
+                "Status": order.status,
+                "Order Date": order.order_date.strftime("%Y-%m-%d %H:%M")
+            })
+        
+        df = pd.DataFrame(orders_data)
+        st.dataframe(df, use_container_width=True)
+
+def show_customer_history(directory):
+    """Order count, revenue and recent orders of one customer from the directory."""
+    st.subheader("👥 Customer History")
+    name = st.selectbox("Customer", directory.names, index=None, placeholder="Pick a customer",
+                        key="customer_history")
+    if name is None:
+        return
+    history = store.customer_history(directory.get_id(name))
+    if history is None:
+        st.info("This customer no longer exists.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Orders", history.order_count)
+    with col2:
+        st.metric("Revenue", f"${history.revenue:,.2f}")
+    if history.orders:
+        st.dataframe(pd.DataFrame([{
+            "Order ID": order_id,
+            "Order Date": order_date.strftime("%Y-%m-%d %H:%M"),
+            "Status": status,
+        } for order_id, order_date, status in history.orders]), use_container_width=True, hide_index=True)
+
+def show_production_order_management(data):
+    st.header("🏭 Production Order Management")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>Sprint 2 & 3 Objectives:</strong> Enable automatic planned order generation from sales orders and convert them into production orders.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Show sales orders ready for production
+    pending_orders = [order for order in data.sales_orders if order.status == "Created"]
+    
+    if pending_orders:
+        st.subheader("📋 Sales Orders Ready for Production")
+        
+        for order in pending_orders:
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                st.markdown(f"""
+                <div class="status-card">
+                    <h4>Order {order.id}</h4>
+                    <p><strong>Customer:</strong> {html.escape(order.customer_name)}</p>
+                    <p><strong>Products:</strong> {html.escape(order.product_names)}</p>
+                    <p><strong>Quantity:</strong> {order.quantity}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"**Total:** ${order.total_amount:.2f}")
+                st.markdown(f"**Sustainability:** {order.sustainability_score:.0f}%")
+            
+            with col3:
+                if st.button(f"Create Production Orders", key=f"prod_{order.id}"):
+                    # Release this order on its own: one production order per product line
+                    demand = [item for item in data.pending_demand() if item.sales_order_id == order.id]
+                    batches, _ = plan_batches(demand, BatchPolicy(), datetime.datetime.now(datetime.timezone.utc), release_all=True)
+                    prod_order_ids = store.release_production_runs(batches)
+                    
+                    if prod_order_ids:
+                        st.success(f"✅ Production Orders {', '.join(prod_order_ids)} created!")
+                    st.rerun()
+        
+        show_production_batches(data)
+    else:
+        st.info("No sales orders ready for production. Create a sales order first.")
+    
+    # Display current production orders (exclude those whose sales orders have all shipped)
+    active_production_orders = []
+    for prod_order in data.production_orders:
+        sales_orders = [data.sales_order(so_id) for so_id in prod_order.sales_order_ids]
+        if any(sales_order and sales_order.status != "Delivered" for sales_order in sales_orders):
+            active_production_orders.append(prod_order)
+    
+    if active_production_orders:
+        plan = store.production_plan(data)
+        show_capacity_plan(data, plan)
+        
+        st.subheader("🏭 Current Production Orders")
+        
+        for prod_order in active_production_orders:
+            col1, col2 = st.columns([3, 1])
+            planned = plan.get(prod_order.id)
+            
+            with col1:
+                st.markdown(f"""
+                <div class="process-card">
+                    <h4>Production Order {prod_order.id}</h4>
+                    <p><strong>Linked Sales Orders:</strong> {html.escape(format_allocations(prod_order))}</p>
+                    <p><strong>Product:</strong> {html.escape(prod_order.product.name)}</p>
+                    <p><strong>Quantity:</strong> {prod_order.quantity}</p>
+                    <p><strong>Status:</strong> {html.escape(prod_order.status)}</p>
+                    <p><strong>Start Date:</strong> {prod_order.start_date.strftime("%Y-%m-%d %H:%M")}</p>
+                    <p><strong>Planned:</strong> {html.escape(format_planned(planned))}</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                # Progress bar
+                st.progress(prod_order.completion_percentage / 100)
+                st.caption(f"Completion: {prod_order.completion_percentage}%")
+            
+            with col2:
+                if prod_order.status == "Planned":
+                    if st.button(f"Start Production", key=f"start_{prod_order.id}"):
+                        store.start_production(prod_order.id)
+                        st.rerun()
+                elif prod_order.status == "In Progress" and prod_order.completion_percentage < 100:
+                    if st.button(f"Update Progress", key=f"update_{prod_order.id}"):
+                        store.advance_production(prod_order.id, 25)
+                        st.rerun()
+
+def format_planned(planned):
+    if planned is None:
+        return "—"
+    return (f"{planned.work_center_id} line {planned.line + 1}, "
+            f"{planned.start.strftime('%Y-%m-%d %H:%M')} → {planned.finish.strftime('%Y-%m-%d %H:%M')}")
+
+def show_capacity_plan(data, plan):
+    """Finite-capacity schedule of open production orders and the resulting ship dates."""
+    st.subheader("📅 Capacity Plan")
+    
+    schedule = sorted(plan.planned.values(), key=lambda planned: (planned.work_center_id, planned.start))
+    if not schedule:
+        st.info("Every production order is completed.")
+        return
+    
+    st.dataframe(pd.DataFrame([{
+        "Production Order": planned.job_id,
+        "Work Center": planned.work_center_id,
+        "Line": planned.line + 1,
+        "Planned Start": planned.start.strftime("%Y-%m-%d %H:%M"),
+        "Planned Finish": planned.finish.strftime("%Y-%m-%d %H:%M"),
+        "Sales Orders": ", ".join(data.production_order(planned.job_id).sales_order_ids),
+    } for planned in schedule]), use_container_width=True)
+    
+    promises = [
+        (sales_order.id, promised)
+        for sales_order in data.sales_orders
+        if (promised := data.promised_date(sales_order, plan)) is not None
+    ]
+    if promises:
+        st.caption("Promised delivery: " + ", ".join(
+            f"{so_id} {promised.strftime('%Y-%m-%d')}" for so_id, promised in promises
+        ))
+
+def format_allocations(prod_order):
+    return ", ".join(f"{so_id} ({quantity})" for so_id, quantity in prod_order.allocations.items())
+
+def show_production_batches(data):
+    """Merge pending demand for the same product into shared production runs."""
+    st.subheader("🧺 Batch Production Runs")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        max_batch = st.number_input("Max units per run", min_value=1, value=1000, step=50, key="batch_max_units")
+    with col2:
+        window_hours = st.number_input("Batch window (hours)", min_value=0.0, value=8.0, step=1.0, key="batch_window_hours")
+    
+    policy = BatchPolicy(int(max_batch), datetime.timedelta(hours=window_hours))
+    demand = data.pending_demand()
+    ready, held = plan_batches(demand, policy, datetime.datetime.now(datetime.timezone.utc))
+    
+    def batch_rows(batches, state):
+        return [{
+            "Product": batch.product_id,
+            "Units": batch.quantity,
+            "Sales Orders": ", ".join(f"{so_id} ({quantity})" for so_id, quantity in batch.allocations.items()),
+            "Window Closes": batch.due_at.strftime("%Y-%m-%d %H:%M"),
+            "State": state,
+        } for batch in batches]
+    
+    rows = batch_rows(ready, "Ready") + batch_rows(held, "Collecting")
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    st.caption(f"{len(demand)} order lines → {len(ready) + len(held)} production runs")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Release due batches", key="release_due_batches", disabled=not ready):
+            prod_order_ids = store.release_production_runs(ready)
+            st.success(f"✅ Production Orders {', '.join(prod_order_ids)} created!")
+            st.rerun()
+    with col2:
+        if st.button("Release all batches", key="release_all_batches", disabled=not rows):
+            prod_order_ids = store.release_production_runs(ready + held)
+            st.success(f"✅ Production Orders {', '.join(prod_order_ids)} created!")
+            st.rerun()
+
+def show_production_confirmation(data):
+    st.header("✅ Production Confirmation")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>Sprint 3 Objective:</strong> Convert planned orders into production orders and confirm accuracy of linkage.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    def undelivered(order):
+        return any(
+            sales_order and sales_order.status != "Delivered"
+            for sales_order in map(data.sales_order, order.sales_order_ids)
+        )
+    
+    # Only show completed orders that haven't been delivered yet
+    completed_orders = [order for order in data.production_orders if order.status == "Completed" and undelivered(order)]
+    
+    # Only show in-progress orders that haven't been delivered yet
+    in_progress_orders = [order for order in data.production_orders if order.status == "In Progress" and undelivered(order)]
+    
+    if completed_orders:
+        st.subheader("✅ Completed Production Orders")
+        
+        for order in completed_orders:
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown(f"""
+                <div class="success-message">
+                    <h4>✅ Production Order {order.id} - COMPLETED</h4>
+                    <p><strong>Product:</strong> {html.escape(order.product.name)}</p>
+                    <p><strong>Quantity Produced:</strong> {order.quantity}</p>
+                    <p><strong>Linked Sales Orders:</strong> {html.escape(format_allocations(order))}</p>
+                    <p><strong>Completion Date:</strong> {datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                for sales_order in map(data.sales_order, order.sales_order_ids):
+                    if not sales_order or sales_order.status != "In Production":
+                        continue
+                    # A sales order ships once every production run it is allocated to is done
+                    if not data.production_complete(sales_order):
+                        st.caption(f"Waiting on other production orders for {sales_order.id}")
+                    elif st.button(f"Confirm {sales_order.id} & Ready for Delivery", key=f"confirm_{order.id}_{sales_order.id}"):
+                        store.confirm_ready_for_delivery(sales_order.id)
+                        st.success("Order confirmed and ready for delivery!")
+                        st.rerun()
+    
+    if in_progress_orders:
+        st.subheader("🔄 Production Orders in Progress")
+        
+        for order in in_progress_orders:
+            st.markdown(f"""
+            <div class="status-card">
+                <h4>Production Order {order.id}</h4>
+                <p><strong>Product:</strong> {html.escape(order.product.name)}</p>
+                <p><strong>Progress:</strong> {order.completion_percentage}%</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            st.progress(order.completion_percentage / 100)
+    
+    if not completed_orders and not in_progress_orders:
+        st.info("No production orders to confirm. Start production orders first.")
+
+def show_delivery_billing(data):
+    st.header("🚚 Delivery & Billing Cycle")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>Sprint 4 Objective:</strong> Execute delivery and billing cycle to ensure customer satisfaction.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Orders ready for delivery
+    ready_orders = [order for order in data.sales_orders if order.status == "Ready for Delivery"]
+    
+    if ready_orders:
+        st.subheader("📦 Orders Ready for Delivery")
+        
+        for order in ready_orders:
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.markdown(f"""
+                <div class="process-card">
+                    <h4>Sales Order {order.id}</h4>
+                    <p><strong>Customer:</strong> {html.escape(order.customer_name)}</p>
+                    <p><strong>Products:</strong> {html.escape(order.product_names)}</p>
+                    <p><strong>Quantity:</strong> {order.quantity}</p>
+                    <p><strong>Total Amount:</strong> ${order.total_amount:.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                if st.button(f"Process Delivery", key=f"deliver_{order.id}"):
+                    # Create delivery record linked to the order's own production order
+                    delivery = store.create_delivery(order.id)
+                    
+                    if delivery:
+                        st.success(f"✅ Delivery {delivery.id} created! Tracking: {delivery.tracking_number}")
+                    st.rerun()
+    
+    # Billing section
+    delivered_orders = [order for order in data.sales_orders if order.status == "Delivered"]
+    
+    if delivered_orders:
+        st.subheader("💰 Billing & Invoicing")
+        
+        total_revenue = sum(order.total_amount for order in delivered_orders)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Orders Delivered", len(delivered_orders))
+        with col2:
+            st.metric("Total Revenue", f"${total_revenue:.2f}")
+        with col3:
+            avg_order = total_revenue / len(delivered_orders) if delivered_orders else 0
+            st.metric("Average Order Value", f"${avg_order:.2f}")
+        
+        # Invoice generation
+        st.subheader("📄 Generate Invoices")
+        
+        for order in delivered_orders:
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown(f"""
+                <div class="status-card">
+                    <h4>Invoice for Order {order.id}</h4>
+                    <p><strong>Customer:</strong> {html.escape(order.customer_name)}</p>
+                    <p><strong>Amount:</strong> ${order.total_amount:.2f}</p>
+                    <p><strong>Delivery Date:</strong> {datetime.datetime.now().strftime("%Y-%m-%d")}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                if st.button(f"Generate Invoice", key=f"invoice_{order.id}"):
+                    st.success(f"📄 Invoice INV-{order.id} generated!")
+    
+    # Delivery tracking
+    if data.deliveries:
+        st.subheader("📍 Delivery Tracking")
+        
+        delivery_data = []
+        for delivery in data.deliveries:
+            delivery_data.append({
+                "Delivery ID": delivery.id,
+                "Sales Order": delivery.sales_order_id,
+                "Tracking Number": delivery.tracking_number,
+                "Status": delivery.status,
+                "Delivery Date": delivery.delivery_date.strftime("%Y-%m-%d %H:%M")
+            })
+        
+        df = pd.DataFrame(delivery_data)
+        st.dataframe(df, use_container_width=True)
+
+def show_lead_times():
+    """Lead-time percentiles from the status transition log."""
+    st.subheader("⏱️ Lead Times")
+    
+    report = lead_times(store.load_status_history())
+    if report.by_stage.empty:
+        st.info("No completed stages yet. Lead times appear once orders move past \"Created\".")
+        return
+    
+    by_stage, by_product, by_category = st.tabs(["By Stage", "By Product", "By Product Category"])
+    with by_stage:
+        st.dataframe(report.by_stage, use_container_width=True)
+    with by_product:
+        st.dataframe(report.by_product, use_container_width=True)
+    with by_category:
+        st.dataframe(report.by_category, use_container_width=True)
+
+def show_order_search():
+    """Ranked full-text search over customers, products, tracking numbers and notes."""
+    st.subheader("🔎 Search Orders")
+    query = st.text_input("Search orders", placeholder="Customer, product, SO/PO/DEL id, TRK number or notes",
+                          key="order_search", label_visibility="collapsed")
+    if not query.strip():
+        return
+    results = store.search_orders(query)
+    if not results:
+        st.info(f"No orders match \"{query}\".")
+        return
+    # Result fields are HTML-escaped by the search module; only the <mark> tags are markup
+    for result in results:
+        details = " · ".join(value for value in (result.products, result.tracking, result.notes) if value)
+        st.markdown(f"**{result.ref}** — {result.customer}<br>"
+                    f"<small>{details}</small>", unsafe_allow_html=True)
+
+def show_audit_trail(data):
+    """Who changed an order's status or items, and when, from the audit log."""
+    st.subheader("🧾 Audit Trail")
+    order_ids = [order.id for order in reversed(data.sales_orders)]
+    sales_order_id = st.selectbox("Sales order", order_ids, key="audit_order")
+    entries = store.audit_trail(sales_order_id) if sales_order_id else []
+    if not entries:
+        st.info("No changes recorded for this order yet.")
+        return
+    st.dataframe(pd.DataFrame([{
+        "When": entry.at.strftime("%Y-%m-%d %H:%M:%S"),
+        "Record": entry.record,
+        "Change": entry.action,
+        "Detail": entry.detail,
+        "By": entry.actor,
+    } for entry in entries]), use_container_width=True)
+
+
+def show_report_job(job):
+    """Progress of a background report, then its download button."""
+    polling = not job.done
+    
+    # Only this fragment reruns while polling; the page reruns once when the report is ready
+    @st.fragment(run_every=1 if polling else None)
+    def report_status():
+        if not job.done:
+            st.progress(job.progress, text=f"Building {job.format.upper()} report: "
+                                           f"{job.rows_done} of {job.rows_total or '?'} records")
+        elif polling:
+            st.rerun()
+        elif job.error is not None:
+            st.error(f"Report failed: {job.error}")
+        else:
+            st.download_button(f"⬇️ Download {job.file_name}", job.data, file_name=job.file_name,
+                               mime=job.media_type, key="download_order_report")
+            st.caption(f"Report includes order tracking, production status, deliveries and sustainability "
+                       f"metrics ({len(job.data) / 1024:,.0f} KB). It is reused until the data changes.")
+    
+    report_status()
+
+
+def show_background_jobs():
+    """Jobs from the persistent queue (both UIs): progress, cancel and download."""
+    st.subheader("⚙️ Background Jobs")
+    
+    col1, col2 = st.columns([3, 1])
+    tasks = store.job_tasks()
+    with col1:
+        task = st.selectbox("Task", list(tasks), format_func=tasks.get, key="job_task", label_visibility="collapsed")
+    with col2:
+        if st.button("▶️ Start", key="start_job"):
+            store.enqueue_job(task)
+    
+    polling = any(job.active for job in store.recent_jobs())
+    
+    # Only this fragment reruns while jobs are active; the page reruns once they are all done
+    @st.fragment(run_every=2 if polling else None)
+    def job_rows():
+        jobs = store.recent_jobs()
+        if polling and not any(job.active for job in jobs):
+            st.rerun()
+        if not jobs:
+            st.caption("No background jobs yet.")
+        for job in jobs:
+            info, action = st.columns([4, 1])
+            with info:
+                summary = f"#{job.id} {job.label}: {job.status} (attempt {job.attempts}/{job.max_attempts})"
+                if job.status == "running":
+                    st.progress(job.progress / 100, text=f"{summary} {job.message}")
+                else:
+                    st.caption(summary + (f" - {job.error}" if job.error and job.status != "succeeded" else ""))
+            with action:
+                if job.active:
+                    if st.button("Cancel", key=f"cancel_job_{job.id}"):
+                        store.cancel_job(job.id)
+                        st.rerun(scope="fragment")
+                elif job.output_path is not None:
+                    # Read only when clicked, on Streamlit's own thread
+                    st.download_button("⬇️ Download", job.output_path.read_bytes, file_name=job.output_path.name,
+                                       key=f"download_job_{job.id}")
+    
+    job_rows()
+
+
+def show_summary_report(summary):
+    """Daily and monthly order report read from the summary tables."""
+    st.subheader("📅 Daily & Monthly Summary")
+    monthly, daily, by_product, by_stage = st.tabs(["Monthly", f"Last {store.REPORT_DAYS} Days", "By Product", "By Stage"])
+    money = {"revenue": "${:,.2f}", "sustainable_units": "{:,.1f}"}
+    with monthly:
+        st.dataframe(summary.monthly.style.format(money), use_container_width=True, hide_index=True)
+    with daily:
+        if not summary.daily.empty:
+            st.bar_chart(summary.daily.set_index("start")[["revenue"]])
+        st.dataframe(summary.daily.style.format(money), use_container_width=True, hide_index=True)
+    with by_product:
+        st.dataframe(summary.products.style.format(money), use_container_width=True, hide_index=True)
+    with by_stage:
+        st.dataframe(summary.stages.style.format({"revenue": "${:,.2f}"}), use_container_width=True, hide_index=True)
+    st.caption("Sustainable units = units x sustainability score. Stage counts are status changes per period; "
+               "revenue is the value of the sales orders that reached each stage.")
+
+
+def show_order_documentation(data):
+    st.header("📊 Order Documentation & Reports")
+    
+    st.markdown("""
+    <div class="info-box">
+        <strong>Final Documentation:</strong> Complete order tracking and comprehensive reporting for all manufacturing processes.
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Summary metrics from the materialized daily/monthly tables
+    st.subheader("📈 Order Summary")
+    summary = store.load_report_summary()
+    delivered_orders, total_revenue = summary.stage("SO", "Delivered")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Orders Created", summary.total_orders)
+    
+    with col2:
+        st.metric("Production Completed", summary.stage("PO", "Completed")[0])
+    
+    with col3:
+        st.metric("Orders Delivered", delivered_orders)
+    
+    with col4:
+        st.metric("Total Revenue", f"${total_revenue:.2f}")
+    show_summary_freshness(summary)
+    
+    # Complete order tracking table
+    if data.sales_orders:
+        st.subheader("📋 Complete Order Tracking")
+        
+        plan = store.production_plan(data)
+        tracking_data = []
+        for sales_order in data.sales_orders:
+            # Linked production orders and delivery via the snapshot's link index
+            prod_orders = data.production_orders_for(sales_order)
+            delivery = data.delivery(sales_order.delivery_id)
+            promised = data.promised_date(sales_order, plan)
+            
+            tracking_data.append({
+                "Sales Order": sales_order.id,
+                "Customer": sales_order.customer_name,
+                "Products": sales_order.product_names,
+                "Quantity": sales_order.quantity,
+                "Amount": f"${sales_order.total_amount:.2f}",
+                "Production Orders": ", ".join(po.id for po in prod_orders) if prod_orders else "Not Created",
+                "Production Status": ", ".join(sorted({po.status for po in prod_orders})) if prod_orders else "Pending",
+                "Promised Date": promised.strftime("%Y-%m-%d") if promised else "—",
+                "Delivery ID": delivery.id if delivery else "Not Shipped",
+                "Tracking Number": delivery.tracking_number if delivery else "N/A",
+                "Order Status": sales_order.status,
+                "Sustainability Score": f"{sales_order.sustainability_score:.0f}%"
+            })
+        
+        df = pd.DataFrame(tracking_data)
+        st.dataframe(df, use_container_width=True)
+        
+        show_order_search()
+        
+        show_audit_trail(data)
+        
+        show_lead_times()
+        
+        show_summary_report(summary)
+        
+        # Export functionality
+        st.subheader("📥 Export Documentation")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            report_format = st.radio("Report format", ["HTML", "PDF"], horizontal=True, key="report_format")
+            if st.button("📄 Generate Order Report"):
+                # Built by a background worker; this rerun only starts (or reuses) the job
+                st.session_state["order_report"] = reports.request_report(report_format.lower())
+            if "order_report" in st.session_state:
+                show_report_job(st.session_state["order_report"])
+        
+        with col2:
+            if st.button("📊 Export to CSV"):
+                # Runs on the background job queue; progress and the file show up under Background Jobs
+                store.enqueue_job("export_orders_csv")
+        
+        show_background_jobs()
+    
+    else:
+        st.info("No orders available for documentation. Create some orders to see the complete tracking system.")
+    
+    # Process completion status
+    st.subheader("✅ Process Completion Status")
+    
+    if data.sales_orders:
+        completion_stages = {
+            "Orders Created": len(data.sales_orders),
+            "Production Started": len([o for o in data.production_orders if o.status in ["In Progress", "Completed"]]),
+            "Production Completed": len([o for o in data.production_orders if o.status == "Completed"]),
+            "Orders Delivered": len([o for o in data.sales_orders if o.status == "Delivered"])
+        }
+        
+        for stage, count in completion_stages.items():
+            progress = (count / len(data.sales_orders)) * 100 if data.sales_orders else 0
+            st.markdown(f"**{stage}:** {count}/{len(data.sales_orders)} ({progress:.1f}%)")
+            st.progress(progress / 100)
+    
+    st.success("📋 Order documentation system is fully operational and ready for production use!")
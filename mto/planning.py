@@ -0,0 +1,248 @@
+"""Finite-capacity production planning: planned start/finish per production order.
+
+Each work center runs ``lines`` identical machines and processes its queue in
+priority order (runs already in progress first, then by release time). A run
+starts on the line that frees up first, after a changeover setup when that line
+last made a different product. A sales order's promised date is the finish of its
+last production run plus the shipping lead time.
+
+The planner keeps, per work center, the sorted queue and the line state before
+every position. ``sync`` diffs the incoming queue against the last one and
+re-plans each changed work center only from the first changed position, stopping
+as soon as the line state matches the previous plan again, so a rerun where one
+order changed costs a handful of dispatches instead of a full recompute.
+
+Run ``python -m mto.planning`` for a timing benchmark.
+"""
+import argparse
+import bisect
+import datetime
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(frozen=True)
+class WorkCenter:
+    id: str
+    lines: int = 1
+    setup: datetime.timedelta = datetime.timedelta(0)  # changeover between products
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    work_center_id: str
+    product_id: str
+    duration: datetime.timedelta  # remaining processing time
+    release: datetime.datetime  # earliest start
+    started: bool = False  # already running: goes first, no setup
+
+    @property
+    def sort_key(self):
+        return (not self.started, self.release, self.id)
+
+
+@dataclass(frozen=True)
+class PlannedJob:
+    job_id: str
+    work_center_id: str
+    line: int
+    start: datetime.datetime
+    finish: datetime.datetime
+
+
+# Line state: (free at, last product) per line of a work center
+LineState = Tuple[Tuple[datetime.datetime, Optional[str]], ...]
+
+
+class _Queue:
+    """Dispatch order and line-state checkpoints for one work center."""
+
+    def __init__(self, work_center: WorkCenter, origin: datetime.datetime):
+        self.work_center = work_center
+        self.keys: List[tuple] = []
+        self.jobs: Dict[str, Job] = {}
+        self.results: List[Optional[PlannedJob]] = []
+        # checkpoints[i] is the line state before keys[i]; the last one is the final state
+        self.checkpoints: List[Optional[LineState]] = [((origin, None),) * work_center.lines]
+        self.dirty_from: Optional[int] = None
+        self.dirty: Set[str] = set()
+
+    def _touch(self, position):
+        self.dirty_from = position if self.dirty_from is None else min(self.dirty_from, position)
+
+    def remove(self, job_id):
+        job = self.jobs.pop(job_id)
+        position = bisect.bisect_left(self.keys, job.sort_key)
+        del self.keys[position], self.results[position], self.checkpoints[position + 1]
+        self.dirty.discard(job_id)
+        if position < len(self.keys):
+            self.dirty.add(self.keys[position][2])  # its successor now starts from different lines
+        self._touch(position)
+
+    def insert(self, job):
+        key = job.sort_key
+        position = bisect.bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.results.insert(position, None)
+        self.checkpoints.insert(position + 1, None)
+        self.jobs[job.id] = job
+        self.dirty.add(job.id)
+        self._touch(position)
+
+    def replan(self, changed: Set[str]):
+        if self.dirty_from is None:
+            return
+        setup = self.work_center.setup
+        dirty = self.dirty
+        for position in range(self.dirty_from, len(self.keys)):
+            job = self.jobs[self.keys[position][2]]
+            lines = self.checkpoints[position]
+            best = None
+            for line, (free_at, last_product) in enumerate(lines):
+                start = max(free_at, job.release)
+                if not job.started and last_product not in (None, job.product_id):
+                    start = max(free_at + setup, job.release)
+                if best is None or start < best[1]:
+                    best = (line, start)
+            line, start = best
+            finish = start + job.duration
+            planned = PlannedJob(job.id, self.work_center.id, line, start, finish)
+            if planned != self.results[position]:
+                self.results[position] = planned
+                changed.add(job.id)
+            state = lines[:line] + ((finish, job.product_id),) + lines[line + 1:]
+            dirty.discard(job.id)
+            previous, self.checkpoints[position + 1] = self.checkpoints[position + 1], state
+            if not dirty and previous == state:
+                break  # the rest of the queue sees the same lines as last time
+        self.dirty_from = None
+
+
+class CapacityPlanner:
+    """Incremental finite-capacity planner; safe to share between Streamlit sessions."""
+
+    def __init__(self, shipping_lead_time: datetime.timedelta = datetime.timedelta(days=1)):
+        self.shipping_lead_time = shipping_lead_time
+        self._origin = None
+        self._work_centers: Dict[str, WorkCenter] = {}
+        self._queues: Dict[str, _Queue] = {}
+        self._planned: Dict[str, PlannedJob] = {}
+        self._lock = threading.Lock()
+
+    def sync(self, work_centers: Iterable[WorkCenter], jobs: Iterable[Job],
+             origin: datetime.datetime) -> "Plan":
+        """Bring the plan in line with the current queue; plan nothing before ``origin``.
+
+        Changing ``origin`` or the work centers re-plans everything; otherwise only the
+        jobs that were added, removed or changed since the last call are re-dispatched.
+        """
+        work_centers = {work_center.id: work_center for work_center in work_centers}
+        with self._lock:
+            if origin != self._origin or work_centers != self._work_centers:
+                self._origin, self._work_centers = origin, work_centers
+                self._queues = {}
+                self._planned = {}
+
+            incoming: Dict[str, Dict[str, Job]] = {wc_id: {} for wc_id in self._queues}
+            for job in jobs:
+                incoming.setdefault(job.work_center_id, {})[job.id] = job
+
+            # Drop every removed or changed job first, so a job moving between work
+            # centers is re-planned on the new one after it has left the old one
+            changed: Set[str] = set()
+            dropped: Dict[str, Optional[PlannedJob]] = {}
+            for wc_id, wanted in incoming.items():
+                queue = self._queues.get(wc_id)
+                if queue is None:
+                    queue = self._queues[wc_id] = _Queue(work_centers[wc_id], origin)
+                current = queue.jobs
+                for job_id in [job_id for job_id in current if wanted.get(job_id) != current[job_id]]:
+                    queue.remove(job_id)
+                    dropped[job_id] = self._planned.pop(job_id, None)
+
+            for wc_id, wanted in incoming.items():
+                queue = self._queues[wc_id]
+                for job_id, job in wanted.items():
+                    if job_id not in queue.jobs:
+                        queue.insert(job)
+                replanned: Set[str] = set()
+                queue.replan(replanned)
+                for job_id in replanned:
+                    self._planned[job_id] = queue.results[bisect.bisect_left(queue.keys, queue.jobs[job_id].sort_key)]
+                changed |= replanned
+            # An edited job (say, its priority) may well land on the same times again
+            changed = {job_id for job_id in changed | dropped.keys()
+                       if job_id not in dropped or self._planned.get(job_id) != dropped[job_id]}
+            return Plan(dict(self._planned), changed, self.shipping_lead_time)
+
+
+@dataclass(frozen=True)
+class Plan:
+    planned: Dict[str, PlannedJob]
+    changed: Set[str]  # job ids whose planned times changed (or were dropped) in this sync
+    shipping_lead_time: datetime.timedelta
+
+    def get(self, job_id) -> Optional[PlannedJob]:
+        return self.planned.get(job_id)
+
+    def promised_date(self, job_ids) -> Optional[datetime.datetime]:
+        """Finish of the last of ``job_ids`` plus shipping; None while any is unplanned."""
+        finishes = [self.planned[job_id].finish for job_id in job_ids if job_id in self.planned]
+        if not finishes or len(finishes) != len(job_ids):
+            return None
+        return max(finishes) + self.shipping_lead_time
+
+
+def _random_queue(orders, work_centers, products, rng, origin):
+    return [
+        Job(
+            f"PO{number:06d}",
+            rng.choice(work_centers).id,
+            rng.choice(products),
+            datetime.timedelta(minutes=rng.randint(30, 600)),
+            origin + datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+        )
+        for number in range(1, orders + 1)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--work-centers", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--updates", type=int, default=200, help="Single-order changes to re-plan.")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    origin = datetime.datetime(2025, 1, 1)
+    work_centers = [WorkCenter(f"WC{index}", args.lines, datetime.timedelta(minutes=45))
+                    for index in range(1, args.work_centers + 1)]
+    products = [f"PKG{index:03d}" for index in range(1, 7)]
+    jobs = {job.id: job for job in _random_queue(args.orders, work_centers, products, rng, origin)}
+
+    planner = CapacityPlanner()
+    started = time.perf_counter()
+    plan = planner.sync(work_centers, jobs.values(), origin)
+    full = time.perf_counter() - started
+    print(f"{args.orders} orders on {args.work_centers} work centers x {args.lines} lines")
+    print(f"  full plan:   {full * 1000:.1f} ms, last finish {max(p.finish for p in plan.planned.values())}")
+
+    started = time.perf_counter()
+    replanned = 0
+    for _ in range(args.updates):
+        job = jobs[rng.choice(list(jobs))]
+        jobs[job.id] = Job(job.id, job.work_center_id, job.product_id,
+                           job.duration * rng.uniform(0.5, 1.5), job.release)
+        replanned += len(planner.sync(work_centers, jobs.values(), origin).changed)
+    incremental = (time.perf_counter() - started) / args.updates
+    print(f"  incremental: {incremental * 1000:.2f} ms per changed order "
+          f"({replanned / args.updates:.0f} runs re-timed on average)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Order report files (HTML or PDF) built in the background.
+
+``request_report`` returns a ``ReportJob`` at once and a small thread pool builds
+the file: order tracking, production status, deliveries and sustainability
+figures, read from the store a chunk at a time. Each chunk is one short call on
+the store's DB thread, so page reruns keep getting their queries through while a
+large report is being built. Finished reports are kept per data revision, so
+asking again before anything changes returns the same file without rebuilding.
+"""
+import datetime
+import hashlib
+import html
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from . import store
+from .pdf import PAGE_LINES, PdfWriter
+
+TITLE = "Make-to-Order Order Report"
+# Rows per store call; small enough that other DB work interleaves between chunks
+CHUNK_SIZE = 500
+# Reports kept for download (most recently requested first)
+CACHED_REPORTS = 8
+
+
+@dataclass(frozen=True)
+class Column:
+    heading: str
+    width: int  # characters in the PDF table
+    format: Callable = str
+    numeric: bool = False
+
+
+def _date(value):
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+def _percent(value):
+    return f"{value:.0f}%"
+
+
+ORDER_COLUMNS = [
+    Column("Sales Order", 11), Column("Date", 10, _date), Column("Customer", 18), Column("Products", 27),
+    Column("Units", 6, numeric=True), Column("Amount", 11, _money, True), Column("Sustain.", 8, _percent, True),
+    Column("Production Orders", 18), Column("Production Status", 18), Column("Delivery", 8),
+    Column("Tracking", 12), Column("Status", 18),
+]
+PRODUCTION_COLUMNS = [
+    Column("Production Order", 16), Column("Product", 30), Column("Units", 6, numeric=True),
+    Column("Start", 10, _date), Column("Status", 12), Column("Complete", 8, _percent, True),
+    Column("Sales Orders", 80),
+]
+DELIVERY_COLUMNS = [
+    Column("Delivery", 8), Column("Sales Order", 11), Column("Customer", 30), Column("Date", 10, _date),
+    Column("Status", 12), Column("Tracking", 14),
+]
+SUMMARY_COLUMNS = [
+    Column("Orders", 8, numeric=True), Column("Units", 8, numeric=True), Column("Revenue", 14, _money, True),
+    Column("Sustainable Units", 17, lambda value: f"{value:,.1f}", True), Column("Avg Score", 9, _percent, True),
+]
+MONTH_COLUMNS = [Column("Month", 7, lambda value: value.strftime("%Y-%m")), *SUMMARY_COLUMNS]
+PRODUCT_COLUMNS = [Column("SKU", 8), Column("Product", 30), Column("Category", 16), *SUMMARY_COLUMNS]
+
+# (title, columns, store reader returning (last pk, rows) per chunk)
+SECTIONS = [
+    ("Order Tracking", ORDER_COLUMNS, store.order_report_chunk),
+    ("Production Status", PRODUCTION_COLUMNS, store.production_report_chunk),
+    ("Deliveries", DELIVERY_COLUMNS, store.delivery_report_chunk),
+]
+
+
+def _cells(columns, row):
+    return ["" if value is None else column.format(value) for column, value in zip(columns, row)]
+
+
+class HtmlReport:
+    """Self-contained, printable HTML document written section by section."""
+
+    media_type = "text/html"
+    extension = "html"
+
+    def __init__(self, title, subtitle):
+        self._out = io.StringIO()
+        self._columns = None
+        self._out.write(
+            "<!DOCTYPE html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title><style>"
+            "body{font:13px system-ui,sans-serif;margin:2em;color:#222}"
+            "table{border-collapse:collapse;width:100%;margin-bottom:2em}"
+            "th,td{border:1px solid #ccc;padding:3px 6px;text-align:left;vertical-align:top}"
+            "th{background:#2e7d32;color:#fff}td.n{text-align:right}tr:nth-child(even){background:#f5f9f5}"
+            "@media print{th{background:#ddd;color:#000}}"
+            f"</style></head><body><h1>{html.escape(title)}</h1><p>{html.escape(subtitle)}</p>\n"
+        )
+
+    def section(self, title, columns):
+        self._end_table()
+        self._columns = columns
+        headings = "".join(f"<th>{html.escape(column.heading)}</th>" for column in columns)
+        self._out.write(f"<h2>{html.escape(title)}</h2>\n<table><thead><tr>{headings}</tr></thead><tbody>\n")
+
+    def rows(self, rows):
+        write = self._out.write
+        numeric = [column.numeric for column in self._columns]
+        for row in rows:
+            write("<tr>" + "".join(
+                f"<td class=\"n\">{html.escape(cell)}</td>" if is_numeric else f"<td>{html.escape(cell)}</td>"
+                for cell, is_numeric in zip(_cells(self._columns, row), numeric)
+            ) + "</tr>\n")
+
+    def close(self):
+        self._end_table()
+        self._out.write("</body></html>\n")
+        return self._out.getvalue().encode("utf-8")
+
+    def _end_table(self):
+        if self._columns is not None:
+            self._out.write("</tbody></table>\n")
+            self._columns = None
+
+
+class PdfReport:
+    """Landscape text tables; the column headings repeat at the top of every page."""
+
+    media_type = "application/pdf"
+    extension = "pdf"
+
+    def __init__(self, title, subtitle):
+        self._pdf = PdfWriter()
+        self._columns = None
+        self._pdf.line(title, bold=True)
+        self._pdf.line(subtitle)
+
+    def section(self, title, columns):
+        if self._pdf.lines_left() < 6:
+            self._pdf.page_break()
+        self._columns = columns
+        self._pdf.line()
+        self._pdf.line(title.upper(), bold=True)
+        self._heading()
+
+    def rows(self, rows):
+        for row in rows:
+            if self._pdf.lines_left() == PAGE_LINES:  # top of a new page
+                self._heading()
+            self._pdf.line(self._format(_cells(self._columns, row)))
+
+    def close(self):
+        return self._pdf.close()
+
+    def _heading(self):
+        self._pdf.line(self._format([column.heading for column in self._columns]), bold=True)
+        self._pdf.line(" ".join("-" * column.width for column in self._columns))
+
+    def _format(self, cells):
+        return " ".join(
+            (cell[:column.width].rjust if column.numeric else cell[:column.width].ljust)(column.width)
+            for column, cell in zip(self._columns, cells)
+        )
+
+
+FORMATS = {"html": HtmlReport, "pdf": PdfReport}
+
+
+class ReportJob:
+    """One report being built (or built) for one data revision."""
+
+    def __init__(self, report_format, revision):
+        self.format = report_format
+        self.revision = revision
+        self.requested_at = datetime.datetime.now()
+        self.rows_done = 0
+        self.rows_total = 0
+        self.future = None
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    @property
+    def progress(self) -> float:
+        if self.done:
+            return 1.0
+        return min(self.rows_done / self.rows_total, 0.99) if self.rows_total else 0.0
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self.future.exception() if self.done else None
+
+    @property
+    def data(self) -> bytes:
+        return self.future.result()
+
+    @property
+    def media_type(self) -> str:
+        return FORMATS[self.format].media_type
+
+    @property
+    def file_name(self) -> str:
+        return f"order-report-{self.requested_at:%Y%m%d-%H%M%S}.{FORMATS[self.format].extension}"
+
+
+def _summary_rows(frame, key_columns):
+    units = frame["units"].where(frame["units"] > 0)
+    scores = (frame["sustainable_units"] / units * 100).fillna(0.0)
+    return zip(*(frame[name] for name in key_columns), frame["orders"], frame["units"], frame["revenue"],
+               frame["sustainable_units"], scores)
+
+
+def _build(job):
+    job.rows_total = sum(store.report_counts())
+    revision = hashlib.blake2b(repr(job.revision).encode(), digest_size=4).hexdigest()
+    report = FORMATS[job.format](
+        TITLE, f"Generated {datetime.datetime.now():%Y-%m-%d %H:%M} (data revision {revision})",
+    )
+    for title, columns, read_chunk in SECTIONS:
+        report.section(title, columns)
+        after = 0
+        while True:
+            after, rows = read_chunk(after, CHUNK_SIZE)
+            if not rows:
+                break
+            report.rows(rows)
+            job.rows_done += len(rows)
+
+    summary = store.load_report_summary()
+    report.section("Sustainability by Month", MONTH_COLUMNS)
+    report.rows(_summary_rows(summary.monthly, ["start"]))
+    report.section("Sustainability by Product", PRODUCT_COLUMNS)
+    report.rows(_summary_rows(summary.products, ["product", "name", "category"]))
+    return report.close()
+
+
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mto-report")
+_jobs: "OrderedDict[tuple, ReportJob]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def request_report(report_format: str) -> ReportJob:
+    """Start a report of the current data, or return the one already built or building for it."""
+    revision = store.report_revision()
+    key = (report_format, revision)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.error is None:
+            _jobs.move_to_end(key)
+            return job
+        job = _jobs[key] = ReportJob(report_format, revision)
+        job.future = _pool.submit(_build, job)
+        while len(_jobs) > CACHED_REPORTS:
+            _jobs.popitem(last=False)
+    return job
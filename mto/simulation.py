@@ -0,0 +1,325 @@
+"""Headless discrete-event simulation of the sales -> production -> delivery flow.
+
+Orders arrive as a Poisson stream and move through the same store functions the
+Streamlit pages call: ``create_sales_order``, batched ``release_production_runs``,
+``start_production``/``advance_production`` on finite work-center lines,
+``confirm_ready_for_delivery`` and ``create_delivery``. Events sit in a heap keyed
+by simulated time, so a year of orders runs as fast as the store can write.
+
+The run uses a scratch SQLite database (``SPK_DATABASE_PATH``) and audit log
+(``SPK_AUDIT_LOG_DIR``), never the shared ones, and reports throughput, WIP and per-stage lead-time percentiles in simulated
+time plus the wall-clock latency of every store call, which makes it a benchmark
+for the order-store hot paths as well::
+
+    python -m mto.simulation --days 365 --orders-per-day 20 --page-views-per-day 1
+"""
+import argparse
+import datetime
+import heapq
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from .batching import BatchPolicy, BatchScheduler, Demand
+
+START = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+HOUR = datetime.timedelta(hours=1)
+
+# Stage boundaries recorded per sales order, in flow order
+STAGES = ["created", "released", "produced", "confirmed", "delivered"]
+
+
+@dataclass
+class SimulationConfig:
+    days: float = 365
+    orders_per_day: float = 20
+    max_lines: int = 3
+    max_quantity: int = 200
+    batch_policy: BatchPolicy = BatchPolicy()
+    release_interval: datetime.timedelta = HOUR  # how often due batches are released
+    confirm_hours: float = 2  # mean QA/confirmation delay after the last run completes
+    ship_hours: float = 6  # mean delay from ready-for-delivery to shipment
+    page_views_per_day: float = 0  # full load_snapshot reads, as the Streamlit pages do
+    seed: int = 0
+
+
+@dataclass
+class _Order:
+    id: str
+    open_runs: int = 0
+    fully_released: bool = False
+    stamps: Dict[str, datetime.datetime] = field(default_factory=dict)
+
+
+class Simulator:
+    def __init__(self, config: SimulationConfig, store):
+        self.config = config
+        self.store = store
+        self.rng = random.Random(config.seed)
+        self.now = START
+        self.events = []
+        self._sequence = itertools.count()
+        self.orders: Dict[str, _Order] = {}
+        self.unreleased: Dict[str, int] = {}  # sales order id -> units not yet in a run
+        self.run_orders: Dict[str, List[str]] = {}  # production order id -> sales order ids
+        self.scheduler = BatchScheduler(config.batch_policy)
+        self.call_seconds = defaultdict(list)
+        self.wip_area = 0.0  # order-hours in the system, for time-weighted WIP
+        self.wip = 0
+        self.max_wip = 0
+
+        # Setup reads (and the first-call migrate) stay out of the timings
+        products = store.list_products()
+        snapshot = store.load_snapshot()
+        self.products = [product for product in products if product.work_center_id] or products
+        self.work_centers = dict(snapshot.work_centers)
+        # Free-at time per line, and FIFO of runs waiting, per work center
+        self.lines = {}
+        self.waiting = defaultdict(list)
+
+    # Store calls are timed: that is the benchmark half of the simulation
+    def _call(self, name, *args):
+        started = time.perf_counter()
+        result = getattr(self.store, name)(*args)
+        self.call_seconds[name].append(time.perf_counter() - started)
+        return result
+
+    def schedule(self, at, kind, *payload):
+        heapq.heappush(self.events, (at, next(self._sequence), kind, payload))
+
+    def run(self):
+        config = self.config
+        end = START + datetime.timedelta(days=config.days)
+        self.schedule(self._next_arrival(), "arrival")
+        self.schedule(START + config.release_interval, "release")
+        if config.page_views_per_day:
+            self.schedule(START + datetime.timedelta(days=1 / config.page_views_per_day), "page_view")
+
+        handlers = {
+            "arrival": self.on_arrival,
+            "release": self.on_release,
+            "run_finished": self.on_run_finished,
+            "confirm": self.on_confirm,
+            "ship": self.on_ship,
+            "page_view": self.on_page_view,
+        }
+        started = time.perf_counter()
+        while self.events:
+            at, _, kind, payload = heapq.heappop(self.events)
+            # Arrivals and page views stop at the horizon; everything in flight drains
+            if at > end and kind in ("arrival", "page_view"):
+                continue
+            if at > end and kind == "release" and not self.scheduler.open_batches():
+                continue
+            self._advance_clock(at)
+            handlers[kind](*payload)
+        return self.report(time.perf_counter() - started)
+
+    def _advance_clock(self, at):
+        self.wip_area += self.wip * (at - self.now) / HOUR
+        self.now = at
+
+    def _next_arrival(self):
+        return self.now + datetime.timedelta(days=self.rng.expovariate(self.config.orders_per_day))
+
+    def _exponential(self, mean_hours):
+        return datetime.timedelta(hours=self.rng.expovariate(1 / mean_hours)) if mean_hours else datetime.timedelta(0)
+
+    def on_arrival(self):
+        config = self.config
+        products = self.rng.sample(self.products, min(len(self.products), self.rng.randint(1, config.max_lines)))
+        lines = [(product.id, self.rng.randint(1, config.max_quantity)) for product in products]
+        order_id = self._call("create_sales_order", f"Sim customer {self.rng.randint(1, 500)}", lines)
+
+        order = self.orders[order_id] = _Order(order_id, stamps={"created": self.now})
+        self.unreleased[order_id] = sum(quantity for _, quantity in lines)
+        self.wip += 1
+        self.max_wip = max(self.max_wip, self.wip)
+        for product_id, quantity in lines:
+            self._release(self.scheduler.add(Demand(order.id, product_id, quantity, self.now)))
+        self.schedule(self._next_arrival(), "arrival")
+
+    def on_release(self):
+        self._release(self.scheduler.due(self.now))
+        self.schedule(self.now + self.config.release_interval, "release")
+
+    def _release(self, batches):
+        if not batches:
+            return
+        run_ids = self._call("release_production_runs", batches)
+        for run_id, batch in zip(run_ids, batches):
+            self.run_orders[run_id] = list(batch.allocations)
+            for order_id, quantity in batch.allocations.items():
+                order = self.orders[order_id]
+                order.open_runs += 1
+                self.unreleased[order_id] -= quantity
+                if not self.unreleased[order_id]:
+                    del self.unreleased[order_id]
+                    order.fully_released = True
+                    order.stamps["released"] = self.now
+            product = next(product for product in self.products if product.id == batch.product_id)
+            self._enqueue(run_id, product, batch.quantity)
+
+    def _enqueue(self, run_id, product, quantity):
+        work_center = self.work_centers.get(product.work_center_id)
+        lines = self.lines.setdefault(product.work_center_id, [self.now] * (work_center.lines if work_center else 1))
+        duration = datetime.timedelta(seconds=quantity * product.cycle_seconds)
+        self.waiting[product.work_center_id].append((run_id, duration))
+        self._dispatch(product.work_center_id, lines)
+
+    def _dispatch(self, work_center_id, lines):
+        queue = self.waiting[work_center_id]
+        setup = self.work_centers[work_center_id].setup if work_center_id in self.work_centers else datetime.timedelta(0)
+        while queue:
+            line = min(range(len(lines)), key=lines.__getitem__)
+            if lines[line] > self.now:
+                return  # every line busy; run_finished dispatches the next one
+            run_id, duration = queue.pop(0)
+            self._call("start_production", run_id)
+            lines[line] = self.now + setup + duration
+            self.schedule(lines[line], "run_finished", run_id, work_center_id)
+
+    def on_run_finished(self, run_id, work_center_id):
+        # start_production records 25%; the run completes with the remaining 75%
+        self._call("advance_production", run_id, 75)
+        for order_id in self.run_orders.pop(run_id):
+            order = self.orders[order_id]
+            order.open_runs -= 1
+            if order.fully_released and not order.open_runs:
+                order.stamps["produced"] = self.now
+                self.schedule(self.now + self._exponential(self.config.confirm_hours), "confirm", order_id)
+        self._dispatch(work_center_id, self.lines[work_center_id])
+
+    def on_confirm(self, order_id):
+        if self._call("confirm_ready_for_delivery", order_id):
+            self.orders[order_id].stamps["confirmed"] = self.now
+            self.schedule(self.now + self._exponential(self.config.ship_hours), "ship", order_id)
+
+    def on_ship(self, order_id):
+        if self._call("create_delivery", order_id) is not None:
+            self.orders[order_id].stamps["delivered"] = self.now
+            self.wip -= 1
+
+    def on_page_view(self):
+        self._call("load_snapshot")
+        self.schedule(self.now + datetime.timedelta(days=1 / self.config.page_views_per_day), "page_view")
+
+    def report(self, wall_seconds):
+        stamps = pd.DataFrame([order.stamps for order in self.orders.values()], columns=STAGES).apply(pd.to_datetime, utc=True)
+        hours = pd.DataFrame({
+            f"{start} -> {end}": (stamps[end] - stamps[start]).dt.total_seconds() / 3600
+            for start, end in zip(STAGES, STAGES[1:])
+        })
+        hours["total"] = (stamps["delivered"] - stamps["created"]).dt.total_seconds() / 3600
+        lead_times = hours.quantile([0.5, 0.9, 0.95, 0.99]).T
+        lead_times.columns = ["p50", "p90", "p95", "p99"]
+        lead_times["mean"] = hours.mean()
+
+        simulated_days = (self.now - START) / datetime.timedelta(days=1)
+        delivered = int(stamps["delivered"].notna().sum())
+        calls = pd.DataFrame([
+            {
+                "call": name,
+                "count": len(seconds),
+                "total_s": sum(seconds),
+                "p50_ms": pd.Series(seconds).quantile(0.5) * 1000,
+                "p99_ms": pd.Series(seconds).quantile(0.99) * 1000,
+            }
+            for name, seconds in sorted(self.call_seconds.items())
+        ]).set_index("call")
+        return {
+            "simulated_days": simulated_days,
+            "orders": len(self.orders),
+            "delivered": delivered,
+            "throughput_per_day": delivered / simulated_days if simulated_days else 0.0,
+            "mean_wip": self.wip_area / (simulated_days * 24) if simulated_days else 0.0,
+            "max_wip": self.max_wip,
+            "production_runs": len(self.call_seconds["start_production"]),
+            "lead_time_hours": lead_times,
+            "store_calls": calls,
+            "wall_seconds": wall_seconds,
+            "engine_seconds": wall_seconds - calls["total_s"].sum(),
+        }
+
+
+def simulate(config: SimulationConfig, database=None):
+    """Run ``config`` against a scratch database and return the report dict.
+
+    The store reads ``SPK_DATABASE_PATH`` and ``SPK_AUDIT_LOG_DIR`` when it first
+    touches Django, so this has to run before anything else in the process uses
+    ``mto.store``. An explicit ``database`` keeps its audit log next to it.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SPK_DATABASE_PATH"] = str(database or Path(tmp) / "simulation.sqlite3")
+        os.environ["SPK_AUDIT_LOG_DIR"] = f"{database}-audit" if database else str(Path(tmp) / "audit_log")
+        # A scratch database can run with the deployment PRAGMAs (WAL) the benchmark is about
+        os.environ.setdefault("SPK_SQLITE_PROFILE", "production")
+        from . import store
+        simulator = Simulator(config, store)
+        try:
+            return simulator.run()
+        finally:
+            store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=365)
+    parser.add_argument("--orders-per-day", type=float, default=20)
+    parser.add_argument("--max-lines", type=int, default=3)
+    parser.add_argument("--max-quantity", type=int, default=200)
+    parser.add_argument("--max-batch", type=int, default=1000)
+    parser.add_argument("--window-hours", type=float, default=8)
+    parser.add_argument("--release-interval-hours", type=float, default=1)
+    parser.add_argument("--confirm-hours", type=float, default=2)
+    parser.add_argument("--ship-hours", type=float, default=6)
+    parser.add_argument("--page-views-per-day", type=float, default=0,
+                        help="Also benchmark the read path with this many load_snapshot calls per day.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database", help="SQLite file to simulate into (default: a temporary file).")
+    parser.add_argument("--json", help="Also write the report to this JSON file.")
+    args = parser.parse_args(argv)
+
+    config = SimulationConfig(
+        days=args.days,
+        orders_per_day=args.orders_per_day,
+        max_lines=args.max_lines,
+        max_quantity=args.max_quantity,
+        batch_policy=BatchPolicy(args.max_batch, datetime.timedelta(hours=args.window_hours)),
+        release_interval=datetime.timedelta(hours=args.release_interval_hours),
+        confirm_hours=args.confirm_hours,
+        ship_hours=args.ship_hours,
+        page_views_per_day=args.page_views_per_day,
+        seed=args.seed,
+    )
+    result = simulate(config, args.database)
+
+    print(f"{result['orders']} orders over {result['simulated_days']:.0f} simulated days "
+          f"in {result['wall_seconds']:.1f}s wall clock ({result['engine_seconds']:.1f}s outside the store)")
+    print(f"  throughput: {result['throughput_per_day']:.1f} deliveries/day "
+          f"({result['delivered']} delivered, {result['production_runs']} production runs)")
+    print(f"  WIP:        {result['mean_wip']:.1f} orders on average, {result['max_wip']} max")
+    print("\nLead time (hours)")
+    print(result["lead_time_hours"].round(1).to_string())
+    print("\nStore calls (wall clock)")
+    print(result["store_calls"].round(3).to_string())
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            **result,
+            "lead_time_hours": result["lead_time_hours"].round(3).to_dict(orient="index"),
+            "store_calls": result["store_calls"].round(6).to_dict(orient="index"),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
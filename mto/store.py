@@ -0,0 +1,926 @@
+"""Data access layer between the Streamlit MTO app and the Django ``orders`` models.
+
+The Streamlit pages read and write the same ``Product``/``Order``/``OrderItem``/
+``ProductionOrder``/``Delivery`` tables as the Django app. All ORM calls run on one
+long-lived worker thread, so the Django connection is opened once per process and
+reused across reruns instead of once per script-run thread.
+"""
+import datetime
+import os
+import sys
+import uuid
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from . import planning
+from .batching import Batch, Demand
+
+DJANGO_PROJECT_DIR = Path(__file__).resolve().parent.parent / "SPK" / "SPKenv"
+
+# Data models (read-side views of the ORM rows, as used by the Streamlit pages)
+@dataclass(frozen=True)  # shared across sessions by mto.catalog
+class Product:
+    id: str
+    name: str
+    category: str
+    price: float
+    sustainability_score: int
+    work_center_id: Optional[str] = None
+    cycle_seconds: int = 60  # per unit
+
+@dataclass
+class SalesOrderLine:
+    product: Product
+    quantity: int
+    line_total: float
+
+@dataclass
+class SalesOrder:
+    id: str
+    customer_name: str
+    lines: List[SalesOrderLine]
+    order_date: datetime.datetime
+    status: str
+    total_amount: float
+    quantity: int  # units across all lines
+    sustainability_score: float  # quantity-weighted over the lines
+    production_order_ids: List[str] = field(default_factory=list)
+    delivery_id: Optional[str] = None
+    customer_id: Optional[int] = None  # orders.Customer pk; None for unnamed legacy rows
+
+    @property
+    def product_names(self):
+        return ", ".join(line.product.name for line in self.lines)
+
+@dataclass
+class ProductionOrder:
+    id: str
+    product: Product
+    quantity: int
+    start_date: datetime.datetime
+    status: str
+    completion_percentage: int
+    allocations: Dict[str, int] = field(default_factory=dict)  # sales order id -> quantity
+
+    @property
+    def sales_order_ids(self):
+        return list(self.allocations)
+
+@dataclass
+class Delivery:
+    id: str
+    sales_order_id: str
+    delivery_date: datetime.datetime
+    status: str
+    tracking_number: str
+
+@dataclass
+class Snapshot:
+    """One page's worth of orders with an id index over every SO <-> PO <-> Delivery hop.
+
+    Each record carries the ids of the records it links to, and the ``*_by_id`` dicts
+    resolve those ids, so every hop is a dict lookup instead of a list scan.
+    """
+    sales_orders: List[SalesOrder]
+    production_orders: List[ProductionOrder]
+    deliveries: List[Delivery]
+    sales_orders_by_id: Dict[str, SalesOrder]
+    production_orders_by_id: Dict[str, ProductionOrder]
+    deliveries_by_id: Dict[str, Delivery]
+    work_centers: Dict[str, planning.WorkCenter] = field(default_factory=dict)
+
+    def sales_order(self, sales_order_id):
+        return self.sales_orders_by_id.get(sales_order_id)
+
+    def production_order(self, production_order_id):
+        return self.production_orders_by_id.get(production_order_id)
+
+    def delivery(self, delivery_id):
+        return self.deliveries_by_id.get(delivery_id)
+
+    def production_orders_for(self, sales_order):
+        return [self.production_orders_by_id[po_id] for po_id in sales_order.production_order_ids]
+
+    def allocated_quantity(self, sales_order, product_id):
+        """Units of ``product_id`` already allocated to ``sales_order`` by production runs."""
+        return sum(
+            po.allocations.get(sales_order.id, 0)
+            for po in self.production_orders_for(sales_order)
+            if po.product.id == product_id
+        )
+
+    def pending_demand(self) -> List[Demand]:
+        """Unallocated demand of ``Created`` sales orders, one entry per order and product."""
+        demand = []
+        for sales_order in self.sales_orders:
+            if sales_order.status != "Created":
+                continue
+            quantities = {}
+            for line in sales_order.lines:
+                quantities[line.product.id] = quantities.get(line.product.id, 0) + line.quantity
+            for product_id, quantity in quantities.items():
+                remaining = quantity - self.allocated_quantity(sales_order, product_id)
+                if remaining > 0:
+                    demand.append(Demand(sales_order.id, product_id, remaining, sales_order.order_date))
+        return demand
+
+    def production_complete(self, sales_order):
+        """True when the sales order has production orders and all of them are completed."""
+        production_orders = self.production_orders_for(sales_order)
+        return bool(production_orders) and all(po.status == "Completed" for po in production_orders)
+
+    def promised_date(self, sales_order, plan: planning.Plan) -> Optional[datetime.datetime]:
+        """Planned ship date of a fully allocated order still waiting on production."""
+        if sales_order.status != "In Production":
+            return None
+        open_runs = [po.id for po in self.production_orders_for(sales_order) if po.status != "Completed"]
+        return plan.promised_date(open_runs) if open_runs else None
+
+
+# Display ids <-> primary keys
+def format_id(prefix, pk):
+    return f"{prefix}{pk:04d}"
+
+def parse_id(prefix, display_id):
+    return int(display_id[len(prefix):])
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mto-db")
+_django_ready = False
+# Who the audit log (orders/audit.py) credits with changes made from the calling thread
+_actor = ContextVar("mto_actor", default="streamlit")
+
+def set_actor(actor: str):
+    _actor.set(actor)
+
+def _setup_django():
+    global _django_ready
+    if _django_ready:
+        return
+    if str(DJANGO_PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(DJANGO_PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "SPKenv.settings")
+    import django
+    from django.core.management import call_command
+    django.setup()
+    # Bring the shared database up to date once per process
+    call_command("migrate", interactive=False, verbosity=0)
+    _django_ready = True
+
+def on_db_thread(func):
+    """Run ``func`` on the shared DB thread so its Django connection is reused."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        actor = _actor.get()
+        def call():
+            _setup_django()
+            from orders.audit import acting_as
+            with acting_as(actor):
+                return func(*args, **kwargs)
+        return _executor.submit(call).result()
+    return wrapper
+
+@on_db_thread
+def close():
+    """Close the DB thread's connection and seal the audit log, e.g. before removing a scratch database."""
+    from django.db import connections
+    from orders.audit import audit_log
+    connections.close_all()
+    audit_log.close()
+
+
+def _product(row, cache):
+    product = cache.get(row.pk)
+    if product is None:
+        product = cache[row.pk] = Product(
+            id=row.sku,
+            name=row.name,
+            category=row.category,
+            price=float(row.price),
+            sustainability_score=row.sustainability_score,
+            work_center_id=row.work_center.code if row.work_center_id else None,
+            cycle_seconds=row.cycle_seconds,
+        )
+    return product
+
+
+@on_db_thread
+def list_products() -> List[Product]:
+    from orders.models import Product as ProductRow
+    cache = {}
+    return [_product(row, cache) for row in ProductRow.objects.select_related("work_center").order_by("sku")]
+
+
+@on_db_thread
+def load_snapshot() -> Snapshot:
+    """Bulk-read everything a page needs: one query per table, no per-row lookups.
+
+    Line totals, order totals, units and sustainability scores are computed in one
+    vectorized pass over all order items.
+    """
+    from orders.models import Delivery as DeliveryRow
+    from orders.models import Order, OrderItem, ProductionAllocation
+    from orders.models import Product as ProductRow
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.models import WorkCenter as WorkCenterRow
+
+    products = {}
+    for row in ProductRow.objects.filter(pk__in=OrderItem.objects.values("product_id")).select_related("work_center"):
+        _product(row, products)
+
+    items = pd.DataFrame.from_records(
+        OrderItem.objects.order_by("order_id", "pk").values_list("order_id", "product_id", "quantity"),
+        columns=["order_id", "product_id", "quantity"],
+    )
+    prices = pd.Series({pk: product.price for pk, product in products.items()}, dtype="float64")
+    scores = pd.Series({pk: product.sustainability_score for pk, product in products.items()}, dtype="float64")
+    items["line_total"] = items["quantity"] * items["product_id"].map(prices)
+    items["score_units"] = items["quantity"] * items["product_id"].map(scores)
+    totals = items.groupby("order_id", sort=False)[["quantity", "line_total", "score_units"]].sum()
+    totals_by_order = dict(zip(totals.index, totals.itertuples(index=False, name=None)))
+
+    lines_by_order = {
+        order_id: [
+            SalesOrderLine(products[product_id], int(quantity), float(line_total))
+            for _, product_id, quantity, line_total in rows
+        ]
+        for order_id, rows in groupby(
+            items[["order_id", "product_id", "quantity", "line_total"]].itertuples(index=False, name=None),
+            key=lambda row: row[0],
+        )
+    }
+
+    sales_orders = []
+    order_rows = Order.objects.filter(items__isnull=False).distinct().order_by("pk")
+    order_values = order_rows.values_list("pk", "customer_name", "date_created", "status", "customer_id")
+    for pk, customer_name, date_created, status, customer_id in order_values:
+        quantity, total_amount, score_units = totals_by_order[pk]
+        sales_orders.append(SalesOrder(
+            id=format_id("SO", pk),
+            customer_name=customer_name,
+            lines=lines_by_order[pk],
+            order_date=date_created,
+            status=status,
+            total_amount=float(total_amount),
+            quantity=int(quantity),
+            sustainability_score=float(score_units / quantity) if quantity else 0.0,
+            customer_id=customer_id,
+        ))
+
+    production_orders = [
+        ProductionOrder(
+            id=format_id("PO", row.pk),
+            product=_product(row.product, products),
+            quantity=row.quantity,
+            start_date=row.start_date,
+            status=row.status,
+            completion_percentage=row.completion_percentage,
+        )
+        for row in ProductionOrderRow.objects.select_related("product__work_center").order_by("pk")
+    ]
+
+    deliveries = [
+        Delivery(
+            id=format_id("DEL", row.pk),
+            sales_order_id=format_id("SO", row.sales_order_id),
+            delivery_date=row.delivery_date,
+            status=row.status,
+            tracking_number=row.tracking_number,
+        )
+        for row in DeliveryRow.objects.order_by("pk")
+    ]
+
+    # Link index: wire the ids both ways from the FK columns just read
+    sales_orders_by_id = {order.id: order for order in sales_orders}
+    production_orders_by_id = {production_order.id: production_order for production_order in production_orders}
+    allocations = ProductionAllocation.objects.order_by("pk").values_list("production_order_id", "sales_order_id", "quantity")
+    for production_order_pk, sales_order_pk, quantity in allocations:
+        production_order = production_orders_by_id[format_id("PO", production_order_pk)]
+        sales_order_id = format_id("SO", sales_order_pk)
+        production_order.allocations[sales_order_id] = production_order.allocations.get(sales_order_id, 0) + quantity
+        sales_order = sales_orders_by_id.get(sales_order_id)
+        if sales_order is not None and production_order.id not in sales_order.production_order_ids:
+            sales_order.production_order_ids.append(production_order.id)
+    deliveries_by_id = {}
+    for delivery in deliveries:
+        deliveries_by_id[delivery.id] = delivery
+        sales_order = sales_orders_by_id.get(delivery.sales_order_id)
+        if sales_order is not None:
+            sales_order.delivery_id = delivery.id
+
+    work_centers = {
+        code: planning.WorkCenter(code, lines, datetime.timedelta(minutes=setup_minutes))
+        for code, lines, setup_minutes in WorkCenterRow.objects.values_list("code", "lines", "setup_minutes")
+    }
+
+    return Snapshot(
+        sales_orders, production_orders, deliveries,
+        sales_orders_by_id, production_orders_by_id, deliveries_by_id,
+        work_centers,
+    )
+
+
+@dataclass
+class StatusHistory:
+    """Columnar status history plus the product/category of every order and run."""
+    transitions: pd.DataFrame  # kind ("SO"/"PO"), record_id, status, at
+    order_products: pd.DataFrame  # record_id (sales order pk), product, category
+    run_products: pd.DataFrame  # record_id (production order pk), product, category
+
+
+@on_db_thread
+def load_status_history() -> StatusHistory:
+    """Read the transition log as integer columns and decode it in vectorized passes."""
+    from orders.models import OrderItem, StatusTransition
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.transitions import PRODUCTION_ORDER, SALES_ORDER, STATUS_NAMES
+
+    transitions = pd.DataFrame.from_records(
+        StatusTransition.objects.values_list("kind", "record_id", "status", "at_ms"),
+        columns=["kind", "record_id", "status", "at_ms"],
+    )
+    kind_names = {SALES_ORDER: "SO", PRODUCTION_ORDER: "PO"}
+    status_names = {(kind, code): name for kind, names in STATUS_NAMES.items() for code, name in names.items()}
+    transitions["status"] = pd.Series(
+        pd.MultiIndex.from_arrays([transitions["kind"], transitions["status"]]).map(status_names.get),
+        index=transitions.index, dtype="category",
+    )
+    transitions["kind"] = transitions["kind"].map(kind_names).astype("category")
+    transitions["at"] = pd.to_datetime(transitions.pop("at_ms"), unit="ms", utc=True)
+
+    columns = ["record_id", "product", "category"]
+    order_products = pd.DataFrame.from_records(
+        OrderItem.objects.values_list("order_id", "product__sku", "product__category").distinct(), columns=columns,
+    )
+    run_products = pd.DataFrame.from_records(
+        ProductionOrderRow.objects.values_list("pk", "product__sku", "product__category"), columns=columns,
+    )
+    return StatusHistory(transitions, order_products, run_products)
+
+
+# Days of daily summary rows the report reads; older history comes from the monthly rows
+REPORT_DAYS = 90
+
+@dataclass
+class ReportSummary:
+    """Report and KPI figures from the materialized summary tables (orders/summaries.py)."""
+    daily: pd.DataFrame  # start, orders, units, revenue, sustainable_units (last REPORT_DAYS days)
+    monthly: pd.DataFrame  # same columns, one row per month
+    products: pd.DataFrame  # product, name, category, orders, units, revenue, sustainable_units (all time)
+    stages: pd.DataFrame  # kind ("SO"/"PO"), status, count, revenue (all time)
+    pending: int  # orders and status changes not folded into the summaries yet
+
+    @property
+    def total_orders(self) -> int:
+        return int(self.monthly["orders"].sum())
+
+    @property
+    def sustainability_score(self) -> float:
+        """Average sustainability score of all ordered units, in percent."""
+        units = self.monthly["units"].sum()
+        return float(self.monthly["sustainable_units"].sum() / units * 100) if units else 0.0
+
+    def stage(self, kind: str, status: str) -> Tuple[int, float]:
+        """(records that reached ``status``, their order value) for ``kind`` "SO" or "PO"."""
+        rows = self.stages[(self.stages["kind"] == kind) & (self.stages["status"] == status)]
+        return int(rows["count"].sum()), float(rows["revenue"].sum())
+
+
+@on_db_thread
+def load_report_summary(days: int = REPORT_DAYS) -> ReportSummary:
+    """Read the summary tables: O(days + months x products) rows, independent of order volume.
+
+    Writes made since the last refresh are picked up by the background refresher,
+    which this nudges; only a database that was never summarized is built inline.
+    """
+    from django.db.models import Sum
+    from orders.models import OrderSummary, ProductSummary, StageSummary, SummaryWatermark
+    from orders.summaries import pending_rows, refresh_summaries, summary_refresher
+    from orders.transitions import PRODUCTION_ORDER, SALES_ORDER, STATUS_NAMES
+
+    if not SummaryWatermark.objects.exists():
+        refresh_summaries()
+    pending = sum(pending_rows().values())
+    if pending:
+        summary_refresher.request()
+
+    columns = ["start", "orders", "units", "revenue", "sustainable_units"]
+    decimals = {"revenue": "float64", "sustainable_units": "float64"}
+    since = datetime.date.today() - datetime.timedelta(days=days)
+    daily = pd.DataFrame.from_records(
+        OrderSummary.objects.filter(period="day", start__gte=since).order_by("start").values_list(*columns),
+        columns=columns,
+    ).astype(decimals)
+    monthly = pd.DataFrame.from_records(
+        OrderSummary.objects.filter(period="month").order_by("start").values_list(*columns), columns=columns,
+    ).astype(decimals)
+
+    products = pd.DataFrame.from_records(
+        ProductSummary.objects.filter(period="month")
+        .values_list("product__sku", "product__name", "product__category")
+        .annotate(*[Sum(name) for name in columns[1:]]).order_by("-revenue__sum"),
+        columns=["product", "name", "category", *columns[1:]],
+    ).astype(decimals)
+
+    kind_names = {SALES_ORDER: "SO", PRODUCTION_ORDER: "PO"}
+    stages = pd.DataFrame.from_records(
+        [
+            (kind_names[kind], STATUS_NAMES[kind][status], count, float(revenue))
+            for kind, status, count, revenue in StageSummary.objects.filter(period="month")
+            .values_list("kind", "status").annotate(Sum("count"), Sum("revenue")).order_by("kind", "status")
+        ],
+        columns=["kind", "status", "count", "revenue"],
+    )
+    return ReportSummary(daily, monthly, products, stages, pending)
+
+
+@on_db_thread
+def report_revision() -> Tuple:
+    """A value that changes whenever anything the order report shows changes."""
+    from django.db.models import Count, Max, Sum
+    from orders.models import Delivery as DeliveryRow
+    from orders.models import Order, StatusTransition
+    from orders.models import ProductionOrder as ProductionOrderRow
+    orders = Order.objects.aggregate(count=Count("pk"), last=Max("pk"))
+    runs = ProductionOrderRow.objects.aggregate(count=Count("pk"), progress=Sum("completion_percentage"))
+    return (
+        orders["count"], orders["last"], runs["count"], runs["progress"],
+        StatusTransition.objects.aggregate(last=Max("pk"))["last"],
+        *DeliveryRow.objects.aggregate(count=Count("pk"), last=Max("pk")).values(),
+    )
+
+
+@on_db_thread
+def report_counts() -> Tuple[int, int, int]:
+    """(sales orders, production orders, deliveries): the row counts of the report's sections."""
+    from orders.models import Delivery as DeliveryRow
+    from orders.models import Order
+    from orders.models import ProductionOrder as ProductionOrderRow
+    return Order.objects.count(), ProductionOrderRow.objects.count(), DeliveryRow.objects.count()
+
+
+@on_db_thread
+def order_report_chunk(after: int, limit: int) -> Tuple[int, List[tuple]]:
+    """Tracking rows of the next ``limit`` sales orders after pk ``after``, as (last pk, rows).
+
+    Row: (order id, date, customer, products, units, amount, sustainability %,
+    production orders, production status, delivery id, tracking number, status).
+    """
+    from orders.models import Delivery as DeliveryRow
+    from orders.models import Order, OrderItem, ProductionAllocation
+
+    orders = list(
+        Order.objects.filter(pk__gt=after).order_by("pk")
+        .values_list("pk", "date_created", "customer_name", "status")[:limit]
+    )
+    if not orders:
+        return after, []
+    span = {"order_id__gte": orders[0][0], "order_id__lte": orders[-1][0]}
+    items, runs, deliveries = {}, {}, {}
+    for order_id, name, quantity, price, score in OrderItem.objects.filter(**span).order_by("pk").values_list(
+            "order_id", "product__name", "quantity", "product__price", "product__sustainability_score"):
+        items.setdefault(order_id, []).append((name, quantity, float(price) * quantity, score * quantity))
+    allocations = ProductionAllocation.objects.filter(
+        sales_order_id__gte=orders[0][0], sales_order_id__lte=orders[-1][0],
+    ).order_by("production_order_id").values_list("sales_order_id", "production_order_id", "production_order__status")
+    for order_id, run_pk, status in allocations:
+        runs.setdefault(order_id, {})[format_id("PO", run_pk)] = status
+    for order_id, pk, tracking_number in DeliveryRow.objects.filter(
+            sales_order_id__gte=orders[0][0], sales_order_id__lte=orders[-1][0]).values_list(
+            "sales_order_id", "pk", "tracking_number"):
+        deliveries[order_id] = (format_id("DEL", pk), tracking_number)
+
+    rows = []
+    for pk, date_created, customer_name, status in orders:
+        lines = items.get(pk, [])
+        units = sum(quantity for _, quantity, _, _ in lines)
+        order_runs = runs.get(pk, {})
+        delivery_id, tracking_number = deliveries.get(pk, ("", ""))
+        rows.append((
+            format_id("SO", pk), date_created, customer_name,
+            ", ".join(dict.fromkeys(name for name, _, _, _ in lines)), units,
+            sum(amount for _, _, amount, _ in lines),
+            sum(score_units for _, _, _, score_units in lines) / units if units else 0.0,
+            ", ".join(order_runs), ", ".join(sorted(set(order_runs.values()))),
+            delivery_id, tracking_number, status,
+        ))
+    return orders[-1][0], rows
+
+
+@on_db_thread
+def production_report_chunk(after: int, limit: int) -> Tuple[int, List[tuple]]:
+    """(last pk, rows) of production orders after pk ``after``.
+
+    Row: (production order id, product, units, start, status, completion %, sales orders).
+    """
+    from orders.models import ProductionAllocation
+    from orders.models import ProductionOrder as ProductionOrderRow
+
+    runs = list(
+        ProductionOrderRow.objects.filter(pk__gt=after).order_by("pk")
+        .values_list("pk", "product__name", "quantity", "start_date", "status", "completion_percentage")[:limit]
+    )
+    if not runs:
+        return after, []
+    orders = {}
+    for run_pk, order_pk, quantity in ProductionAllocation.objects.filter(
+            production_order_id__gte=runs[0][0], production_order_id__lte=runs[-1][0]).order_by("pk").values_list(
+            "production_order_id", "sales_order_id", "quantity"):
+        orders.setdefault(run_pk, []).append(f"{format_id('SO', order_pk)} x{quantity}")
+    return runs[-1][0], [
+        (format_id("PO", pk), product, quantity, start_date, status, completion, ", ".join(orders.get(pk, [])))
+        for pk, product, quantity, start_date, status, completion in runs
+    ]
+
+
+@on_db_thread
+def delivery_report_chunk(after: int, limit: int) -> Tuple[int, List[tuple]]:
+    """(last pk, rows) of deliveries after pk ``after``.
+
+    Row: (delivery id, sales order id, customer, delivery date, status, tracking number).
+    """
+    from orders.models import Delivery as DeliveryRow
+
+    deliveries = list(
+        DeliveryRow.objects.filter(pk__gt=after).order_by("pk").values_list(
+            "pk", "sales_order_id", "sales_order__customer_name", "delivery_date", "status", "tracking_number")[:limit]
+    )
+    if not deliveries:
+        return after, []
+    return deliveries[-1][0], [
+        (format_id("DEL", pk), format_id("SO", order_pk), customer_name, delivery_date, status, tracking_number)
+        for pk, order_pk, customer_name, delivery_date, status, tracking_number in deliveries
+    ]
+
+
+@dataclass(frozen=True)
+class JobStatus:
+    id: int
+    task: str
+    label: str
+    status: str  # queued / running / succeeded / failed / cancelled
+    progress: int  # percent
+    message: str
+    attempts: int
+    max_attempts: int
+    error: str  # last line of the latest failure
+    output_path: Optional[Path]  # file written by a succeeded job
+    created_at: datetime.datetime
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+
+def _job_status(row, tasks, output_dir):
+    result = row.result if isinstance(row.result, dict) else {}
+    output = output_dir / os.path.basename(result["file"]) if result.get("file") else None
+    return JobStatus(
+        id=row.pk, task=row.task, label=tasks[row.task].label if row.task in tasks else row.task,
+        status=row.status, progress=row.progress, message=row.message,
+        attempts=row.attempts, max_attempts=row.max_attempts, error=row.error_summary,
+        output_path=output if row.status == "succeeded" and output and output.is_file() else None,
+        created_at=row.created_at,
+    )
+
+
+@on_db_thread
+def job_tasks() -> Dict[str, str]:
+    """{task name: label} of the background tasks that take no parameters."""
+    from orders.jobs import TASKS
+    return {name: task.label for name, task in TASKS.items() if not task.params}
+
+
+@on_db_thread
+def enqueue_job(task: str, **params) -> int:
+    """Queue a background job (orders/jobs.py); this process's workers start on it at once."""
+    from orders.jobs import enqueue
+    return enqueue(task, **params).pk
+
+
+@on_db_thread
+def cancel_job(job_id: int) -> bool:
+    from orders.jobs import cancel
+    return cancel(job_id)
+
+
+@on_db_thread
+def recent_jobs(limit: int = 10) -> List[JobStatus]:
+    """Latest jobs from both UIs, newest first."""
+    from django.conf import settings
+    from orders.jobs import TASKS
+    from orders.models import Job
+    return [_job_status(row, TASKS, settings.JOB_OUTPUT_DIR) for row in Job.objects.order_by("-pk")[:limit]]
+
+
+@dataclass(frozen=True)
+class AuditEntry:
+    at: datetime.datetime
+    record: str  # SO/PO display id
+    action: str
+    detail: str
+    actor: str
+
+
+@on_db_thread
+def audit_trail(sales_order_id: str) -> List[AuditEntry]:
+    """Who changed a sales order (and its production orders) and when, oldest first."""
+    from orders.audit import order_history
+    return [
+        AuditEntry(at=entry.at, record=entry.ref, action=entry.action_name, detail=entry.detail, actor=entry.actor)
+        for entry in order_history(parse_id("SO", sales_order_id))
+    ]
+
+
+# Capacity plan shared by every session in this process; each rerun only re-plans
+# the production orders that changed since the previous one
+_planner = planning.CapacityPlanner()
+# Products without a work center are planned on one shared line
+UNASSIGNED_WORK_CENTER = planning.WorkCenter("GENERAL")
+# The plan origin moves in steps so reruns within one step stay incremental
+PLAN_INTERVAL = datetime.timedelta(minutes=15)
+_PLAN_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+def production_plan(snapshot: Snapshot, now: Optional[datetime.datetime] = None) -> planning.Plan:
+    """Planned start/finish of every open production order on finite work-center capacity."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    origin = now - (now - _PLAN_EPOCH) % PLAN_INTERVAL
+    work_centers = [UNASSIGNED_WORK_CENTER, *snapshot.work_centers.values()]
+    jobs = [
+        planning.Job(
+            id=po.id,
+            work_center_id=po.product.work_center_id or UNASSIGNED_WORK_CENTER.id,
+            product_id=po.product.id,
+            duration=datetime.timedelta(
+                seconds=po.quantity * po.product.cycle_seconds * (100 - po.completion_percentage) / 100
+            ),
+            release=po.start_date,
+            started=po.status == "In Progress",
+        )
+        for po in snapshot.production_orders
+        if po.status != "Completed"
+    ]
+    return _planner.sync(work_centers, jobs, origin)
+
+
+@dataclass(frozen=True)
+class Customer:
+    id: int
+    name: str
+    normalized_name: str
+
+
+@dataclass(frozen=True)
+class CustomerHistory:
+    customer: Customer
+    order_count: int
+    revenue: float
+    orders: List[Tuple[str, datetime.datetime, str]]  # (sales order id, date, status), newest first
+
+
+@on_db_thread
+def customer_directory_version() -> Tuple[int, int]:
+    """(count, max pk) of the customer table: changes whenever a customer is added or removed."""
+    from django.db.models import Count, Max
+    from orders.models import Customer as CustomerRow
+    state = CustomerRow.objects.aggregate(count=Count("pk"), last=Max("pk"))
+    return state["count"], state["last"] or 0
+
+
+@on_db_thread
+def list_customers() -> List[Customer]:
+    from orders.models import Customer as CustomerRow
+    return [
+        Customer(pk, name, normalized_name)
+        for pk, name, normalized_name in CustomerRow.objects.order_by("normalized_name").values_list(
+            "pk", "name", "normalized_name")
+    ]
+
+
+@on_db_thread
+def customer_history(customer_id: int, limit: int = 50) -> Optional[CustomerHistory]:
+    """Order count, revenue and latest orders of one customer, read through the customer index."""
+    from orders.customers import customer_orders, customer_totals
+    from orders.models import Customer as CustomerRow
+    row = CustomerRow.objects.filter(pk=customer_id).values_list("pk", "name", "normalized_name").first()
+    if row is None:
+        return None
+    order_count, revenue = customer_totals([customer_id]).get(customer_id, (0, 0))
+    orders = [
+        (format_id("SO", pk), date_created, status)
+        for pk, date_created, status in customer_orders(customer_id).values_list("pk", "date_created", "status")[:limit]
+    ]
+    return CustomerHistory(Customer(*row), order_count, float(revenue or 0), orders)
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    sales_order_id: str
+    rank: float  # bm25, lower is better
+    # HTML-escaped column values with matches wrapped in <mark>
+    ref: str
+    customer: str
+    products: str
+    tracking: str
+    notes: str
+
+
+@on_db_thread
+def search_orders(text: str, limit: int = 20) -> List[SearchResult]:
+    """Ranked full-text search over orders (customer, products, tracking numbers, notes)."""
+    from orders.search import search_orders as search
+    return [
+        SearchResult(format_id("SO", row.pop("id")), **row)
+        for row in search(text, limit)
+    ]
+
+
+@on_db_thread
+def create_sales_order(customer_name: str, lines: Sequence[Tuple[str, int]], notes: str = "") -> str:
+    """Create a sales order with one item per ``(product sku, quantity)`` line.
+
+    The order is linked to the customer directory by normalized name (a new name
+    creates the customer), via the ``Order`` pre_save signal.
+    """
+    from django.db import transaction
+    from orders.models import Order, OrderItem
+    from orders.models import Product as ProductRow
+    from orders.transitions import SALES_ORDER, record
+
+    skus = {sku for sku, _ in lines}
+    product_pks = dict(ProductRow.objects.filter(sku__in=skus).values_list("sku", "pk"))
+    with transaction.atomic():
+        order = Order.objects.create(customer_name=customer_name, status="Created", notes=notes.strip())
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product_id=product_pks[sku], quantity=quantity)
+            for sku, quantity in lines
+        ])
+        record(SALES_ORDER, "Created", [order.pk], at=order.date_created)
+    return format_id("SO", order.pk)
+
+
+@on_db_thread
+def release_production_runs(batches: Iterable[Batch]) -> List[str]:
+    """Create one production order per batch, with an allocation per sales order it serves.
+
+    Allocations are clipped to each order's still-unallocated demand, so releasing the
+    same plan twice (e.g. from two sessions) cannot over-allocate. Sales orders whose
+    demand is fully allocated move from ``Created`` to ``In Production``.
+    """
+    from django.db import transaction
+    from django.db.models import Sum
+    from django.utils import timezone
+    from orders.models import Order, OrderItem, ProductionAllocation
+    from orders.models import Product as ProductRow
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.transitions import PRODUCTION_ORDER, SALES_ORDER, record
+
+    batches = list(batches)
+    order_pks = {parse_id("SO", sales_order_id) for batch in batches for sales_order_id in batch.allocations}
+    product_pks = dict(ProductRow.objects.filter(sku__in={batch.product_id for batch in batches}).values_list("sku", "pk"))
+    now = timezone.now()
+    with transaction.atomic():
+        remaining = {
+            (row["order_id"], row["product_id"]): row["quantity"]
+            for row in OrderItem.objects.filter(order_id__in=order_pks, order__status="Created")
+            .values("order_id", "product_id").annotate(quantity=Sum("quantity"))
+        }
+        allocated = (
+            ProductionAllocation.objects.filter(sales_order_id__in=order_pks)
+            .values("sales_order_id", "production_order__product_id").annotate(quantity=Sum("quantity"))
+        )
+        for row in allocated:
+            key = (row["sales_order_id"], row["production_order__product_id"])
+            if key in remaining:
+                remaining[key] -= row["quantity"]
+
+        runs = []
+        for batch in batches:
+            product_pk = product_pks[batch.product_id]
+            allocations = []
+            for sales_order_id, quantity in batch.allocations.items():
+                key = (parse_id("SO", sales_order_id), product_pk)
+                taken = min(quantity, remaining.get(key, 0))
+                if taken > 0:
+                    remaining[key] -= taken
+                    allocations.append((key[0], taken))
+            if allocations:
+                runs.append((product_pk, allocations))
+
+        rows = ProductionOrderRow.objects.bulk_create([
+            ProductionOrderRow(
+                product_id=product_pk,
+                quantity=sum(quantity for _, quantity in allocations),
+                start_date=now,
+                status="Planned",
+                completion_percentage=0,
+            )
+            for product_pk, allocations in runs
+        ])
+        ProductionAllocation.objects.bulk_create([
+            ProductionAllocation(production_order=row, sales_order_id=sales_order_pk, quantity=quantity)
+            for row, (_, allocations) in zip(rows, runs)
+            for sales_order_pk, quantity in allocations
+        ])
+
+        unallocated = {order_pk for (order_pk, _), quantity in remaining.items() if quantity > 0}
+        promoted = list(
+            Order.objects.filter(pk__in=order_pks - unallocated, status="Created").values_list("pk", flat=True)
+        )
+        Order.objects.filter(pk__in=promoted).update(status="In Production")
+        record(PRODUCTION_ORDER, "Planned", [row.pk for row in rows], at=now)
+        record(SALES_ORDER, "In Production", promoted, at=now)
+    return [format_id("PO", row.pk) for row in rows]
+
+
+@on_db_thread
+def start_production(production_order_id: str) -> bool:
+    from django.db import transaction
+    from django.utils import timezone
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.transitions import PRODUCTION_ORDER, record
+
+    pk = parse_id("PO", production_order_id)
+    now = timezone.now()
+    with transaction.atomic():
+        if not ProductionOrderRow.objects.filter(pk=pk, status="Planned").update(
+            status="In Progress", completion_percentage=25, start_date=now
+        ):
+            return False
+        record(PRODUCTION_ORDER, "In Progress", [pk], at=now)
+    return True
+
+
+@on_db_thread
+def advance_production(production_order_id: str, step: int = 25) -> bool:
+    from django.db import transaction
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.transitions import PRODUCTION_ORDER, record
+
+    with transaction.atomic():
+        row = ProductionOrderRow.objects.filter(
+            pk=parse_id("PO", production_order_id), status="In Progress"
+        ).first()
+        if row is None:
+            return False
+        row.completion_percentage = min(100, row.completion_percentage + step)
+        if row.completion_percentage == 100:
+            row.status = "Completed"
+            record(PRODUCTION_ORDER, "Completed", [row.pk])
+        row.save(update_fields=["completion_percentage", "status"])
+    return True
+
+
+@on_db_thread
+def confirm_ready_for_delivery(sales_order_id: str) -> bool:
+    """Mark a sales order ready once every one of its production orders is completed."""
+    from django.db import transaction
+    from orders.models import Order
+    from orders.models import ProductionOrder as ProductionOrderRow
+    from orders.transitions import SALES_ORDER, record
+
+    pk = parse_id("SO", sales_order_id)
+    with transaction.atomic():
+        production_orders = ProductionOrderRow.objects.filter(allocations__sales_order_id=pk)
+        if not production_orders.exists() or production_orders.exclude(status="Completed").exists():
+            return False
+        if not Order.objects.filter(pk=pk, status="In Production").update(status="Ready for Delivery"):
+            return False
+        record(SALES_ORDER, "Ready for Delivery", [pk])
+    return True
+
+
+@on_db_thread
+def create_delivery(sales_order_id: str) -> Optional[Delivery]:
+    """Ship a sales order that is ready for delivery."""
+    from django.db import transaction
+    from django.utils import timezone
+    from orders.models import Delivery as DeliveryRow
+    from orders.models import Order
+    from orders.transitions import SALES_ORDER, record
+
+    pk = parse_id("SO", sales_order_id)
+    with transaction.atomic():
+        if not Order.objects.filter(pk=pk, status="Ready for Delivery").update(status="Delivered"):
+            return None
+        row = DeliveryRow.objects.create(
+            sales_order_id=pk,
+            delivery_date=timezone.now(),
+            status="Shipped",
+            tracking_number=f"TRK{uuid.uuid4().hex[:8].upper()}",
+        )
+        record(SALES_ORDER, "Delivered", [pk], at=row.delivery_date)
+    return Delivery(
+        id=format_id("DEL", row.pk),
+        sales_order_id=sales_order_id,
+        delivery_date=row.delivery_date,
+        status=row.status,
+        tracking_number=row.tracking_number,
+    )
@@ -0,0 +1,38 @@
+import functools
+import hashlib
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Served by Streamlit as app/static/app.css (server.enableStaticServing in .streamlit/config.toml)
+STYLESHEET = Path(__file__).resolve().parent.parent / "static" / "app.css"
+
+
+@functools.lru_cache(maxsize=None)
+def _stylesheet():
+    """Read the stylesheet once per process; return (css, content hash)."""
+    css = STYLESHEET.read_bytes()
+    return css.decode("utf-8"), hashlib.blake2b(css, digest_size=8).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _served(main_script_path):
+    # Streamlit serves static/ next to the main script; the legacy entry points
+    # (something/app.py, something2/app.py) have none, so their link would 404
+    try:
+        return (Path(main_script_path).resolve().parent / "static" / "app.css").samefile(STYLESHEET)
+    except OSError:
+        return False
+
+
+# Load custom CSS
+def load_css():
+    css, version = _stylesheet()
+    ctx = get_script_run_ctx()
+    if st.get_option("server.enableStaticServing") and ctx is not None and _served(ctx.main_script_path):
+        # A short link per rerun instead of the whole stylesheet; the browser keeps the file
+        # until its content (and so the version) changes
+        st.markdown(f'<link rel="stylesheet" href="app/static/app.css?v={version}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
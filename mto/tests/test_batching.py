@@ -0,0 +1,111 @@
+import datetime
+
+from mto.batching import BatchPolicy, BatchScheduler, Demand, plan_batches, simulate
+
+START = datetime.datetime(2025, 1, 6, 8)
+POLICY = BatchPolicy(max_batch_quantity=100, time_window=datetime.timedelta(hours=8))
+
+
+def demand(number, product_id, quantity, hours=0.0):
+    return Demand(f"SO{number:04d}", product_id, quantity, START + datetime.timedelta(hours=hours))
+
+
+def test_orders_for_one_product_share_a_batch():
+    scheduler = BatchScheduler(POLICY)
+    assert scheduler.add(demand(1, "PKG001", 30)) == []
+    assert scheduler.add(demand(2, "PKG001", 20, hours=1)) == []
+    assert scheduler.add(demand(3, "PKG002", 10, hours=2)) == []
+
+    first, second = scheduler.open_batches()
+    assert (first.product_id, first.quantity, first.allocations) == ("PKG001", 50, {"SO0001": 30, "SO0002": 20})
+    assert first.due_at == START + POLICY.time_window
+    assert (second.product_id, second.quantity) == ("PKG002", 10)
+
+
+def test_full_batch_is_released_at_once():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG001", 60))
+    (released,) = scheduler.add(demand(2, "PKG001", 40, hours=1))
+    assert (released.quantity, released.allocations) == (100, {"SO0001": 60, "SO0002": 40})
+    assert scheduler.open_batches() == []
+
+
+def test_oversize_order_is_split_across_runs():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG001", 70))
+    released = scheduler.add(demand(2, "PKG001", 250, hours=1))
+    assert [(batch.quantity, batch.allocations) for batch in released] == [
+        (100, {"SO0001": 70, "SO0002": 30}),
+        (100, {"SO0002": 100}),
+        (100, {"SO0002": 100}),
+    ]
+    (remainder,) = scheduler.open_batches()
+    assert (remainder.quantity, remainder.allocations) == (20, {"SO0002": 20})
+    assert remainder.opened_at == START + datetime.timedelta(hours=1)
+
+
+def test_due_releases_batches_whose_window_closed():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG001", 10))
+    scheduler.add(demand(2, "PKG002", 10, hours=3))
+    assert scheduler.due(START + datetime.timedelta(hours=7)) == []
+
+    released = scheduler.due(START + datetime.timedelta(hours=8))
+    assert [batch.product_id for batch in released] == ["PKG001"]
+    assert [batch.product_id for batch in scheduler.open_batches()] == ["PKG002"]
+
+
+def test_due_skips_deadlines_of_batches_already_released():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG001", 100))  # released full; its deadline stays in the heap
+    scheduler.add(demand(2, "PKG001", 10, hours=1))
+    assert scheduler.due(START + datetime.timedelta(hours=8)) == []
+    (released,) = scheduler.due(START + datetime.timedelta(hours=9))
+    assert released.allocations == {"SO0002": 10}
+
+
+def test_late_order_closes_the_expired_batch_first():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG001", 10))
+    (released,) = scheduler.add(demand(2, "PKG001", 10, hours=9))
+    assert released.allocations == {"SO0001": 10}
+    (reopened,) = scheduler.open_batches()
+    assert reopened.allocations == {"SO0002": 10}
+
+
+def test_flush_releases_everything_by_deadline():
+    scheduler = BatchScheduler(POLICY)
+    scheduler.add(demand(1, "PKG002", 10, hours=2))
+    scheduler.add(demand(2, "PKG001", 10))
+    assert [batch.product_id for batch in scheduler.flush()] == ["PKG001", "PKG002"]
+    assert scheduler.open_batches() == []
+    assert scheduler.due(START + datetime.timedelta(days=1)) == []
+
+
+def test_plan_batches_sorts_demand_and_holds_open_batches():
+    pending = [
+        demand(3, "PKG002", 5, hours=6),
+        demand(1, "PKG001", 40),
+        demand(2, "PKG001", 80, hours=1),
+    ]
+    ready, held = plan_batches(pending, POLICY, now=START + datetime.timedelta(hours=8, minutes=30))
+    # The PKG001 remainder opened at +1h and is still inside its window
+    assert [(batch.product_id, batch.allocations) for batch in ready] == [
+        ("PKG001", {"SO0001": 40, "SO0002": 60}),
+    ]
+    assert [(batch.product_id, batch.allocations) for batch in held] == [
+        ("PKG001", {"SO0002": 20}),
+        ("PKG002", {"SO0003": 5}),
+    ]
+
+    ready, held = plan_batches(pending, POLICY, now=START, release_all=True)
+    assert sum(batch.quantity for batch in ready) == 125
+    assert held == []
+
+
+def test_simulation_batches_fewer_runs():
+    policy = BatchPolicy(500, datetime.timedelta(hours=4))
+    result = simulate(orders=2000, products=4, policy=policy, setup_minutes=45,
+                      mean_interarrival_minutes=5, max_order_quantity=120, seed=1)
+    assert result["batched_runs"] < result["unbatched_runs"]
+    assert result["mean_batch_quantity"] <= 500
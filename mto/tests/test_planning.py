@@ -0,0 +1,167 @@
+import datetime
+import random
+
+from mto.planning import CapacityPlanner, Job, Plan, PlannedJob, WorkCenter, _random_queue
+
+ORIGIN = datetime.datetime(2025, 1, 6, 8)
+HOUR = datetime.timedelta(hours=1)
+
+
+def job(job_id, product_id="PKG001", hours=1, release_hours=0, work_center_id="WC1", started=False):
+    return Job(job_id, work_center_id, product_id, hours * HOUR, ORIGIN + release_hours * HOUR, started)
+
+
+def times(plan):
+    return {job_id: (planned.line, planned.start, planned.finish) for job_id, planned in plan.planned.items()}
+
+
+def test_single_line_runs_jobs_back_to_back_by_release():
+    plan = CapacityPlanner().sync([WorkCenter("WC1")], [job("PO2", release_hours=1), job("PO1", hours=2)], ORIGIN)
+    assert times(plan) == {
+        "PO1": (0, ORIGIN, ORIGIN + 2 * HOUR),
+        "PO2": (0, ORIGIN + 2 * HOUR, ORIGIN + 3 * HOUR),
+    }
+    assert plan.changed == {"PO1", "PO2"}
+
+
+def test_running_job_goes_first_and_release_is_respected():
+    jobs = [job("PO1"), job("PO2", release_hours=5), job("PO3", release_hours=3, started=True)]
+    plan = CapacityPlanner().sync([WorkCenter("WC1")], jobs, ORIGIN)
+    assert times(plan) == {
+        "PO3": (0, ORIGIN + 3 * HOUR, ORIGIN + 4 * HOUR),
+        "PO1": (0, ORIGIN + 4 * HOUR, ORIGIN + 5 * HOUR),
+        "PO2": (0, ORIGIN + 5 * HOUR, ORIGIN + 6 * HOUR),
+    }
+
+
+def test_changeover_setup_between_products():
+    work_center = WorkCenter("WC1", setup=datetime.timedelta(minutes=30))
+    jobs = [job("PO1", "PKG001"), job("PO2", "PKG001"), job("PO3", "PKG002"), job("PO4", "PKG002", started=True)]
+    plan = CapacityPlanner().sync([work_center], jobs, ORIGIN)
+    half = datetime.timedelta(minutes=30)
+    # A started run needs no setup; every product change after it does
+    assert [plan.get(job_id).start for job_id in ("PO4", "PO1", "PO2", "PO3")] == [
+        ORIGIN, ORIGIN + HOUR + half, ORIGIN + 2 * HOUR + half, ORIGIN + 4 * HOUR,
+    ]
+
+
+def test_jobs_spread_over_lines():
+    work_center = WorkCenter("WC1", lines=2, setup=datetime.timedelta(minutes=30))
+    jobs = [job("PO1", "PKG001", hours=3), job("PO2", "PKG002"), job("PO3", "PKG002"), job("PO4", "PKG001")]
+    plan = CapacityPlanner().sync([work_center], jobs, ORIGIN)
+    assert times(plan) == {
+        "PO1": (0, ORIGIN, ORIGIN + 3 * HOUR),
+        "PO2": (1, ORIGIN, ORIGIN + HOUR),
+        "PO3": (1, ORIGIN + HOUR, ORIGIN + 2 * HOUR),
+        # Line 1 frees first but needs a changeover; line 0 does not
+        "PO4": (1, ORIGIN + 2.5 * HOUR, ORIGIN + 3.5 * HOUR),
+    }
+
+
+def test_promised_date_waits_for_every_run():
+    plan = CapacityPlanner(shipping_lead_time=datetime.timedelta(days=2)).sync(
+        [WorkCenter("WC1"), WorkCenter("WC2")],
+        [job("PO1", hours=5), job("PO2", hours=2, work_center_id="WC2")],
+        ORIGIN,
+    )
+    assert plan.promised_date(["PO1", "PO2"]) == ORIGIN + 5 * HOUR + datetime.timedelta(days=2)
+    assert plan.promised_date(["PO2"]) == ORIGIN + 2 * HOUR + datetime.timedelta(days=2)
+    assert plan.promised_date(["PO1", "PO9"]) is None
+    assert plan.promised_date([]) is None
+    assert Plan({}, set(), HOUR).get("PO1") is None
+
+
+def test_unchanged_queue_changes_nothing():
+    planner = CapacityPlanner()
+    work_centers = [WorkCenter("WC1")]
+    jobs = [job("PO1"), job("PO2")]
+    first = planner.sync(work_centers, jobs, ORIGIN)
+    again = planner.sync(work_centers, jobs, ORIGIN)
+    assert again.changed == set()
+    assert again.planned == first.planned
+
+
+def test_changed_set_holds_only_retimed_jobs():
+    planner = CapacityPlanner()
+    work_centers = [WorkCenter("WC1"), WorkCenter("WC2")]
+    jobs = [job("PO1"), job("PO2"), job("PO3"), job("PO4", work_center_id="WC2")]
+    planner.sync(work_centers, jobs, ORIGIN)
+
+    # The last run on WC1 gets longer: nothing else moves
+    jobs[2] = job("PO3", hours=3)
+    assert planner.sync(work_centers, jobs, ORIGIN).changed == {"PO3"}
+
+    # The first gets longer: everything behind it on WC1 moves, WC2 does not
+    jobs[0] = job("PO1", hours=2)
+    assert planner.sync(work_centers, jobs, ORIGIN).changed == {"PO1", "PO2", "PO3"}
+
+    # A removed job is reported as changed and drops out of the plan
+    plan = planner.sync(work_centers, jobs[1:], ORIGIN)
+    assert plan.changed == {"PO1", "PO2", "PO3"}
+    assert plan.get("PO1") is None
+
+
+def test_edited_job_keeping_its_times_is_not_changed():
+    planner = CapacityPlanner()
+    work_centers = [WorkCenter("WC1")]
+    planner.sync(work_centers, [job("PO1", release_hours=2)], ORIGIN)
+    plan = planner.sync(work_centers, [job("PO1", release_hours=2, started=True)], ORIGIN)
+    assert plan.changed == set()
+    assert plan.get("PO1").start == ORIGIN + 2 * HOUR
+
+
+def test_job_moving_between_work_centers():
+    planner = CapacityPlanner()
+    work_centers = [WorkCenter("WC1"), WorkCenter("WC2")]
+    planner.sync(work_centers, [job("PO1"), job("PO2")], ORIGIN)
+    plan = planner.sync(work_centers, [job("PO1"), job("PO2", work_center_id="WC2")], ORIGIN)
+    assert plan.get("PO2") == PlannedJob("PO2", "WC2", 0, ORIGIN, ORIGIN + HOUR)
+    assert plan.changed == {"PO2"}
+
+
+def test_new_origin_or_work_centers_replan_everything():
+    planner = CapacityPlanner()
+    jobs = [job("PO1"), job("PO2")]
+    planner.sync([WorkCenter("WC1")], jobs, ORIGIN)
+    plan = planner.sync([WorkCenter("WC1", lines=2)], jobs, ORIGIN)
+    assert plan.changed == {"PO1", "PO2"}
+    assert plan.get("PO2").start == ORIGIN
+    later = ORIGIN + 10 * HOUR
+    plan = planner.sync([WorkCenter("WC1", lines=2)], jobs, later)
+    assert {planned.start for planned in plan.planned.values()} == {later}
+
+
+def test_incremental_plan_matches_a_fresh_planner():
+    rng = random.Random(3)
+    products = ["PKG001", "PKG002", "PKG003"]
+    work_centers = [WorkCenter(f"WC{index}", lines=index, setup=datetime.timedelta(minutes=45))
+                    for index in range(1, 4)]
+    jobs = {item.id: item for item in _random_queue(300, work_centers, products, rng, ORIGIN)}
+    planner = CapacityPlanner()
+    previous = planner.sync(work_centers, jobs.values(), ORIGIN).planned
+
+    for step in range(60):
+        job_id = rng.choice(sorted(jobs))
+        current = jobs[job_id]
+        change = step % 5
+        if change == 0:
+            del jobs[job_id]
+        elif change == 1:
+            jobs[f"PX{step:03d}"] = Job(f"PX{step:03d}", rng.choice(work_centers).id, rng.choice(products),
+                                        rng.randint(1, 8) * HOUR, ORIGIN + rng.randint(0, 200) * HOUR)
+        elif change == 2:
+            jobs[job_id] = Job(job_id, current.work_center_id, current.product_id, current.duration * 1.5,
+                               current.release)
+        elif change == 3:
+            jobs[job_id] = Job(job_id, rng.choice(work_centers).id, current.product_id, current.duration,
+                               current.release)
+        else:
+            jobs[job_id] = Job(job_id, current.work_center_id, current.product_id, current.duration,
+                               current.release, started=not current.started)
+
+        plan = planner.sync(work_centers, jobs.values(), ORIGIN)
+        fresh = CapacityPlanner().sync(work_centers, jobs.values(), ORIGIN)
+        assert plan.planned == fresh.planned
+        assert plan.changed == {job_id for job_id in previous.keys() | plan.planned.keys()
+                                if previous.get(job_id) != plan.planned.get(job_id)}
+        previous = plan.planned